@@ -8,41 +8,165 @@ ingestion of files in Google Cloud Storage (GCS) to data transformation in
 Snowflake using dbt.
 
 Pipeline Flow (E-L-T):
-1.  Wait for Data (Sensor): A sensor monitors a GCS bucket for the arrival
-    of new data files.
-2.  Extract & Load (Refresh External Tables): Once data is detected, commands
-    are triggered in Snowflake to refresh the External Tables. These tables point
-    directly to the files in GCS. This process is parallelized, prioritizing
-    high-frequency data.
-3.  Critical Data Validation: A post-refresh validation step ensures that the
-    external tables have been updated correctly. This is a critical gatekeeper
+1.  Wait for Data (Sensor): A deferrable sensor watches each table's prefix
+    in the GCS bucket from the triggerer (freeing the worker slot) and fires
+    when files newer than the last validated run arrive. The newly arrived
+    objects per table are pushed to XCom for downstream tasks.
+2.  Extract & Load (Refresh External Tables): Once data is detected, the
+    external table definitions are reconciled once per run (DDL is only issued
+    for tables that are missing or whose definition changed). Then each
+    table's `Tables/<table>/` prefix is listed and compared with the manifest
+    (per table: highest object generation, object count and a digest of the
+    listing) stored after the previous successful run. Only tables with new
+    or modified objects are refreshed in Snowflake; the others are skipped.
+    These tables point directly to the files in GCS.
+    With `NU_LANDING_FORMAT=parquet`, new CSVs of the high-frequency sources
+    are first converted to Parquet partitioned by completion date, so staging
+    filters on `completed_date` prune files.
+    Each update-frequency tier is refreshed in parallel with the others,
+    prioritizing high-frequency data.
+    With `NU_REFRESH_MODE=bulk`, each tier's refreshes are submitted as async
+    queries over a single Snowflake session by one task (bounded concurrency,
+    per-table retries and timeouts), and mapped tasks show each table's status.
+    With `NU_INGESTION_MODE=snowpipe`, Snowpipe loads native tables as files
+    land; instead of refreshing, the DAG waits (in reschedule mode) until
+    each pipe has loaded the new files seen this run, from the pipe status and
+    copy history. Pipes never reload a path, so files overwritten in place
+    are reloaded by the DAG (rows of the old version deleted, forced COPY).
+3.  Critical Data Validation: A post-refresh validation step per tier ensures
+    that the external tables have been updated correctly, using only Snowflake's file
+    registration metadata (one query per tier, no data scans). This is a critical gatekeeper
     to prevent the propagation of stale data or running transformations on
     incomplete datasets. The DAG will fail if high-frequency tables have not
-    been recently updated.
-4.  Transform (dbt): With the raw data validated and updated in Snowflake,
-    a dbt project (managed by Cosmos) is executed to perform all transformations,
-    creating analytical models, fact, and dimension tables.
-5.  Completion: A final task marks the successful completion of the pipeline.
+    been recently updated. A validated tier (with new files this run) updates
+    its Asset (`nu_raw_<tier>`).
+4.  Transform (dbt): As soon as a tier's raw data is validated, the dbt models
+    of that tier (managed by Cosmos) are executed: each model belongs to the
+    least frequent tier among its sources, so the transaction facts only wait
+    for the high-frequency tables, while the account models (accounts and
+    transactions) run after the high-frequency group, when either tier has
+    new files. Tiers without new files are skipped. The
+    low-frequency models (calendar and locations) run in the separate
+    `nu_low_frequency_models` DAG, scheduled on the low-frequency Asset, so
+    they are only rebuilt when their sources actually change. The task graph is
+    rendered from a `manifest.json` prebuilt with the Docker image (Cosmos'
+    automatic parsing if it is missing or stale), keeping DAG parsing fast. With
+    `NU_DBT_EXECUTION_MODE=batched`, each tier runs in a single `dbt build`
+    and per-model status is shown by mapped tasks built from `run_results.json`. Transaction models
+    are incremental (merge on `(source_table, transaction_id)`); trigger the DAG with
+    `{"full_refresh": true}` to rebuild them from the full history. With
+    `NU_INCREMENTAL_STAGING=true`, the high-frequency staging models are
+    incremental tables too, loading only rows of files not ingested yet.
+    The account dimension and the monthly summaries roll up from
+    `int_account_daily_activity`, an incremental aggregate of mergeable
+    daily partials per account, channel and direction, so the transactions
+    are scanned once per run instead of once per consumer.
+    The time, location and customer dimensions are `fingerprinted_table`
+    models: they are only rebuilt when their compiled SQL or the freshness
+    and volume of their upstream tables changed (reported as `UNCHANGED`).
+    Each model runs on the warehouse routed to it by name or tag in
+    `dbt_project.yml` (e.g. the `high_volume` facts on a larger warehouse);
+    with `NU_ADAPTIVE_WAREHOUSE_SIZING=true`, models are also moved a size
+    up or down from their previous run's telemetry.
+    dbt data tests only check the rows of the run's window (from the
+    incremental watermark of the transaction models, not the wall clock;
+    the whole history on full refreshes), with the checks of each model fused into one
+    scan; the `nu_data_quality_audit` DAG runs every test on the full history
+    weekly, including the source tests on the raw files.
+5.  Telemetry: Execution time, rows affected and Snowflake query id of every
+    model and test are joined with the query history (bytes/partitions
+    scanned, spill, warehouse) and stored in `PIPELINE_METRICS`, flagging
+    models much slower than their trailing median. The clustering keys,
+    search optimization and materialized views of the models are declared
+    in the `physical_design` var of `dbt_project.yml` and applied by a dbt
+    post-hook; the clustering depth of the clustered tables is stored in
+    `CLUSTERING_METRICS` after each run, flagging tables whose pruning degraded.
+6.  Completion: A final task marks the successful completion of the pipeline.
+
+Historical reloads run in the separate `nu_backfill` DAG: the incremental
+transaction and account-month models are rebuilt month by month, in parallel
+chunks, into `<schema>_backfill` tables whose months replace those of the
+production tables once every chunk is done (rows outside the range are kept).
+Finished chunks are checkpointed, so a failed backfill resumes where it
+stopped. While a backfill is in progress, the dbt models of this pipeline
+wait for it to finish.
 """
 
 # =============================================================================
 # IMPORTS
 # =============================================================================
+import json
 import logging
-from datetime import datetime, timedelta
+import os
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from pathlib import Path
 
 # Airflow Providers
-from airflow.decorators import dag
+from airflow.decorators import dag, task
+from airflow.exceptions import AirflowFailException, AirflowSkipException
+from airflow.models.param import Param
 from airflow.operators.empty import EmptyOperator
-from airflow.operators.python import PythonOperator
+from airflow.operators.python import PythonOperator, get_current_context
+from airflow.sensors.base import PokeReturnValue
 from airflow.providers.common.sql.operators.sql import SQLExecuteQueryOperator
-from airflow.providers.google.cloud.sensors.gcs import GCSObjectsWithPrefixExistenceSensor
+from airflow.sdk import Asset
 from airflow.utils.task_group import TaskGroup
 
 # Astronomer Cosmos for dbt integration
-from cosmos import DbtTaskGroup, ExecutionConfig, ProfileConfig, ProjectConfig
+from cosmos import DbtTaskGroup, ExecutionConfig, LoadMode, ProfileConfig, ProjectConfig, RenderConfig
+from cosmos.operators.local import (
+    DbtBuildLocalOperator,
+    DbtLocalBaseOperator,
+    DbtRunLocalOperator,
+    DbtRunOperationLocalOperator,
+    DbtTestLocalOperator,
+)
 from cosmos.profiles import SnowflakeUserPasswordProfileMapping
 
+# Project modules (Astro `include/` folder)
+from include.backfill import (
+    BackfillTable,
+    SnowflakeBackfillWarehouse,
+    VariableCheckpointStore,
+    month_chunks,
+    plan_backfill,
+    promote_backfill,
+)
+from include.bulk_refresh_operator import SnowflakeBulkRefreshOperator
+from include.clustering_health import (
+    SnowflakeClusteringInfoProvider,
+    SnowflakeClusteringStore,
+    clustered_tables,
+    collect_clustering_stats,
+    flag_degraded_clustering,
+)
+from include.dbt_manifest import prebuilt_manifest
+from include.dbt_run_results import NODE_RESULTS_XCOM_KEY, node_outcome, push_node_results
+from include.external_table_validation import (
+    build_validation_report,
+    build_validation_sql,
+    summarize_by_tier,
+)
+from include.gcs_arrival import GCSNewObjectsSensor
+from include.gcs_manifest import GCSObjectLister, VariableManifestStore, detect_changes, new_objects
+from include.pipeline_metrics import (
+    SnowflakeMetricsStore,
+    SnowflakeQueryHistoryProvider,
+    build_metrics,
+    flag_regressions,
+)
+from include.snowpipe_ingestion import (
+    MAX_COPY_HISTORY_LOOKBACK,
+    SnowpipeMonitor,
+    copy_history_start,
+    evaluate_pipe_progress,
+    overwritten_objects,
+    reload_overwritten_files,
+)
+from include.tier_scheduling import changed_tiers, tier_selection, tier_upstreams
+from include.warehouse_sizing import SizingPolicy, choose_warehouses
+
 # =============================================================================
 # CONSTANTS & CONFIGURATION
 # =============================================================================
@@ -53,6 +177,50 @@ SNOWFLAKE_CONN_ID = "snowflake_conn"
 GCS_BUCKET_NAME = "nu_dataset"
 GCS_DATA_PREFIX = "Tables/"
 
+# --- Ingestion Mode ---
+# 'external_tables': the DAG refreshes external tables over the landed files.
+# 'snowpipe': the AUTO_INGEST pipes of `create_pipe.sql` load native tables;
+# the DAG waits until the pipes have loaded this run's new files and reloads
+# the files overwritten in place itself.
+# The native tables have the names of the external tables: drop the external
+# tables before switching to 'snowpipe' (and the native tables before switching back).
+INGESTION_MODE = os.getenv("NU_INGESTION_MODE", "external_tables")
+if INGESTION_MODE not in ("external_tables", "snowpipe"):
+    raise ValueError(f"Invalid NU_INGESTION_MODE '{INGESTION_MODE}'. Use 'external_tables' or 'snowpipe'.")
+INGESTION_GROUP_ID = (
+    "wait_for_snowpipe_ingestion" if INGESTION_MODE == "snowpipe" else "refresh_and_validate_external_tables"
+)
+# How often and how long to wait for a pipe to load the files of the run
+SNOWPIPE_POKE_INTERVAL = 30
+SNOWPIPE_TIMEOUT = 30 * 60
+
+# --- External Table Refresh Mode ---
+# 'per_table': one task (and Snowflake session) per `ALTER EXTERNAL TABLE ... REFRESH`.
+# 'bulk': one task per tier submitting its refreshes as async queries over a
+# single Snowflake session, with per-table retries and mapped per-table status.
+REFRESH_MODE = os.getenv("NU_REFRESH_MODE", "per_table")
+BULK_REFRESH_MAX_CONCURRENCY = int(os.getenv("NU_BULK_REFRESH_MAX_CONCURRENCY", "4"))
+BULK_REFRESH_MAX_ATTEMPTS = 3
+BULK_REFRESH_QUERY_TIMEOUT = 10 * 60  # Seconds before a refresh attempt is cancelled
+
+# --- GCS Change Detection ---
+# Airflow Variable holding the per-table states (see include.gcs_manifest) of the last validated refresh
+GCS_MANIFEST_VARIABLE = "nu_gcs_manifest"
+DETECT_CHANGES_TASK_ID = f"{INGESTION_GROUP_ID}.detect_changed_tables"
+
+# --- Landing Format ---
+# 'csv': external tables read the landed CSVs directly.
+# 'parquet': new CSVs of the high-frequency sources are converted to Parquet
+# partitioned by completion date before their external tables are refreshed.
+# Only applies to the 'external_tables' ingestion mode.
+LANDING_FORMAT = os.getenv("NU_LANDING_FORMAT", "csv")
+
+# --- Staging Materialization ---
+# When true, `stg_pix_movements`, `stg_transfer_ins` and `stg_transfer_outs`
+# are incremental tables that only load rows of files not ingested yet
+# (tracked by file name and row number) instead of views over the external tables.
+INCREMENTAL_STAGING = os.getenv("NU_INCREMENTAL_STAGING", "false").lower() == "true"
+
 # --- DAG Configuration ---
 DAG_OWNER = "data_team"
 DAG_EMAIL_ON_FAILURE = True
@@ -64,9 +232,55 @@ SNOWFLAKE_ANALYTICS_SCHEMA = "NU_ANALYTIC_SCHEMA"
 SNOWFLAKE_WAREHOUSE = "NU_WH"
 SNOWFLAKE_ROLE = "NU_ROLE"
 
+# --- Performance Telemetry ---
+PIPELINE_METRICS_TABLE = f"{SNOWFLAKE_DB}.{SNOWFLAKE_ANALYTICS_SCHEMA}.PIPELINE_METRICS"
+# A node is a regression when it runs more than N× slower than the median of
+# its last REGRESSION_WINDOW_RUNS successful runs (and takes at least MIN_SECONDS)
+REGRESSION_FACTOR = 2.0
+REGRESSION_WINDOW_RUNS = 10
+REGRESSION_MIN_SECONDS = 5.0
+
+# --- Clustering Health ---
+# Clustering keys, search optimization and materialized views are declared in
+# the `physical_design` var of dbt_project.yml. A clustered table is degraded
+# when its average depth is more than N× the median of its last
+# CLUSTERING_WINDOW_RUNS runs (and at least MIN_DEPTH).
+CLUSTERING_METRICS_TABLE = f"{SNOWFLAKE_DB}.{SNOWFLAKE_ANALYTICS_SCHEMA}.CLUSTERING_METRICS"
+CLUSTERING_DEGRADATION_FACTOR = 2.0
+CLUSTERING_WINDOW_RUNS = 10
+CLUSTERING_MIN_DEPTH = 4.0
+
+# --- Warehouse Sizing ---
+# Models are routed to warehouses by name or tag in dbt_project.yml
+# (`warehouse_routing`, e.g. `high_volume` facts on a larger warehouse). With
+# NU_ADAPTIVE_WAREHOUSE_SIZING=true, each model is also moved one step up or
+# down WAREHOUSE_LADDER (smallest first) from its previous run's metrics.
+ADAPTIVE_WAREHOUSE_SIZING = os.getenv("NU_ADAPTIVE_WAREHOUSE_SIZING", "false").lower() == "true"
+WAREHOUSE_LADDER = [
+    warehouse.strip()
+    for warehouse in os.getenv("NU_WAREHOUSE_LADDER", f"{SNOWFLAKE_WAREHOUSE},NU_WH_MEDIUM,NU_WH_LARGE").split(",")
+    if warehouse.strip()
+]
+WAREHOUSE_SIZING_POLICY = SizingPolicy(
+    scale_up_seconds=300,           # Slow ...
+    scale_up_bytes=10 * 1024 ** 3,  # ... and scan-heavy (or spilling to remote storage): one size up
+    scale_down_seconds=30,          # Fast: one size down
+)
+
 # --- dbt Configuration ---
 DBT_PROJECT_PATH = "/usr/local/airflow/dags/dbt_pipeline"
 DBT_EXECUTABLE_PATH = "/usr/local/airflow/dbt_venv/bin/dbt"
+# Manifest prebuilt by the Docker image (`python -m include.dbt_manifest`) used to
+# render the dbt task graph. Never built here; None (missing, or older than a
+# file under `dbt_pipeline/`) falls back to Cosmos' default parsing.
+DBT_MANIFEST_PATH = prebuilt_manifest(DBT_PROJECT_PATH)
+
+# --- dbt Execution Mode ---
+# 'per_model': Cosmos renders one task (and one dbt process) per model and test.
+# 'batched': one `dbt build` per tier (see DBT_TIER_SELECTION) with DBT_THREADS
+# threads; per-node status is read back from `run_results.json`.
+DBT_EXECUTION_MODE = os.getenv("NU_DBT_EXECUTION_MODE", "per_model")
+DBT_THREADS = int(os.getenv("NU_DBT_THREADS", "8"))
 
 # --- External Tables Configuration by Update Frequency ---
 # This configuration centralizes the refresh and validation logic.
@@ -82,6 +296,85 @@ EXTERNAL_TABLES_CONFIG = {
     ],
 }
 
+# --- Tier Scheduling ---
+# dbt source declaring the raw tables (models/staging/sources.yml)
+DBT_SOURCE_NAME = "nu_sources"
+# Tiers whose models run in `nu_data_pipeline` right after their own sources are ready
+PIPELINE_TIERS = ["high_frequency", "medium_frequency"]
+# Tier whose models only run in `nu_low_frequency_models`, when its Asset is updated
+ASSET_SCHEDULED_TIER = "low_frequency"
+DBT_MANIFEST = json.loads(Path(DBT_MANIFEST_PATH).read_text()) if DBT_MANIFEST_PATH else None
+# Each model belongs to the least frequent tier among its sources, e.g.
+# `fct_transactions` is high frequency and `dim_account` (accounts and
+# transactions) medium; the low-frequency tier only owns the models reading
+# nothing else, e.g. `dim_calendar`.
+DBT_TIER_SELECTION = tier_selection(
+    EXTERNAL_TABLES_CONFIG,
+    DBT_SOURCE_NAME,
+    manifest=DBT_MANIFEST,
+    standalone=[ASSET_SCHEDULED_TIER],
+)
+# Tiers whose models each tier reads, e.g. the medium-frequency models read the
+# high-frequency ones: their groups run first and also trigger the tier's group
+DBT_TIER_UPSTREAMS = tier_upstreams(
+    EXTERNAL_TABLES_CONFIG,
+    DBT_SOURCE_NAME,
+    manifest=DBT_MANIFEST,
+    standalone=[ASSET_SCHEDULED_TIER],
+)
+# One Asset per tier, updated once the tier's sources are loaded (and validated) this run
+TIER_ASSETS = {
+    tier: Asset(name=f"nu_raw_{tier}", uri=f"nu://{SNOWFLAKE_DB}/{SNOWFLAKE_RAW_SCHEMA}/{tier}".lower())
+    for tier in EXTERNAL_TABLES_CONFIG
+}
+
+# Sources converted to date-partitioned Parquet when LANDING_FORMAT == "parquet"
+PARQUET_LANDING_TABLES = EXTERNAL_TABLES_CONFIG["high_frequency"]
+
+# Max age of `last_altered` for a table refreshed this run. Tiers without a
+# threshold (low frequency) are only checked for registered files.
+FRESHNESS_THRESHOLDS = {
+    "high_frequency": timedelta(hours=4),
+    "medium_frequency": timedelta(days=1),
+}
+
+# --- Historical Backfill (`nu_backfill`) ---
+# Incremental models rebuilt month by month into `<schema>_backfill`, whose
+# months then replace those of production. Phases run in order: the account-month models need
+# every transaction chunk of the range, so they start once the transactions are done.
+BACKFILL_PHASES = {
+    "transactions": [
+        "int_unified_transactions", "int_transactions_enriched", "int_account_daily_activity", "fct_transactions",
+    ],
+    "account_months": ["int_account_monthly_spine", "int_monthly_transaction_summary", "fct_account_monthly_balances"],
+}
+BACKFILL_MODELS = [model for models in BACKFILL_PHASES.values() for model in models]
+# Column each model's chunks are windowed on (its `backfill_clear_chunk` pre-hook):
+# the rows of the backfilled months are replaced by this column
+BACKFILL_WINDOW_COLUMNS = {
+    "int_unified_transactions": "transaction_completed_at",
+    "int_transactions_enriched": "transaction_completed_at",
+    "int_account_daily_activity": "completed_date",
+    "fct_transactions": "transaction_completed_at",
+    "int_account_monthly_spine": "month_date",
+    "int_monthly_transaction_summary": "month_date",
+    "fct_account_monthly_balances": "month_date",
+}
+BACKFILL_SCHEMA_SUFFIX = "_backfill"
+# Month chunks of a phase running at the same time (each is one dbt process and Snowflake session)
+BACKFILL_MAX_PARALLEL_CHUNKS = int(os.getenv("NU_BACKFILL_MAX_PARALLEL_CHUNKS", "4"))
+# Prefix of the Airflow Variables checkpointing the finished chunks; its range
+# Variable also marks a backfill in progress, which `nu_data_pipeline` waits on
+BACKFILL_CHECKPOINT_PREFIX = "nu_backfill"
+BACKFILL_WAIT_POKE_INTERVAL = 5 * 60
+BACKFILL_WAIT_TIMEOUT = 12 * 60 * 60
+
+# --- Data Quality Audit ---
+# The pipeline's data tests only check the rows of the run's window (dbt var
+# `test_mode`); `nu_data_quality_audit` runs every test on the full history,
+# including the source tests on the raw files, on this schedule
+DATA_QUALITY_AUDIT_SCHEDULE = "0 6 * * 0"  # Sundays at 06:00
+
 # --- Airflow Default Arguments ---
 default_args = {
     "owner": DAG_OWNER,
@@ -113,9 +406,384 @@ profile_config = ProfileConfig(
 # HELPER FUNCTIONS
 # =============================================================================
 
-def validate_external_table_refresh(**context):
+def detect_changed_external_tables(**context):
+    """
+    Lists every table's landing prefix in GCS and compares it with the stored manifest.
+
+    Tables whose prefix has no new, overwritten or removed objects since the
+    last validated run do not need an `ALTER EXTERNAL TABLE ... REFRESH`. Only
+    the changed table names and their new fixed-size states (high-water mark,
+    object count, digest) are pushed to XCom; `commit_gcs_manifest` stores the
+    states once the refresh has been validated, so a failed run is retried
+    against the same baseline. Tasks needing the new objects list them with
+    `landed_objects`.
+
+    Args:
+        context (dict): The Airflow task context, automatically injected.
+
+    Returns:
+        list: Sorted names of the tables that changed (all tables on full refreshes).
+    """
+    all_tables = [table for tables in EXTERNAL_TABLES_CONFIG.values() for table in tables]
+    result = detect_changes(
+        lister=GCSObjectLister(bucket=GCS_BUCKET_NAME, gcp_conn_id=GCP_CONN_ID),
+        store=VariableManifestStore(GCS_MANIFEST_VARIABLE),
+        tables=all_tables,
+        data_prefix=GCS_DATA_PREFIX,
+        force=context["params"].get("full_refresh", False),
+    )
+    context["ti"].xcom_push(
+        key="table_states",
+        value={table: result["manifest"][table] for table in result["changed_tables"]},
+    )
+    context["ti"].xcom_push(key="changed_tables", value=result["changed_tables"])
+    return result["changed_tables"]
+
+
+def landed_objects(ti, table, since_start=False):
+    """
+    Lists the objects of a changed table written between the last validated run and this run's snapshot.
+
+    The bounds are the table's high-water mark in the stored manifest (the
+    baseline until `commit_gcs_manifest`) and in the state detected this run,
+    so objects landed meanwhile are left to the next run.
+
+    Args:
+        ti (TaskInstance): The running task instance.
+        table (str): Table of `EXTERNAL_TABLES_CONFIG`.
+        since_start (bool): List every object up to the snapshot (full refreshes).
+
+    Returns:
+        dict: {object name: generation}; empty when the table did not change this run.
+    """
+    state = (ti.xcom_pull(task_ids=DETECT_CHANGES_TASK_ID, key="table_states") or {}).get(table)
+    if not state:
+        return {}
+    since = 0 if since_start else VariableManifestStore(GCS_MANIFEST_VARIABLE).load().get(table, {}).get("generation", 0)
+    objects = new_objects(
+        GCSObjectLister(bucket=GCS_BUCKET_NAME, gcp_conn_id=GCP_CONN_ID),
+        table,
+        GCS_DATA_PREFIX,
+        since_generation=since,
+        until_generation=state["generation"],
+    )
+    return {obj.name: obj.generation for obj in objects}
+
+
+def skip_unless_table_changed(context, table):
+    """
+    `pre_execute` hook that short-circuits a refresh task when its table has no new objects.
+
+    Raises:
+        AirflowSkipException: If `table` is not in the changed tables detected this run.
+    """
+    changed_tables = context["ti"].xcom_pull(task_ids=DETECT_CHANGES_TASK_ID, key="changed_tables") or []
+    if table not in changed_tables:
+        raise AirflowSkipException(f"No new objects under '{GCS_DATA_PREFIX}{table}/'; skipping refresh.")
+
+
+def skip_unless_tier_changed(context, tier):
+    """
+    `pre_execute` hook that short-circuits a tier's gate task when none of its tables has new objects.
+
+    The gate is skipped, so its Asset is not updated and the tier's dbt models
+    do not run this time.
+
+    Raises:
+        AirflowSkipException: If no table of `tier` is in the changed tables detected this run.
+    """
+    changed_tables = context["ti"].xcom_pull(task_ids=DETECT_CHANGES_TASK_ID, key="changed_tables") or []
+    if tier not in changed_tiers(changed_tables, EXTERNAL_TABLES_CONFIG):
+        raise AirflowSkipException(f"No new objects for the {tier} tables; skipping its dbt models.")
+
+
+def publish_tier_ingestion(tier, **context):
+    """
+    Marks a tier's raw tables as loaded by their pipes this run, updating the tier's Asset.
+
+    Args:
+        tier (str): Tier of `EXTERNAL_TABLES_CONFIG`.
+        context (dict): The Airflow task context, automatically injected.
+
+    Returns:
+        list: The tier's tables with new objects this run.
+    """
+    changed_tables = context["ti"].xcom_pull(task_ids=DETECT_CHANGES_TASK_ID, key="changed_tables") or []
+    return [table for table in EXTERNAL_TABLES_CONFIG[tier] if table in changed_tables]
+
+
+def reload_overwritten_pipe_files(table, **context):
+    """
+    Reloads into a pipe-fed table the objects overwritten in place this run.
+
+    The pipe skips paths it already loaded, so the objects written this run
+    whose path was loaded before (`overwritten_objects`, from the last 14 days
+    of COPY_HISTORY, the pipe's own load metadata window) are reloaded here:
+    their rows are deleted and the files are copied again with the pipe's
+    COPY statement and `FORCE = TRUE`.
+
+    Args:
+        table (str): Raw table fed by `<table>_pipe`.
+        context (dict): The Airflow task context, automatically injected.
+
+    Returns:
+        list: Stage paths of the reloaded files.
+
+    Raises:
+        AirflowSkipException: If no object of the table was overwritten this run.
+    """
+    written = landed_objects(context["ti"], table)
+    if not written:
+        raise AirflowSkipException(f"No new objects under '{GCS_DATA_PREFIX}{table}/'.")
+    monitor = SnowpipeMonitor(SNOWFLAKE_CONN_ID, SNOWFLAKE_DB, SNOWFLAKE_RAW_SCHEMA)
+    copy_history = monitor.copy_history(table, datetime.now(timezone.utc) - MAX_COPY_HISTORY_LOOKBACK)
+    overwritten = overwritten_objects(copy_history, written, GCS_DATA_PREFIX)
+    if not overwritten:
+        raise AirflowSkipException(f"No overwritten objects under '{GCS_DATA_PREFIX}{table}/'.")
+    return reload_overwritten_files(monitor, table, overwritten, GCS_DATA_PREFIX)
+
+
+@task.sensor(poke_interval=SNOWPIPE_POKE_INTERVAL, timeout=SNOWPIPE_TIMEOUT, mode="reschedule")
+def wait_for_pipe_ingestion(table):
+    """
+    Waits until a table's pipe has loaded every new object that landed for it this run.
+
+    The expected objects are the table's objects written this run
+    (`landed_objects`); overwritten ones, which the pipe never loads twice,
+    count once `reload_overwritten_pipe_files` copied them again.
+    Each poke reads `SYSTEM$PIPE_STATUS` and the table's `COPY_HISTORY`; the
+    worker slot is released between pokes.
+
+    Args:
+        table (str): Raw table fed by `<table>_pipe`.
+
+    Returns:
+        PokeReturnValue: Done once every expected object is loaded.
+
+    Raises:
+        AirflowSkipException: If no object landed for the table this run.
+        AirflowFailException: If the pipe is not running or a file failed to load.
+    """
+    ti = get_current_context()["ti"]
+    expected = landed_objects(ti, table)
+    if not expected:
+        raise AirflowSkipException(f"No new objects under '{GCS_DATA_PREFIX}{table}/'; nothing to wait for.")
+
+    monitor = SnowpipeMonitor(SNOWFLAKE_CONN_ID, SNOWFLAKE_DB, SNOWFLAKE_RAW_SCHEMA)
+    progress = evaluate_pipe_progress(
+        table,
+        pipe_status=monitor.pipe_status(table),
+        copy_history=monitor.copy_history(table, copy_history_start(expected)),
+        expected_objects=expected,
+        data_prefix=GCS_DATA_PREFIX,
+    )
+    logging.getLogger(__name__).info(progress.summary())
+
+    if progress.failed:
+        raise AirflowFailException(f"Files failed to load into '{table}': {progress.failed}")
+    if not progress.caught_up and not progress.is_running:
+        raise AirflowFailException(f"{progress.summary()}; the pipe will not load the pending files.")
+    return PokeReturnValue(is_done=progress.caught_up, xcom_value=progress.loaded)
+
+
+def convert_landed_csvs_to_parquet(**context):
+    """
+    Converts the new or overwritten CSVs of the high-frequency sources to partitioned Parquet.
+
+    The CSVs to convert are the objects written since the last validated run
+    (`landed_objects`; every landed CSV on full refreshes) of the tables
+    `detect_changed_tables` reported. Output is written under
+    `Tables/parquet/<table>/completed_date=YYYY-MM-DD/`, which the Parquet
+    external tables read.
+
+    Args:
+        context (dict): The Airflow task context, automatically injected.
+
+    Returns:
+        dict: {table: {"files", "rows", "partitions"}} for the converted tables.
+    """
+    # Imported here to keep pyarrow out of DAG parsing
+    from include.parquet_landing import convert_landed_objects, gcs_filesystem
+
+    full_refresh = context["params"].get("full_refresh", False)
+    objects_by_table = {
+        table: list(landed_objects(context["ti"], table, since_start=full_refresh))
+        for table in PARQUET_LANDING_TABLES
+    }
+
+    summary = convert_landed_objects(
+        filesystem=gcs_filesystem(GCS_BUCKET_NAME, GCP_CONN_ID),
+        objects_by_table=objects_by_table,
+        data_prefix=GCS_DATA_PREFIX,
+    )
+    for table, result in summary.items():
+        logging.getLogger(__name__).info(
+            f"'{table}': {result['files']} CSV(s), {result['rows']} rows into {len(result['partitions'])} partition(s)."
+        )
+    return summary
+
+
+@task(map_index_template="{{ refreshed_table }}")
+def check_table_refresh(result):
+    """
+    Surfaces the outcome of one table of a bulk external table refresh as a mapped task.
+
+    Args:
+        result (dict): `RefreshResult` of the table, returned by `SnowflakeBulkRefreshOperator`.
+
+    Raises:
+        AirflowFailException: If the table's refresh failed or timed out on every attempt.
+    """
+    get_current_context()["refreshed_table"] = result["table"]
+    summary = (
+        f"'{result['table']}': {result['status']} after {result['attempts']} attempt(s) "
+        f"in {result['elapsed_seconds']:.1f}s (query {result['query_id']})"
+    )
+    if result["status"] != "success":
+        raise AirflowFailException(f"{summary} - {result['error']}")
+    return summary
+
+
+@task(trigger_rule="all_done")
+def list_dbt_nodes(build_task_id):
+    """
+    Returns the node summaries pushed by a batched `dbt build` task, for mapping.
+
+    Runs even when the build failed, so the failing nodes are still shown.
+    """
+    ti = get_current_context()["ti"]
+    return ti.xcom_pull(task_ids=build_task_id, key=NODE_RESULTS_XCOM_KEY) or []
+
+
+@task(map_index_template="{{ dbt_node }}")
+def check_dbt_node_status(node):
+    """
+    Surfaces the outcome of one dbt node of a batched `dbt build` as a mapped task.
+
+    Args:
+        node (dict): Node summary pushed by `push_node_results`.
+
+    Raises:
+        AirflowFailException: If the model/test errored or failed.
+        AirflowSkipException: If dbt skipped the node (e.g. an upstream failed).
+    """
+    get_current_context()["dbt_node"] = node["unique_id"]
+    outcome = node_outcome(node)
+    summary = f"{node['unique_id']}: {node['status']} in {node['execution_time'] or 0:.1f}s"
+
+    if outcome == "failed":
+        raise AirflowFailException(f"{summary} - {node['message']}")
+    if outcome == "skipped":
+        raise AirflowSkipException(summary)
+    if outcome == "unchanged":
+        return f"{summary} (unchanged, not rebuilt)"
+    return summary
+
+
+def collect_pipeline_metrics(dbt_task_ids, **context):
+    """
+    Collects per-model/test performance telemetry for the dbt run.
+
+    Node summaries (execution time, rows affected, query id) are pushed by the
+    `push_node_results` Cosmos callback of every dbt task. They are joined with
+    Snowflake's query history (bytes and partitions scanned, spill, warehouse),
+    compared with each node's trailing median execution time, and written to
+    the `PIPELINE_METRICS` table. Regressions are logged as warnings and never
+    fail the run.
+
+    Args:
+        dbt_task_ids (list): Task ids of the dbt operators of this run.
+        context (dict): The Airflow task context, automatically injected.
+
+    Returns:
+        dict: Number of nodes collected and the unique ids of the regressed nodes.
+    """
+    ti = context["ti"]
+    node_results = []
+    for nodes in ti.xcom_pull(task_ids=dbt_task_ids, key=NODE_RESULTS_XCOM_KEY) or []:
+        node_results.extend(nodes or [])
+
+    metrics = build_metrics(
+        node_results,
+        history_provider=SnowflakeQueryHistoryProvider(SNOWFLAKE_CONN_ID, SNOWFLAKE_DB),
+        dag_id=context["dag"].dag_id,
+        run_id=context["run_id"],
+        collected_at=datetime.utcnow(),
+    )
+
+    store = SnowflakeMetricsStore(SNOWFLAKE_CONN_ID, PIPELINE_METRICS_TABLE)
+    store.ensure_table()
+    trailing_times = store.trailing_execution_times([row["unique_id"] for row in metrics], REGRESSION_WINDOW_RUNS)
+    regressions = flag_regressions(
+        metrics,
+        trailing_times,
+        factor=REGRESSION_FACTOR,
+        min_seconds=REGRESSION_MIN_SECONDS,
+    )
+    store.write(metrics)
+
+    ti.xcom_push(key="pipeline_metrics", value=[{**row, "collected_at": row["collected_at"].isoformat()} for row in metrics])
+    ti.xcom_push(key="regressions", value=[row["unique_id"] for row in regressions])
+    return {"nodes": len(metrics), "regressions": [row["unique_id"] for row in regressions]}
+
+
+def monitor_clustering_health(**context):
+    """
+    Records the clustering depth of every clustered dbt model and flags degraded ones.
+
+    The clustered models are read from the `physical_design` var of
+    `dbt_project.yml`. Their `SYSTEM$CLUSTERING_INFORMATION` (average depth
+    and overlaps, constant partitions) is written to the `CLUSTERING_METRICS`
+    table, and tables much deeper than their trailing median are logged as
+    warnings; it never fails the run.
+
+    Args:
+        context (dict): The Airflow task context, automatically injected.
+
+    Returns:
+        dict: Number of tables inspected and the names of the degraded ones.
+    """
+    tables = [
+        f"{SNOWFLAKE_DB}.{SNOWFLAKE_ANALYTICS_SCHEMA}.{model}".upper()
+        for model in clustered_tables(DBT_PROJECT_PATH)
+    ]
+    rows = collect_clustering_stats(
+        tables,
+        provider=SnowflakeClusteringInfoProvider(SNOWFLAKE_CONN_ID),
+        dag_id=context["dag"].dag_id,
+        run_id=context["run_id"],
+        collected_at=datetime.utcnow(),
+    )
+
+    store = SnowflakeClusteringStore(SNOWFLAKE_CONN_ID, CLUSTERING_METRICS_TABLE)
+    store.ensure_table()
+    degraded = flag_degraded_clustering(
+        rows,
+        store.trailing_depths([row["table_name"] for row in rows], CLUSTERING_WINDOW_RUNS),
+        factor=CLUSTERING_DEGRADATION_FACTOR,
+        min_depth=CLUSTERING_MIN_DEPTH,
+    )
+    store.write(rows)
+    return {"tables": len(rows), "degraded": [row["table_name"] for row in degraded]}
+
+
+def commit_gcs_manifest(**context):
+    """
+    Persists the table states detected this run as the baseline for the next one.
+
+    Only the changed tables' states are updated. Runs only after the refresh
+    has been validated, so objects that failed to load are detected again on
+    the next run.
+    """
+    table_states = context["ti"].xcom_pull(task_ids=DETECT_CHANGES_TASK_ID, key="table_states") or {}
+    store = VariableManifestStore(GCS_MANIFEST_VARIABLE)
+    store.save({**store.load(), **table_states})
+    return f"Stored the state of {len(table_states)} changed tables."
+
+
+def validate_external_table_refresh(tier, **context):
     """
-    Validates the state of external tables in Snowflake after a refresh attempt.
+    Validates the state of a tier's external tables in Snowflake after a refresh attempt.
 
     This validation is a critical data quality gatekeeper for several reasons:
     1.  **Detects Silent Failures:** The `ALTER EXTERNAL TABLE REFRESH` command
@@ -123,14 +791,24 @@ def validate_external_table_refresh(**context):
         inaccessible (e.g., due to permissions changes), leading to stale data.
     2.  **Prevents Stale Data Propagation:** Ensures that downstream dbt models
         are built on fresh data, preventing incorrect analytics and reporting.
-    3.  **Differentiated Logic:** Applies validation rules based on data criticality:
-        -   **High/Medium Frequency:** Verifies that the `last_altered` timestamp in
-            the information schema is recent. A failure to refresh a high-frequency
-            table is a critical error and fails the DAG.
-        -   **Low Frequency:** Verifies only that the tables contain data (are not
-            empty), as they are not expected to change with every run.
+    3.  **Metadata Only:** The tier's tables are checked in a single query over the
+        external-table file registration metadata (file counts, bytes, last
+        registered time) and `last_altered`, so no CSV in GCS is scanned. Row
+        counts are an opt-in deep check (`deep_validation` DAG param).
+    4.  **Differentiated Logic:** Applies validation rules based on data criticality:
+        -   **High/Medium Frequency:** Verifies that `last_altered` is within the
+            tier's threshold (`FRESHNESS_THRESHOLDS`) for the tables refreshed this
+            run (tables without new objects in GCS are skipped). A failure to
+            refresh a high-frequency table is a critical error and fails the DAG.
+        -   **All tiers:** Flags tables without registered files as empty. This
+            may be expected for low-frequency tables, so it only logs a warning.
+
+    Each tier is validated by its own task, so the tier's dbt models only
+    wait for its tables. The per-table report is pushed to XCom as
+    `validation_report`, and the counts as `validation_summary`.
 
     Args:
+        tier (str): Tier of `EXTERNAL_TABLES_CONFIG` to validate.
         context (dict): The Airflow task context, automatically injected.
 
     Returns:
@@ -146,82 +824,291 @@ def validate_external_table_refresh(**context):
     logger = logging.getLogger(__name__)
     hook = SnowflakeHook(snowflake_conn_id=SNOWFLAKE_CONN_ID)
 
-    validation_summary = {}
-    critical_errors = []
-
-    # Validate high and medium frequency tables by `last_altered` timestamp
-    for category, threshold in [("high_frequency", "4 HOURS"), ("medium_frequency", "1 DAY")]:
-        tables = EXTERNAL_TABLES_CONFIG.get(category)
-        if not tables:
-            continue
-
-        logger.info(f"Validating {len(tables)} '{category}' tables with a {threshold} threshold.")
-
-        # Use parameter binding for security and correctness
-        placeholders = ", ".join(["%s"] * len(tables))
-        sql = f"""
-            SELECT table_name
-            FROM {SNOWFLAKE_DB}.information_schema.tables
-            WHERE table_schema = %s
-              AND table_type = 'EXTERNAL TABLE'
-              AND table_name IN ({placeholders})
-              AND last_altered > CURRENT_TIMESTAMP - INTERVAL '{threshold}';
-        """
-        params = [SNOWFLAKE_RAW_SCHEMA.upper()] + [t.upper() for t in tables]
-
-        refreshed_tables_rows = hook.get_records(sql, parameters=params)
-        refreshed_names = {row[0].lower() for row in refreshed_tables_rows}
-        expected_names = set(tables)
-        missing_refresh = expected_names - refreshed_names
-
-        if missing_refresh:
-            error_msg = f"'{category}' tables not recently refreshed (> {threshold}): {sorted(list(missing_refresh))}"
-            if category == "high_frequency":
-                logger.error(f"CRITICAL: {error_msg}")
-                critical_errors.append(error_msg)
-            else:
-                logger.warning(f"WARNING: {error_msg}")
-        else:
-            logger.info(f"All '{category}' tables were recently refreshed.")
-
-        validation_summary[category] = {
-            "refreshed_count": len(refreshed_names),
-            "missing_count": len(missing_refresh),
-            "missing_tables": sorted(list(missing_refresh)),
-        }
-
-    # Validate low frequency tables for data existence (non-empty)
-    low_freq_tables = EXTERNAL_TABLES_CONFIG.get("low_frequency")
-    if low_freq_tables:
-        logger.info(f"Validating {len(low_freq_tables)} 'low_frequency' tables for data existence.")
-        union_queries = [
-            f"SELECT '{table}' AS table_name, COUNT(*) AS record_count FROM {SNOWFLAKE_DB}.{SNOWFLAKE_RAW_SCHEMA}.{table}"
-            for table in low_freq_tables
-        ]
-        sql = " UNION ALL ".join(union_queries)
-
-        data_results = hook.get_records(sql)
-        empty_tables = {row[0] for row in data_results if row[1] == 0}
-        tables_with_data = set(low_freq_tables) - empty_tables
-
-        if empty_tables:
-            logger.warning(f"'low_frequency' tables found empty (this may be expected): {sorted(list(empty_tables))}")
-        else:
-            logger.info("All 'low_frequency' tables contain data.")
-
-        validation_summary["low_frequency"] = {
-            "with_data_count": len(tables_with_data),
-            "empty_count": len(empty_tables),
-            "empty_tables": sorted(list(empty_tables)),
-        }
+    tier_tables = {tier: EXTERNAL_TABLES_CONFIG[tier]}
+    changed_tables = context["ti"].xcom_pull(task_ids=DETECT_CHANGES_TASK_ID, key="changed_tables") or []
+    deep = context["params"].get("deep_validation", False)
+
+    logger.info(f"Validating {len(tier_tables[tier])} {tier} external tables from registration metadata (deep={deep}).")
+    sql = build_validation_sql(SNOWFLAKE_DB, SNOWFLAKE_RAW_SCHEMA, tier_tables[tier], deep=deep)
+    rows = hook.get_records(sql, parameters=[SNOWFLAKE_RAW_SCHEMA.upper()])
+
+    validation_report, critical_errors = build_validation_report(
+        rows,
+        tiers=tier_tables,
+        freshness_thresholds=FRESHNESS_THRESHOLDS,
+        refreshed_tables=changed_tables,
+    )
+    validation_summary = summarize_by_tier(validation_report, tier_tables)
+
+    for table, result in validation_report.items():
+        if result["status"] == "stale" and result["tier"] != "high_frequency":
+            logger.warning(f"WARNING: '{table}' ({result['tier']}) not refreshed within its threshold.")
+        elif result["status"] == "empty":
+            logger.warning(f"'{table}' has no registered files (this may be expected).")
+    for error_msg in critical_errors:
+        logger.error(f"CRITICAL: {error_msg}")
 
     logger.info(f"--- Validation Summary --- \n{validation_summary}")
+    context["ti"].xcom_push(key="validation_report", value=validation_report)
     context["ti"].xcom_push(key="validation_summary", value=validation_summary)
 
     if critical_errors:
         raise ValueError(f"Critical validation failed: {'; '.join(critical_errors)}")
 
-    return "External table validation completed successfully."
+    return f"External table validation of the {tier} tier completed successfully."
+
+
+def dbt_tier_group(tier, changed_sources):
+    """
+    Builds the task group running one tier's dbt models (see `DBT_TIER_SELECTION`).
+
+    Must be called inside a DAG definition. In the per-model execution mode the
+    group is a Cosmos `DbtTaskGroup` rendered from the tier's selection; in the
+    batched mode it is a single `dbt build` of the selection plus one mapped
+    status task per node.
+
+    Args:
+        tier (str): Tier of `EXTERNAL_TABLES_CONFIG`, also used as group id.
+        changed_sources (str): Value (or template) of the `changed_sources` dbt var.
+
+    Returns:
+        TaskGroup: The tier's dbt task group.
+    """
+    selection = DBT_TIER_SELECTION[tier]
+    dbt_operator_args = {
+        "install_deps": True,   # Ensures dbt dependencies are installed
+        # Incremental runs by default; escape hatch via the `full_refresh` param
+        "full_refresh": "{{ params.full_refresh }}",
+        # Sources with new objects in GCS, available as `var('changed_sources')`
+        "vars": {
+            "changed_sources": changed_sources,
+            "landing_format": LANDING_FORMAT,
+            "incremental_staging": INCREMENTAL_STAGING,
+            "ingestion_mode": INGESTION_MODE,
+            # A full refresh reloads every row, so its tests check the whole history
+            "test_mode": "{{ 'full' if params.full_refresh else 'window' }}",
+        },
+    }
+    if ADAPTIVE_WAREHOUSE_SIZING:
+        # Per-model warehouses chosen from the previous run, applied by each model's pre-hook
+        dbt_operator_args["vars"]["warehouse_overrides"] = "{{ ti.xcom_pull(task_ids='plan_warehouse_sizing') or {} }}"
+
+    if DBT_EXECUTION_MODE == "batched":
+        # One dbt invocation for the tier: the project is parsed, dependencies are
+        # installed and a Snowflake session is opened once, not per model.
+        with TaskGroup(group_id=tier) as tier_group:
+            dbt_build = DbtBuildLocalOperator(
+                task_id="dbt_build",
+                project_dir=DBT_PROJECT_PATH,
+                profile_config=profile_config,
+                dbt_executable_path=DBT_EXECUTABLE_PATH,
+                select=selection["select"],
+                exclude=selection["exclude"],
+                dbt_cmd_flags=["--threads", str(DBT_THREADS)],
+                # Pushes per-node results from run_results.json, also when dbt fails
+                callback=push_node_results,
+                **dbt_operator_args,
+            )
+            # One mapped task per model/test, showing its status in the UI
+            dbt_nodes = list_dbt_nodes.override(task_id="dbt_nodes")(dbt_build.task_id)
+            dbt_build >> dbt_nodes
+            check_dbt_node_status.override(task_id="dbt_node_status").expand(node=dbt_nodes)
+
+            # Makes the run fail even when the build fails before reporting any node
+            dbt_build >> EmptyOperator(task_id="dbt_build_done")
+        return tier_group
+
+    return DbtTaskGroup(
+        group_id=tier,
+        project_config=ProjectConfig(DBT_PROJECT_PATH, manifest_path=DBT_MANIFEST_PATH),
+        # Render from the cached manifest instead of running dbt at every DAG parse
+        render_config=RenderConfig(
+            load_method=LoadMode.DBT_MANIFEST if DBT_MANIFEST_PATH else LoadMode.AUTOMATIC,
+            select=selection["select"],
+            exclude=selection["exclude"],
+        ),
+        profile_config=profile_config,
+        execution_config=ExecutionConfig(dbt_executable_path=DBT_EXECUTABLE_PATH),
+        operator_args={
+            **dbt_operator_args,
+            # Pushes each node's run_results.json summary for the telemetry task
+            "callback": push_node_results,
+        },
+    )
+
+
+def plan_warehouse_sizing(**context):
+    """
+    Chooses a warehouse per dbt model from its last successful run in this DAG.
+
+    Reads `PIPELINE_METRICS` and applies `WAREHOUSE_SIZING_POLICY` along
+    `WAREHOUSE_LADDER`; the result is passed to dbt as `warehouse_overrides`.
+
+    Args:
+        context (dict): The Airflow task context, automatically injected.
+
+    Returns:
+        dict: {model name: warehouse}.
+    """
+    store = SnowflakeMetricsStore(SNOWFLAKE_CONN_ID, PIPELINE_METRICS_TABLE)
+    store.ensure_table()
+    return choose_warehouses(
+        store.latest_model_runs(context["dag"].dag_id),
+        ladder=WAREHOUSE_LADDER,
+        policy=WAREHOUSE_SIZING_POLICY,
+    )
+
+
+def warehouse_sizing_task():
+    """
+    Builds the task choosing each dbt model's warehouse (see `plan_warehouse_sizing`).
+
+    Its task id is the one read by `dbt_tier_group`. Must be called inside a DAG definition.
+    """
+    return PythonOperator(task_id="plan_warehouse_sizing", python_callable=plan_warehouse_sizing)
+
+
+def collect_metrics_task(dbt_transformation):
+    """
+    Builds the telemetry task of the dbt operators in `dbt_transformation`.
+
+    Collected whether or not the dbt run succeeded. Must be called inside a DAG definition.
+    """
+    return PythonOperator(
+        task_id="collect_pipeline_metrics",
+        python_callable=collect_pipeline_metrics,
+        op_kwargs={
+            "dbt_task_ids": [
+                t.task_id for t in dbt_transformation.iter_tasks() if isinstance(t, DbtLocalBaseOperator)
+            ],
+        },
+        trigger_rule="all_done",
+    )
+
+
+def backfill_dbt_vars(phase, chunk):
+    """
+    dbt vars of one backfill chunk: its [start, end) window and the models built in the backfill schema.
+
+    Args:
+        phase (str): Phase of `BACKFILL_PHASES` the chunk belongs to (None for the setup run).
+        chunk (dict): Month chunk from `include.backfill.month_chunks`.
+
+    Returns:
+        dict: Value of the dbt operator's `vars`.
+    """
+    return {
+        "backfill": True,
+        "backfill_start": chunk["start"],
+        "backfill_end": chunk["end"],
+        "backfill_models": BACKFILL_MODELS,
+        "backfill_schema_suffix": BACKFILL_SCHEMA_SUFFIX,
+        "backfill_phase": phase,
+        "backfill_chunk": chunk["chunk"],
+        "landing_format": LANDING_FORMAT,
+        "incremental_staging": INCREMENTAL_STAGING,
+        "ingestion_mode": INGESTION_MODE,
+    }
+
+
+@task
+def plan_backfill_chunks():
+    """
+    Splits the requested months into chunks and drops those checkpointed by a previous attempt.
+
+    Returns:
+        dict: `fresh` (whether the backfill tables must be created), the dbt
+        vars of the setup run, and per phase the dbt vars of the pending chunks.
+    """
+    params = get_current_context()["params"]
+    plan = plan_backfill(
+        params["start_month"],
+        params["end_month"],
+        phases=BACKFILL_PHASES,
+        store=VariableCheckpointStore(BACKFILL_CHECKPOINT_PREFIX),
+        restart=params["restart"],
+    )
+    # The setup run creates the empty backfill tables: a zero-length window
+    empty_window = {"chunk": params["start_month"], "start": f"{params['start_month']}-01", "end": f"{params['start_month']}-01"}
+    return {
+        "fresh": plan["fresh"],
+        "setup_vars": backfill_dbt_vars(None, empty_window),
+        **{phase: [backfill_dbt_vars(phase, chunk) for chunk in plan[phase]] for phase in BACKFILL_PHASES},
+    }
+
+
+def skip_unless_fresh_backfill(context):
+    """
+    `pre_execute` hook skipping the creation of the backfill tables when a backfill is resumed.
+
+    Raises:
+        AirflowSkipException: If the checkpoints of the same range are reused.
+    """
+    if not context["ti"].xcom_pull(task_ids="plan_backfill_chunks")["fresh"]:
+        raise AirflowSkipException("Resuming the backfill of the same range; keeping its tables.")
+
+
+def checkpoint_backfill_chunk(context):
+    """
+    `on_success_callback` of the mapped chunk tasks, checkpointing the chunk once dbt succeeded.
+
+    Args:
+        context (dict): The Airflow task context, automatically injected.
+    """
+    dbt_vars = context["task"].vars
+    VariableCheckpointStore(BACKFILL_CHECKPOINT_PREFIX).mark_done(dbt_vars["backfill_phase"], dbt_vars["backfill_chunk"])
+
+
+@task
+def list_backfill_chunks(plan, phase):
+    """Returns the dbt vars of a phase's pending chunks, for mapping."""
+    return plan[phase]
+
+
+def promote_backfill_tables(**context):
+    """
+    Replaces the backfilled months of the production tables with the backfill tables.
+
+    Only the rows of the requested range are deleted and reinserted, in one
+    transaction over every model; earlier and later months are kept.
+
+    Args:
+        context (dict): The Airflow task context, automatically injected.
+
+    Returns:
+        dict: {production table: 'replaced' or 'created'}.
+    """
+    params = context["params"]
+    chunks = month_chunks(params["start_month"], params["end_month"])
+    return promote_backfill(
+        SnowflakeBackfillWarehouse(SNOWFLAKE_CONN_ID),
+        [
+            BackfillTable(
+                production=f"{SNOWFLAKE_DB}.{SNOWFLAKE_ANALYTICS_SCHEMA}.{model}".upper(),
+                backfill=f"{SNOWFLAKE_DB}.{SNOWFLAKE_ANALYTICS_SCHEMA}{BACKFILL_SCHEMA_SUFFIX}.{model}".upper(),
+                window_column=BACKFILL_WINDOW_COLUMNS[model],
+            )
+            for model in BACKFILL_MODELS
+        ],
+        start=chunks[0]["start"],
+        end=chunks[-1]["end"],
+    )
+
+
+@task.sensor(poke_interval=BACKFILL_WAIT_POKE_INTERVAL, timeout=BACKFILL_WAIT_TIMEOUT, mode="reschedule")
+def wait_for_backfill():
+    """
+    Holds the dbt models while a `nu_backfill` is in progress (started and not yet promoted).
+
+    Rows merged during a backfill would be overwritten (inside its range) by
+    the backfill's older snapshot of the raw data. A failed backfill keeps
+    blocking until it is resumed to completion, or its `<prefix>_range`
+    Variable is deleted to abandon it.
+    """
+    backfill = VariableCheckpointStore(BACKFILL_CHECKPOINT_PREFIX).load_range()
+    if backfill:
+        logging.getLogger(__name__).info(f"Backfill {backfill} in progress; waiting for it to be promoted.")
+    return PokeReturnValue(is_done=backfill is None)
 
 
 # =============================================================================
@@ -237,86 +1124,441 @@ def validate_external_table_refresh(**context):
     catchup=False,
     tags=["nu", "gcs", "snowflake", "dbt", "production"],
     max_active_runs=1,  # Prevent concurrent runs to maintain data consistency
+    # Render templated operator args (e.g. `full_refresh`) as native Python types
+    render_template_as_native_obj=True,
+    params={
+        "full_refresh": Param(
+            False,
+            type="boolean",
+            description="Rebuild incremental dbt models from the full history.",
+        ),
+        "deep_validation": Param(
+            False,
+            type="boolean",
+            description="Also COUNT(*) every external table during validation (scans GCS).",
+        ),
+    },
 )
 def nu_data_pipeline():
     """
     Defines and orchestrates the tasks for the Nu data pipeline.
     """
 
-    # Task 1: Wait for new file(s) in the GCS bucket
-    wait_for_new_data = GCSObjectsWithPrefixExistenceSensor(
+    # Task 1: Wait for new file(s) under any table prefix, deferred to the triggerer
+    wait_for_new_data = GCSNewObjectsSensor(
         task_id="wait_for_new_data_in_gcs",
         bucket=GCS_BUCKET_NAME,
-        prefix=GCS_DATA_PREFIX,
-        google_cloud_conn_id=GCP_CONN_ID,
-        timeout=300,        # Max time to wait (in seconds)
-        poke_interval=60,   # How often to check (in seconds)
-        mode="poke",
+        tables=[table for tables in EXTERNAL_TABLES_CONFIG.values() for table in tables],
+        data_prefix=GCS_DATA_PREFIX,
+        manifest_store=VariableManifestStore(GCS_MANIFEST_VARIABLE),
+        gcp_conn_id=GCP_CONN_ID,
+        timeout=60 * 60,    # Max time to wait (in seconds); waiting is free while deferred
+        poke_interval=60,   # How often the trigger lists the prefixes (in seconds)
+        soft_fail=True,     # Skip the run instead of failing when nothing new arrives
     )
 
-    # Task 2: TaskGroup to refresh and validate all external tables
-    with TaskGroup(group_id="refresh_and_validate_external_tables") as refresh_and_validate_group:
-        
-        # Create a dictionary to hold lists of task objects for each category
-        refresh_tasks_by_cat = {cat: [] for cat in EXTERNAL_TABLES_CONFIG}
+    # Task 2: TaskGroup making this run's landed files available in Snowflake.
+    # Every tier ends in its own gate task, which updates the tier's Asset and
+    # starts the tier's dbt models without waiting for the other tiers.
+    tier_gates = {}
+    if INGESTION_MODE == "snowpipe":
+        # Snowpipe loads the native raw tables on its own; wait for each tier's pipes
+        with TaskGroup(group_id=INGESTION_GROUP_ID) as ingestion_group:
+
+            # Compare each table's GCS prefix with the manifest of the last validated run
+            detect_changed_tables = PythonOperator(
+                task_id="detect_changed_tables",
+                python_callable=detect_changed_external_tables,
+            )
+
+            for tier, tables in EXTERNAL_TABLES_CONFIG.items():
+                # One reschedule-mode sensor per pipe (skipped when its table has no new objects)
+                pipe_sensors = [
+                    wait_for_pipe_ingestion.override(task_id=f"wait_for_{table}_pipe")(table)
+                    for table in tables
+                ]
+                # Objects overwritten in place, which the pipes never reload
+                overwrite_reloads = [
+                    PythonOperator(
+                        task_id=f"reload_overwritten_{table}_files",
+                        python_callable=reload_overwritten_pipe_files,
+                        op_kwargs={"table": table},
+                    )
+                    for table in tables
+                ]
+                tier_gates[tier] = PythonOperator(
+                    task_id=f"{tier}_ingested",
+                    python_callable=publish_tier_ingestion,
+                    op_kwargs={"tier": tier},
+                    # Skipped (no Asset update) when none of the tier's tables changed
+                    pre_execute=partial(skip_unless_tier_changed, tier=tier),
+                    trigger_rule="none_failed",
+                    outlets=[TIER_ASSETS[tier]],
+                )
+                detect_changed_tables >> pipe_sensors >> tier_gates[tier]
+                detect_changed_tables >> overwrite_reloads >> tier_gates[tier]
+
+            # The manifest becomes the next run's baseline once the pipes caught up
+            commit_manifest = PythonOperator(
+                task_id="commit_gcs_manifest",
+                python_callable=commit_gcs_manifest,
+                trigger_rule="none_failed",
+            )
+            list(tier_gates.values()) >> commit_manifest
+    else:
+        # Refresh and validate all external tables
+        with TaskGroup(group_id=INGESTION_GROUP_ID) as ingestion_group:
 
-        # Create one refresh task PER TABLE for security, granularity, and observability
-        for category, tables in EXTERNAL_TABLES_CONFIG.items():
-            for table in tables:
+            # Create/alter external tables whose definition fingerprint differs from the live object
+            reconcile_external_tables = DbtRunOperationLocalOperator(
+                task_id="reconcile_external_tables",
+                macro_name="reconcile_external_tables",
+                project_dir=DBT_PROJECT_PATH,
+                profile_config=profile_config,
+                dbt_executable_path=DBT_EXECUTABLE_PATH,
+                install_deps=True,
+                vars={"landing_format": LANDING_FORMAT},
+            )
+
+            # Compare each table's GCS prefix with the manifest of the last validated run
+            detect_changed_tables = PythonOperator(
+                task_id="detect_changed_tables",
+                python_callable=detect_changed_external_tables,
+            )
+
+            # Convert new CSVs of the high-frequency sources to date-partitioned Parquet
+            parquet_upstream = detect_changed_tables
+            if LANDING_FORMAT == "parquet":
+                convert_to_parquet = PythonOperator(
+                    task_id="convert_to_parquet",
+                    python_callable=convert_landed_csvs_to_parquet,
+                )
+                detect_changed_tables >> convert_to_parquet
+                parquet_upstream = convert_to_parquet
+
+            # Create one refresh task PER TABLE (or one bulk refresh PER TIER) for security,
+            # granularity, and observability, and one validation task PER TIER gating the
+            # tier's dbt models
+            for category, tables in EXTERNAL_TABLES_CONFIG.items():
                 # Sanity check on table names during DAG parsing
-                if not table.replace("_", "").isalnum():
-                    raise ValueError(f"Invalid table name '{table}'. Only alphanumeric and underscores are allowed.")
-
-                refresh_task = SQLExecuteQueryOperator(
-                    task_id=f"refresh_{table}",
-                    conn_id=SNOWFLAKE_CONN_ID,
-                    sql=f"ALTER EXTERNAL TABLE {SNOWFLAKE_DB}.{SNOWFLAKE_RAW_SCHEMA}.{table} REFRESH;",
-                    autocommit=True,
+                for table in tables:
+                    if not table.replace("_", "").isalnum():
+                        raise ValueError(f"Invalid table name '{table}'. Only alphanumeric and underscores are allowed.")
+
+                if REFRESH_MODE == "bulk":
+                    # One task (one Snowflake session) per tier refreshing its changed tables
+                    # as async queries, plus one mapped status task per refreshed table
+                    bulk_refresh = SnowflakeBulkRefreshOperator(
+                        task_id=f"refresh_{category}_tables",
+                        tables=(
+                            f"{{{{ (ti.xcom_pull(task_ids='{DETECT_CHANGES_TASK_ID}', key='changed_tables') or [])"
+                            f" | select('in', {tables}) | list }}}}"
+                        ),
+                        snowflake_conn_id=SNOWFLAKE_CONN_ID,
+                        database=SNOWFLAKE_DB,
+                        schema=SNOWFLAKE_RAW_SCHEMA,
+                        max_concurrency=BULK_REFRESH_MAX_CONCURRENCY,
+                        max_attempts=BULK_REFRESH_MAX_ATTEMPTS,
+                        query_timeout_seconds=BULK_REFRESH_QUERY_TIMEOUT,
+                        trigger_rule="none_failed",
+                        priority_weight=10 if category == "high_frequency" else 1,
+                    )
+                    refresh_status = check_table_refresh.override(task_id=f"{category}_refresh_status").expand(
+                        result=bulk_refresh.output
+                    )
+                    refresh_tasks = [bulk_refresh]
+                    refresh_done = refresh_status
+                else:
+                    refresh_tasks = []
+                    for table in tables:
+                        refresh_task = SQLExecuteQueryOperator(
+                            task_id=f"refresh_{table}",
+                            conn_id=SNOWFLAKE_CONN_ID,
+                            sql=f"ALTER EXTERNAL TABLE {SNOWFLAKE_DB}.{SNOWFLAKE_RAW_SCHEMA}.{table} REFRESH;",
+                            autocommit=True,
+                            # Skip the refresh when no object under the table's prefix changed
+                            pre_execute=partial(skip_unless_table_changed, table=table),
+                            trigger_rule="none_failed",
+                            # High-frequency refreshes get worker slots first
+                            priority_weight=10 if category == "high_frequency" else 1,
+                        )
+                        refresh_tasks.append(refresh_task)
+                    refresh_done = refresh_tasks
+
+                # Runs after the tier's refresh tasks are complete (or skipped)
+                tier_gates[category] = PythonOperator(
+                    task_id=f"validate_{category}_refresh",
+                    python_callable=validate_external_table_refresh,
+                    op_kwargs={"tier": category},
+                    # Skipped (no Asset update) when none of the tier's tables changed
+                    pre_execute=partial(skip_unless_tier_changed, tier=category),
+                    trigger_rule="none_failed",
+                    outlets=[TIER_ASSETS[category]],
                 )
-                refresh_tasks_by_cat[category].append(refresh_task)
 
-        # This validation task runs after all refresh tasks are complete
-        validate_refresh_status = PythonOperator(
-            task_id="validate_refresh_status",
-            python_callable=validate_external_table_refresh,
-        )
+                refresh_upstream = parquet_upstream if set(tables) & set(PARQUET_LANDING_TABLES) else detect_changed_tables
+                refresh_upstream >> refresh_tasks
+                refresh_done >> tier_gates[category]
 
-        # --- Define explicit dependencies within the group ---
-        # 1. High-frequency tasks run first.
-        # 2. Once all high-frequency tasks succeed, medium and low-frequency tasks run in parallel.
-        # 3. After all refresh tasks are done, run the final validation.
-        if refresh_tasks_by_cat["high_frequency"]:
-            high_freq_tasks = refresh_tasks_by_cat["high_frequency"]
-            medium_low_freq_tasks = refresh_tasks_by_cat["medium_frequency"] + refresh_tasks_by_cat["low_frequency"]
-            
-            if medium_low_freq_tasks:
-                high_freq_tasks >> medium_low_freq_tasks >> validate_refresh_status
-            else:
-                high_freq_tasks >> validate_refresh_status
-
-
-    # Task 3: TaskGroup to run the dbt project using Cosmos
-    dbt_transformation = DbtTaskGroup(
-        group_id="dbt_transformation",
-        project_config=ProjectConfig(DBT_PROJECT_PATH),
-        profile_config=profile_config,
-        execution_config=ExecutionConfig(dbt_executable_path=DBT_EXECUTABLE_PATH),
-        operator_args={
-            "install_deps": True,   # Ensures dbt dependencies are installed
-            "full_refresh": False,  # Prefer incremental runs in production by default
-        },
+            # The manifest becomes the next run's baseline only once every tier is validated
+            commit_manifest = PythonOperator(
+                task_id="commit_gcs_manifest",
+                python_callable=commit_gcs_manifest,
+                trigger_rule="none_failed",
+            )
+
+            # --- Define explicit dependencies within the group ---
+            # 1. Definitions are reconciled, then change detection decides which refreshes are skipped
+            #    (and, with the Parquet landing format, new high-frequency CSVs are converted).
+            # 2. Each tier's tables are refreshed in parallel with the other tiers, then validated.
+            # 3. After all tiers are validated, commit the manifest.
+            reconcile_external_tables >> detect_changed_tables
+            list(tier_gates.values()) >> commit_manifest
+
+    # Task 3: One dbt task group per tier, started by that tier's gate, so the
+    # transaction facts never wait for the dimension sources. A tier reading
+    # the models of more frequent tiers (DBT_TIER_UPSTREAMS) runs after their
+    # groups, and also when only those were rebuilt. The models of
+    # ASSET_SCHEDULED_TIER run in `nu_low_frequency_models` instead.
+    with TaskGroup(group_id="dbt_transformation") as dbt_transformation:
+        tier_groups = {}
+        for tier in PIPELINE_TIERS:
+            if not DBT_TIER_SELECTION[tier]["select"]:
+                continue
+            tier_start = tier_gates[tier]
+            upstream_groups = [tier_groups[upstream] for upstream in DBT_TIER_UPSTREAMS[tier] if upstream in tier_groups]
+            if upstream_groups:
+                # Skipped only when neither the tier's sources nor its upstream models changed
+                tier_start = EmptyOperator(task_id=f"{tier}_ready", trigger_rule="none_failed_min_one_success")
+                [tier_gates[tier], *upstream_groups] >> tier_start
+            tier_groups[tier] = dbt_tier_group(
+                tier,
+                # Sources with new objects in GCS this run
+                changed_sources=f"{{{{ ti.xcom_pull(task_ids='{DETECT_CHANGES_TASK_ID}', key='changed_tables') }}}}",
+            )
+            tier_start >> tier_groups[tier]
+
+    # No merge into the backfilled tables while a backfill is in progress
+    wait_for_new_data >> wait_for_backfill() >> dbt_transformation
+
+    # Adaptive warehouse per model, from the previous run's telemetry
+    if ADAPTIVE_WAREHOUSE_SIZING:
+        wait_for_new_data >> warehouse_sizing_task() >> dbt_transformation
+
+    # Task 4: Per-model telemetry from run_results and Snowflake query history,
+    # collected whether or not the dbt run succeeded
+    collect_metrics = collect_metrics_task(dbt_transformation)
+
+    # Clustering depth of the clustered models, to catch degraded pruning
+    clustering_health = PythonOperator(
+        task_id="monitor_clustering_health",
+        python_callable=monitor_clustering_health,
+        trigger_rule="all_done",
     )
 
-    # Task 4: Final endpoint to signify a successful pipeline run
+    # Task 5: Final endpoint to signify a successful pipeline run (tiers
+    # without new data are skipped, not failed)
     pipeline_success = EmptyOperator(
         task_id="pipeline_success",
-        trigger_rule="all_success",
+        trigger_rule="none_failed",
     )
 
     # =============================================================================
     # PIPELINE ORCHESTRATION
     # =============================================================================
-    wait_for_new_data >> refresh_and_validate_group >> dbt_transformation >> pipeline_success
+    wait_for_new_data >> ingestion_group
+    dbt_transformation >> pipeline_success
+    dbt_transformation >> collect_metrics
+    dbt_transformation >> clustering_health
+    commit_manifest >> pipeline_success
+
+
+@dag(
+    dag_id="nu_low_frequency_models",
+    default_args=default_args,
+    description="Rebuilds the dbt models of the low-frequency sources when they are refreshed.",
+    # Runs only when `nu_data_pipeline` loads (and validates) new low-frequency files
+    schedule=[TIER_ASSETS[ASSET_SCHEDULED_TIER]],
+    start_date=datetime(2023, 1, 1),
+    catchup=False,
+    tags=["nu", "snowflake", "dbt", "production"],
+    max_active_runs=1,
+    render_template_as_native_obj=True,
+    params={
+        "full_refresh": Param(
+            False,
+            type="boolean",
+            description="Rebuild incremental dbt models from the full history.",
+        ),
+    },
+)
+def nu_low_frequency_models():
+    """
+    Rebuilds the low-frequency models (calendar and location dimensions).
+
+    These models only depend on rarely changing sources, so they are rebuilt
+    when their tier's Asset is updated rather than on every pipeline run. The
+    high-frequency models read their last build; trigger this DAG once by hand
+    (with `full_refresh`) when bootstrapping an empty environment.
+    """
+
+    with TaskGroup(group_id="dbt_transformation") as dbt_transformation:
+        dbt_tier_group(
+            ASSET_SCHEDULED_TIER,
+            # The triggering run's diff is not carried over; pass all the tier's sources
+            changed_sources=EXTERNAL_TABLES_CONFIG[ASSET_SCHEDULED_TIER],
+        )
+
+    collect_metrics = collect_metrics_task(dbt_transformation)
+
+    if ADAPTIVE_WAREHOUSE_SIZING:
+        warehouse_sizing_task() >> dbt_transformation
+    dbt_transformation >> collect_metrics
+
+
+@dag(
+    dag_id="nu_backfill",
+    default_args=default_args,
+    description="Rebuilds the incremental dbt models over a range of months, in parallel month chunks.",
+    schedule=None,  # Triggered by hand for historical reloads
+    start_date=datetime(2023, 1, 1),
+    catchup=False,
+    tags=["nu", "snowflake", "dbt", "backfill"],
+    max_active_runs=1,
+    render_template_as_native_obj=True,
+    params={
+        "start_month": Param("2020-01", type="string", pattern=r"^\d{4}-\d{2}$", description="First month to rebuild (YYYY-MM)."),
+        "end_month": Param("2024-12", type="string", pattern=r"^\d{4}-\d{2}$", description="Last month to rebuild (YYYY-MM)."),
+        "restart": Param(
+            False,
+            type="boolean",
+            description="Ignore the checkpoints of a previous attempt and rebuild every chunk.",
+        ),
+    },
+)
+def nu_backfill():
+    """
+    Rebuilds `BACKFILL_MODELS` from the raw history, one month chunk per dbt process.
+
+    Chunks build their window with the models' full-build SQL and append it
+    to the tables of the backfill schema (`<schema>_backfill`); up to
+    `BACKFILL_MAX_PARALLEL_CHUNKS` run at the same time, and each finished
+    chunk is checkpointed, so clearing the failed chunks (or re-triggering with
+    the same months) only reruns what is missing. Once every chunk is done the
+    requested months of the production tables are replaced by the backfill
+    tables in one transaction (other months are untouched), and the models
+    downstream of them are rebuilt. `nu_data_pipeline` holds its dbt models
+    from the start of the backfill until its checkpoints are cleared.
+    """
+    plan = plan_backfill_chunks()
+
+    # Empty backfill tables (schema of the current model SQL), only for a new backfill
+    create_backfill_tables = DbtRunLocalOperator(
+        task_id="create_backfill_tables",
+        project_dir=DBT_PROJECT_PATH,
+        profile_config=profile_config,
+        dbt_executable_path=DBT_EXECUTABLE_PATH,
+        install_deps=True,
+        select=BACKFILL_MODELS,
+        full_refresh=True,
+        vars="{{ ti.xcom_pull(task_ids='plan_backfill_chunks')['setup_vars'] }}",
+        pre_execute=skip_unless_fresh_backfill,
+    )
+    plan >> create_backfill_tables
+
+    # One mapped dbt run per pending month chunk and phase
+    upstream = create_backfill_tables
+    for phase, models in BACKFILL_PHASES.items():
+        backfill_phase = DbtRunLocalOperator.partial(
+            task_id=f"backfill_{phase}",
+            project_dir=DBT_PROJECT_PATH,
+            profile_config=profile_config,
+            dbt_executable_path=DBT_EXECUTABLE_PATH,
+            install_deps=True,
+            select=models,
+            max_active_tis_per_dagrun=BACKFILL_MAX_PARALLEL_CHUNKS,
+            map_index_template="{{ task.vars.backfill_chunk }}",
+            on_success_callback=checkpoint_backfill_chunk,
+            # Runs when the setup was skipped on resume
+            trigger_rule="none_failed",
+        ).expand(vars=list_backfill_chunks.override(task_id=f"{phase}_chunks")(plan, phase))
+        upstream >> backfill_phase
+        upstream = backfill_phase
+
+    # Replace the backfilled months in production, after checking every backfill table exists
+    promote_tables = PythonOperator(
+        task_id="promote_backfill_tables",
+        python_callable=promote_backfill_tables,
+        trigger_rule="none_failed",
+    )
+
+    # Models reading the backfilled tables (dimensions, reports) are rebuilt on the new history
+    rebuild_downstream = DbtBuildLocalOperator(
+        task_id="rebuild_downstream_models",
+        project_dir=DBT_PROJECT_PATH,
+        profile_config=profile_config,
+        dbt_executable_path=DBT_EXECUTABLE_PATH,
+        install_deps=True,
+        select=[f"{model}+" for model in BACKFILL_MODELS],
+        exclude=BACKFILL_MODELS,
+        dbt_cmd_flags=["--threads", str(DBT_THREADS)],
+        vars={
+            "landing_format": LANDING_FORMAT,
+            "incremental_staging": INCREMENTAL_STAGING,
+            "ingestion_mode": INGESTION_MODE,
+        },
+    )
+
+    @task
+    def clear_backfill_checkpoints():
+        """Forgets the finished backfill, so the next trigger starts a new one."""
+        VariableCheckpointStore(BACKFILL_CHECKPOINT_PREFIX).clear(BACKFILL_PHASES)
+
+    upstream >> promote_tables >> rebuild_downstream >> clear_backfill_checkpoints()
+
+
+@dag(
+    dag_id="nu_data_quality_audit",
+    default_args=default_args,
+    description="Runs every dbt data test on the full history.",
+    schedule=DATA_QUALITY_AUDIT_SCHEDULE,
+    start_date=datetime(2023, 1, 1),
+    catchup=False,
+    tags=["nu", "snowflake", "dbt", "data_quality"],
+    max_active_runs=1,
+)
+def nu_data_quality_audit():
+    """
+    Full-history audit of the data tests that the pipeline runs windowed.
+
+    Pipeline runs only test the rows of their incremental window and skip the
+    source tests on the raw files; this DAG runs them all with
+    `test_mode: full`, catching issues outside the windows (e.g. duplicates
+    across windows or late corrections of old files).
+    """
+
+    with TaskGroup(group_id="data_quality_audit") as data_quality_audit:
+        DbtTestLocalOperator(
+            task_id="dbt_test_full_history",
+            project_dir=DBT_PROJECT_PATH,
+            profile_config=profile_config,
+            dbt_executable_path=DBT_EXECUTABLE_PATH,
+            install_deps=True,
+            dbt_cmd_flags=["--threads", str(DBT_THREADS)],
+            vars={
+                "test_mode": "full",
+                "landing_format": LANDING_FORMAT,
+                "incremental_staging": INCREMENTAL_STAGING,
+                "ingestion_mode": INGESTION_MODE,
+            },
+            callback=push_node_results,
+        )
+
+    data_quality_audit >> collect_metrics_task(data_quality_audit)
+
 
-# Instantiate the DAG
-nu_data_pipeline()
\ No newline at end of file
+# Instantiate the DAGs
+nu_data_pipeline()
+nu_low_frequency_models()
+nu_backfill()
+nu_data_quality_audit()
@@ -0,0 +1,56 @@
+{% macro is_incremental() %}
+  {#-
+    dbt's `is_incremental()`, except in backfill runs (var('backfill')):
+    each month chunk is a full build of its window (the models' first-build
+    SQL filtered by `backfill_window_filter`) appended to the backfill tables.
+  -#}
+  {%- if var('backfill', false) -%}
+    {%- do return(false) -%}
+  {%- endif -%}
+  {%- do return(dbt.is_incremental()) -%}
+{% endmacro %}
+
+
+{% macro backfill_window_filter(column, partition_column=none) %}
+  {#-
+    Limits a backfill chunk to [var('backfill_start'), var('backfill_end')).
+    `partition_column` (a date) repeats the bound so partitioned external
+    tables prune files. Renders to TRUE outside backfill runs.
+  -#}
+  {%- if var('backfill', false) -%}
+    {{ column }} >= '{{ var('backfill_start') }}'::TIMESTAMP
+    AND {{ column }} < '{{ var('backfill_end') }}'::TIMESTAMP
+    {%- if partition_column is not none %}
+    AND {{ partition_column }} >= '{{ var('backfill_start') }}'::DATE
+    AND {{ partition_column }} < '{{ var('backfill_end') }}'::DATE
+    {%- endif %}
+  {%- else -%}
+    TRUE
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro backfill_incremental_strategy(strategy) %}
+  {#-
+    Chunks write disjoint windows into backfill tables, so they append
+    (concurrent inserts do not lock each other like merges do); `strategy`
+    otherwise.
+  -#}
+  {%- do return('append' if var('backfill', false) else strategy) -%}
+{% endmacro %}
+
+
+{% macro backfill_clear_chunk(column) %}
+  {#-
+    Pre-hook deleting the chunk's window from {{ this }} before it is
+    appended again, so a retried or resumed chunk does not duplicate rows.
+    Renders to nothing outside backfill runs and before the table exists.
+  -#}
+  {%- if var('backfill', false) and execute -%}
+    {%- set relation = adapter.get_relation(this.database, this.schema, this.identifier) -%}
+    {%- if relation is not none -%}
+      DELETE FROM {{ this }} WHERE {{ backfill_window_filter(column) }}
+    {%- endif -%}
+  {%- endif -%}
+{% endmacro %}
+
@@ -20,6 +20,11 @@ CREATE OR REPLACE STAGE nu_dataset_stage
     URL = 'gcs://nu_dataset/Tables'
     FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER = 1);
 
+--------------------------------------------------------------------------------------------
+-- The native tables below have the names of the external tables of
+-- macros/reconcile_external_tables.sql: drop those first when switching NU_INGESTION_MODE
+-- to 'snowpipe'. The pipes never reload a path they already loaded; the
+-- Airflow DAG reloads files overwritten in place (DELETE + COPY ... FORCE).
 --------------------------------------------------------------------------------------------
 -- pix movements table    
 use database nu_db;
@@ -37,7 +42,11 @@ CREATE OR REPLACE TABLE pix_movements (
     pix_requested_at TIMESTAMP,
     pix_completed_at TIMESTAMP,
     status STRING,
-    in_or_out STRING
+    in_or_out STRING,
+    -- Landed file, row and file version, used by the incremental staging models
+    _source_file STRING,
+    _source_row_number NUMBER,
+    _source_file_modified_at TIMESTAMP_LTZ
 );
 
 
@@ -55,7 +64,10 @@ CREATE OR REPLACE PIPE nu_db.nu_raw_schema.pix_movements_pipe
       TRY_TO_TIMESTAMP(NULLIF($4::STRING, 'None')),
       TRY_TO_TIMESTAMP(NULLIF($5::STRING, 'None')),
       $6::STRING,
-      $7::STRING
+      $7::STRING,
+      METADATA$FILENAME,
+      METADATA$FILE_ROW_NUMBER,
+      METADATA$FILE_LAST_MODIFIED
     FROM @nu_dataset_stage/pix_movements/
   )
   FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER = 1);
@@ -302,7 +314,11 @@ CREATE OR REPLACE TABLE transfer_ins (
     amount NUMBER(18,2),
     transaction_requested_at TIMESTAMP,
     transaction_completed_at TIMESTAMP,
-    status STRING
+    status STRING,
+    -- Landed file, row and file version, used by the incremental staging models
+    _source_file STRING,
+    _source_row_number NUMBER,
+    _source_file_modified_at TIMESTAMP_LTZ
 );
 
 CREATE OR REPLACE PIPE transfer_ins_pipe 
@@ -317,7 +333,10 @@ FROM (
       TO_DECIMAL($3::STRING, 18, 2),
       TRY_TO_TIMESTAMP(NULLIF($4::STRING, 'None')),
       TRY_TO_TIMESTAMP(NULLIF($5::STRING, 'None')),
-      $6::STRING
+      $6::STRING,
+      METADATA$FILENAME,
+      METADATA$FILE_ROW_NUMBER,
+      METADATA$FILE_LAST_MODIFIED
     FROM @nu_dataset_stage/transfer_ins/
 )
 FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER = 1);
@@ -331,7 +350,11 @@ CREATE OR REPLACE TABLE transfer_outs (
     amount NUMBER(18,2),
     transaction_requested_at TIMESTAMP,
     transaction_completed_at TIMESTAMP,
-    status STRING
+    status STRING,
+    -- Landed file, row and file version, used by the incremental staging models
+    _source_file STRING,
+    _source_row_number NUMBER,
+    _source_file_modified_at TIMESTAMP_LTZ
 );
 
 CREATE OR REPLACE PIPE transfer_outs_pipe 
@@ -346,7 +369,10 @@ FROM (
       TO_DECIMAL($3::STRING, 18, 2),
       TRY_TO_TIMESTAMP(NULLIF($4::STRING, 'None')),
       TRY_TO_TIMESTAMP(NULLIF($5::STRING, 'None')),
-      $6::STRING
+      $6::STRING,
+      METADATA$FILENAME,
+      METADATA$FILE_ROW_NUMBER,
+      METADATA$FILE_LAST_MODIFIED
     FROM @nu_dataset_stage/transfer_outs/
 )
 FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER = 1);
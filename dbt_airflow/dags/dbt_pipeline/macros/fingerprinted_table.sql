@@ -0,0 +1,138 @@
+{% macro fingerprint_upstream_relations(node_ids, relations=none) %}
+  {#-
+    Relations whose data a model reads: its upstream tables and sources.
+    Views and ephemeral models are walked through to what they select from,
+    since their own metadata does not change when their data does.
+  -#}
+  {%- set relations = relations if relations is not none else {} -%}
+  {%- for node_id in node_ids -%}
+    {%- set node = graph.nodes.get(node_id) or graph.sources.get(node_id) -%}
+    {%- if node is none or node_id in relations -%}
+    {%- elif node.resource_type == 'model' and node.config.materialized in ('view', 'ephemeral') -%}
+      {%- do fingerprint_upstream_relations(node.depends_on.nodes, relations) -%}
+    {%- else -%}
+      {%- do relations.update({node_id: api.Relation.create(
+          database=node.database,
+          schema=node.schema,
+          identifier=node.identifier if node.resource_type == 'source' else node.alias
+      )}) -%}
+    {%- endif -%}
+  {%- endfor -%}
+  {%- do return(relations) -%}
+{% endmacro %}
+
+
+{% macro model_fingerprint(model, compiled_code) %}
+  {#-
+    Hash of the model's compiled SQL and of the freshness and volume
+    (`last_altered`, row count, bytes) of every upstream relation, read from
+    INFORMATION_SCHEMA.TABLES (metadata only, no scans). A missing upstream
+    relation changes the fingerprint too.
+  -#}
+  {%- set relations = fingerprint_upstream_relations(model.depends_on.nodes).values() | list -%}
+  {%- set state = [] -%}
+  {%- for relation in relations | sort(attribute='identifier') -%}
+    {%- do state.append(relation.render() | lower) -%}
+  {%- endfor -%}
+
+  {%- for database, group in relations | groupby('database') -%}
+    {%- set query -%}
+      SELECT table_schema, table_name, TO_VARCHAR(last_altered), row_count, bytes
+      FROM {{ database }}.information_schema.tables
+      WHERE {% for relation in group -%}
+        (table_schema = '{{ relation.schema | upper }}' AND table_name = '{{ relation.identifier | upper }}')
+        {%- if not loop.last %} OR {% endif %}
+      {%- endfor %}
+      ORDER BY table_schema, table_name
+    {%- endset -%}
+    {%- for row in run_query(query) -%}
+      {%- do state.append(database | upper ~ '.' ~ (row.values() | join('|'))) -%}
+    {%- endfor -%}
+  {%- endfor -%}
+
+  {%- do return(local_md5(local_md5(compiled_code) ~ '|' ~ (state | join(';')))) -%}
+{% endmacro %}
+
+
+{% macro stored_fingerprint(fingerprint_relation, unique_id) %}
+  {#- Fingerprint of the last build of `unique_id`, creating the fingerprint table if needed. -#}
+  {%- call statement('create_fingerprint_table') -%}
+    CREATE TABLE IF NOT EXISTS {{ fingerprint_relation }} (
+        unique_id STRING,
+        fingerprint STRING,
+        built_at TIMESTAMP_NTZ
+    )
+  {%- endcall -%}
+  {%- set result = run_query(
+      "SELECT fingerprint FROM " ~ fingerprint_relation ~ " WHERE unique_id = '" ~ unique_id ~ "'"
+  ) -%}
+  {%- do return(result.columns[0].values()[0] if result.rows | length > 0 else none) -%}
+{% endmacro %}
+
+
+{% macro save_fingerprint(fingerprint_relation, unique_id, fingerprint) %}
+  {%- call statement('save_fingerprint') -%}
+    MERGE INTO {{ fingerprint_relation }} f
+    USING (SELECT '{{ unique_id }}' AS unique_id, '{{ fingerprint }}' AS fingerprint) s
+        ON f.unique_id = s.unique_id
+    WHEN MATCHED THEN UPDATE SET fingerprint = s.fingerprint, built_at = SYSDATE()
+    WHEN NOT MATCHED THEN INSERT (unique_id, fingerprint, built_at)
+        VALUES (s.unique_id, s.fingerprint, SYSDATE())
+  {%- endcall -%}
+{% endmacro %}
+
+
+{% materialization fingerprinted_table, adapter='snowflake' %}
+  {#-
+    A table that is only rebuilt when its compiled SQL or the data of its
+    upstream relations changed since its last build (see `model_fingerprint`).
+    Fingerprints are stored per model in var('fingerprint_table') in the
+    target schema. A skipped model reports `UNCHANGED` and keeps its
+    `last_altered`, so fingerprinted models downstream of it skip too.
+    --full-refresh always rebuilds.
+  -#}
+  {% set original_query_tag = set_query_tag() %}
+
+  {%- set identifier = model['alias'] -%}
+  {% set grant_config = config.get('grants') %}
+
+  {%- set existing_relation = adapter.get_relation(database=database, schema=schema, identifier=identifier) -%}
+  {%- set target_relation = api.Relation.create(identifier=identifier, schema=schema, database=database, type='table') -%}
+  {%- set fingerprint_relation = api.Relation.create(
+      database=database, schema=schema, identifier=var('fingerprint_table', 'dbt_model_fingerprints')
+  ) -%}
+
+  {%- set fingerprint = model_fingerprint(model, compiled_code) -%}
+  {%- set unchanged = fingerprint == stored_fingerprint(fingerprint_relation, model.unique_id) -%}
+
+  {% if unchanged and existing_relation is not none and existing_relation.is_table and not should_full_refresh() %}
+    {{ log(model.name ~ ": compiled SQL and upstream data unchanged, skipping rebuild", info=True) }}
+    {% do store_raw_result('main', message='UNCHANGED', code='UNCHANGED', rows_affected=0) %}
+    {% do unset_query_tag(original_query_tag) %}
+    {{ return({'relations': [target_relation]}) }}
+  {% endif %}
+
+  {{ run_hooks(pre_hooks) }}
+
+  {% if target_relation.needs_to_drop(existing_relation) %}
+    {{ drop_relation_if_exists(existing_relation) }}
+  {% endif %}
+
+  {% call statement('main') -%}
+    {{ create_table_as(False, target_relation, compiled_code) }}
+  {%- endcall %}
+
+  {{ run_hooks(post_hooks) }}
+
+  {% set should_revoke = should_revoke(existing_relation, full_refresh_mode=True) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+
+  {% do persist_docs(target_relation, model) %}
+
+  {% do save_fingerprint(fingerprint_relation, model.unique_id, fingerprint) %}
+
+  {% do unset_query_tag(original_query_tag) %}
+
+  {{ return({'relations': [target_relation]}) }}
+
+{% endmaterialization %}
@@ -0,0 +1,40 @@
+{% test fused_column_checks(model, not_null=[], unique=[], accepted_values={}, expressions={}) %}
+  {#-
+    The not_null, unique and accepted_values checks and boolean expressions of
+    a model in a single scan (instead of one query per test). Returns one row
+    per failing check; the test fails with the total of failing rows (0, a
+    pass, when no check fails and no row is returned).
+    `unique` counts the extra occurrences of duplicated values.
+  -#}
+  {{ config(fail_calc='COALESCE(SUM(failures), 0)') }}
+  {%- set checks = [] -%}
+  {%- for column in not_null -%}
+    {%- do checks.append(('not_null__' ~ column, 'COUNT_IF(' ~ column ~ ' IS NULL)')) -%}
+  {%- endfor -%}
+  {%- for column in unique -%}
+    {%- do checks.append(('unique__' ~ column, 'COUNT(' ~ column ~ ') - COUNT(DISTINCT ' ~ column ~ ')')) -%}
+  {%- endfor -%}
+  {%- for column, values in accepted_values.items() -%}
+    {%- set quoted = [] -%}
+    {%- for value in values -%}
+      {%- do quoted.append("'" ~ value ~ "'") -%}
+    {%- endfor -%}
+    {%- do checks.append(('accepted_values__' ~ column, 'COUNT_IF(' ~ column ~ ' NOT IN (' ~ quoted | join(', ') ~ '))')) -%}
+  {%- endfor -%}
+  {%- for name, expression in expressions.items() -%}
+    {%- do checks.append(('expression__' ~ name, 'COUNT_IF(NOT (' ~ expression ~ '))')) -%}
+  {%- endfor -%}
+
+  WITH check_counts AS (
+      SELECT
+      {%- for name, calc in checks %}
+          {{ calc }} AS {{ name }}{{ ',' if not loop.last }}
+      {%- endfor %}
+      FROM {{ model }}
+  )
+
+  SELECT check_name, failures
+  FROM check_counts
+  UNPIVOT (failures FOR check_name IN ({{ checks | map(attribute=0) | join(', ') }}))
+  WHERE failures > 0
+{% endtest %}
@@ -0,0 +1,14 @@
+{% macro generate_schema_name(custom_schema_name, node) -%}
+  {#-
+    dbt's default schema naming, except that in backfill runs the models in
+    var('backfill_models') are built in `<schema>_backfill`, so chunks never
+    touch the production tables until `nu_backfill` promotes them. Their upstream
+    models keep resolving to production.
+  -#}
+  {%- set schema = default__generate_schema_name(custom_schema_name, node) | trim -%}
+  {%- if var('backfill', false) and node is not none and node.name in var('backfill_models', []) -%}
+    {{ schema ~ var('backfill_schema_suffix', '_backfill') }}
+  {%- else -%}
+    {{ schema }}
+  {%- endif -%}
+{%- endmacro %}
@@ -0,0 +1,71 @@
+{% macro staging_materialization() %}
+  {#-
+    Materialization of the high-frequency staging models. Views re-read and
+    re-parse the external tables for every model and test that selects from
+    them; with var('incremental_staging') they become incremental tables
+    that only load rows from files not ingested yet, so downstream models
+    read a compact native table.
+  -#}
+  {%- do return('incremental' if var('incremental_staging', false) else 'view') -%}
+{% endmacro %}
+
+
+{% macro new_landed_rows_filter() %}
+  {#-
+    Keeps the landed rows not ingested into {{ this }} yet: rows of files
+    never loaded, rows appended past the last row number loaded from a
+    file, and every row of a file overwritten in place since it was loaded.
+    Tracking is by `_source_file` / `_source_file_modified_at` /
+    `_source_row_number`; the rows of the previous version are removed by
+    the `delete_overwritten_landed_rows` pre-hook.
+    Renders to TRUE for views, on the first build and on --full-refresh runs.
+  -#}
+  {%- if is_incremental() -%}
+    NOT EXISTS (
+        SELECT 1
+        FROM (
+            SELECT _source_file, _source_file_modified_at, MAX(_source_row_number) AS max_row_number
+            FROM {{ this }}
+            GROUP BY _source_file, _source_file_modified_at
+        ) loaded
+        WHERE loaded._source_file = {{ landing_file_name() }}
+          AND loaded._source_file_modified_at IS NOT DISTINCT FROM {{ landing_file_modified_at() }}
+          AND loaded.max_row_number >= {{ landing_file_row_number() }}
+    )
+  {%- else -%}
+    TRUE
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro delete_overwritten_landed_rows(relation) %}
+  {#-
+    Pre-hook of the incremental staging models: deletes from {{ this }} the
+    rows of files whose current version in `relation` differs from the one
+    loaded, so `new_landed_rows_filter` reloads them whole and rows dropped
+    from the new version do not linger. Reads file metadata only.
+  -#}
+  {%- if is_incremental() -%}
+    DELETE FROM {{ this }}
+    WHERE EXISTS (
+        SELECT 1
+        FROM ({{ landed_file_versions(relation) }}) landed_files
+        WHERE landed_files.file_name = _source_file
+          AND landed_files.modified_at IS DISTINCT FROM _source_file_modified_at
+    )
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro dedupe_landed_rows(key) %}
+  {#-
+    With incremental staging, keeps one row per `key` in the loaded batch
+    (the last landed one); the merge on the unique key dedupes across runs.
+  -#}
+  {%- if var('incremental_staging', false) -%}
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY {{ key }}
+        ORDER BY {{ landing_file_name() }} DESC, {{ landing_file_row_number() }} DESC
+    ) = 1
+  {%- endif -%}
+{% endmacro %}
@@ -0,0 +1,105 @@
+{% macro incremental_watermark_filter(column, this_column=none, lookback_days=none, partition_column=none) %}
+  {#-
+    Limits an incremental model to the rows at or after the latest watermark
+    already merged into {{ this }}, minus a lookback window so late-arriving
+    files are picked up again and merged idempotently on the unique key.
+    `partition_column` (a date) repeats the bound on the source's partition
+    column so partitioned external tables prune files.
+    Renders to TRUE on the first build and on --full-refresh runs, and to
+    the chunk's window in backfill runs.
+  -#}
+  {%- set target_column = this_column if this_column is not none else column -%}
+  {%- set lookback = lookback_days if lookback_days is not none else var('incremental_lookback_days', 3) -%}
+  {%- if var('backfill', false) -%}
+    {{ backfill_window_filter(column, partition_column) }}
+  {%- elif is_incremental() -%}
+    {{ column }} >= (
+        SELECT COALESCE(
+            DATEADD('day', -{{ lookback }}, MAX({{ target_column }})),
+            '1900-01-01'::TIMESTAMP
+        )
+        FROM {{ this }}
+    )
+    {%- if partition_column is not none %}
+    AND {{ partition_column }} >= (
+        SELECT COALESCE(
+            DATEADD('day', -{{ lookback }}, MAX({{ target_column }})),
+            '1900-01-01'::TIMESTAMP
+        )::DATE
+        FROM {{ this }}
+    )
+    {%- endif %}
+  {%- else -%}
+    TRUE
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro loaded_since_last_build(column='_loaded_at') %}
+  {#-
+    Change-detection predicate for models downstream of incremental models:
+    true for rows (re)loaded upstream after {{ this }} was last built.
+    Renders to TRUE on the first build and on --full-refresh runs.
+  -#}
+  {%- if is_incremental() -%}
+    {{ column }} > (
+        SELECT COALESCE(MAX(_loaded_at), '1900-01-01'::TIMESTAMP)
+        FROM {{ this }}
+    )
+  {%- else -%}
+    TRUE
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro affected_account_months(relation, date_column='transaction_completed_at') %}
+  {#-
+    Distinct (account_id, month_date) pairs that received new or updated
+    rows in `relation` since {{ this }} was last built, by the month of
+    `date_column`. Only these account-months need to be recomputed on an
+    incremental run.
+  -#}
+    SELECT DISTINCT
+        account_id,
+        DATE_TRUNC('MONTH', {{ date_column }})::DATE AS month_date
+    FROM {{ relation }}
+    WHERE {{ date_column }} IS NOT NULL
+      AND {{ loaded_since_last_build('_loaded_at') }}
+{% endmacro %}
+
+
+{% macro left_account_months(relation) %}
+  {#-
+    Distinct (account_id, month_date) pairs that transactions (re)loaded in
+    `relation` (int_transactions_enriched) since {{ this }} was last built
+    have left by moving to another account or day (their
+    `_previous_account_id` / `_previous_completed_at`). A month a transaction
+    left may have no other change, so it is recomputed from these pairs.
+  -#}
+    SELECT DISTINCT
+        _previous_account_id AS account_id,
+        DATE_TRUNC('MONTH', _previous_completed_at)::DATE AS month_date
+    FROM {{ relation }}
+    WHERE _previous_completed_at IS NOT NULL
+      AND {{ loaded_since_last_build('_loaded_at') }}
+{% endmacro %}
+
+
+{% macro delete_left_account_days(relation) %}
+  {#-
+    Pre-hook of int_account_daily_activity: deletes from {{ this }} the
+    account-days that transactions (re)loaded in `relation` since the last
+    build have left (their `_previous_account_id` / `_previous_completed_at`),
+    so a day left without transactions keeps no stale group; days that still
+    have transactions are recomputed by the model.
+  -#}
+  {%- if is_incremental() -%}
+    DELETE FROM {{ this }}
+    WHERE (account_id, completed_date) IN (
+        SELECT _previous_account_id, DATE(_previous_completed_at)
+        FROM {{ relation }}
+        WHERE _previous_completed_at IS NOT NULL
+          AND {{ loaded_since_last_build('_loaded_at') }}
+    )
+  {%- endif -%}
+{% endmacro %}
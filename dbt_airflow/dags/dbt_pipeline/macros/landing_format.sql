@@ -0,0 +1,102 @@
+{% macro landing_timestamp(column, epoch_text=false) %}
+  {#-
+    Timestamp of a high-frequency source column. CSV external tables expose
+    text (epoch seconds when `epoch_text`) that must be parsed; the Parquet
+    landing format (var('landing_format') == 'parquet') and the pipe-loaded
+    native tables (var('ingestion_mode') == 'snowpipe') store typed timestamps.
+  -#}
+  {%- if var('ingestion_mode', 'external_tables') == 'snowpipe' or var('landing_format', 'csv') == 'parquet' -%}
+    {{ column }}
+  {%- elif epoch_text -%}
+    TO_TIMESTAMP(CAST({{ column }} AS BIGINT))
+  {%- else -%}
+    TO_TIMESTAMP({{ column }})
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro landing_completed_date(column, epoch_text=false) %}
+  {#-
+    Completion date of a high-frequency source row. With the Parquet landing
+    format this is the external table's partition column, so filters on it
+    prune files; otherwise it is derived from the timestamp.
+  -#}
+  {%- if var('ingestion_mode', 'external_tables') != 'snowpipe' and var('landing_format', 'csv') == 'parquet' -%}
+    completed_date
+  {%- else -%}
+    TO_DATE({{ landing_timestamp(column, epoch_text) }})
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro landing_file_name() %}
+  {#-
+    Landed file of a high-frequency source row: the external table's
+    METADATA$FILENAME, or the `_source_file` column the pipe loads into the
+    native tables (var('ingestion_mode') == 'snowpipe').
+  -#}
+  {%- if var('ingestion_mode', 'external_tables') == 'snowpipe' -%}
+    _source_file
+  {%- else -%}
+    METADATA$FILENAME
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro landing_file_row_number() %}
+  {#- Row number of a high-frequency source row within its landed file (see landing_file_name). -#}
+  {%- if var('ingestion_mode', 'external_tables') == 'snowpipe' -%}
+    _source_row_number
+  {%- else -%}
+    METADATA$FILE_ROW_NUMBER
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro landing_file_modified_at() %}
+  {#-
+    Version (last-modified time) of the landed file of a high-frequency
+    source row: the `_source_file_modified_at` column the pipe loads into
+    the native tables, or, for external tables, the LAST_MODIFIED of the
+    file joined by `landed_files_join` (incremental staging only; NULL
+    otherwise).
+  -#}
+  {%- if var('ingestion_mode', 'external_tables') == 'snowpipe' -%}
+    _source_file_modified_at
+  {%- elif var('incremental_staging', false) -%}
+    landed_files.modified_at
+  {%- else -%}
+    CAST(NULL AS TIMESTAMP)
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro landed_file_versions(relation) %}
+  {#-
+    Current version of every landed file of a high-frequency source
+    (`file_name`, `modified_at`): the external table's registered files,
+    or the versions the pipe loaded into the native table.
+  -#}
+  {%- if var('ingestion_mode', 'external_tables') == 'snowpipe' -%}
+    SELECT _source_file AS file_name, MAX(_source_file_modified_at) AS modified_at
+    FROM {{ relation }}
+    GROUP BY _source_file
+  {%- else -%}
+    SELECT file_name, last_modified AS modified_at
+    FROM TABLE({{ relation.database }}.INFORMATION_SCHEMA.EXTERNAL_TABLE_FILES(
+        TABLE_NAME => '{{ relation.database }}.{{ relation.schema }}.{{ relation.identifier }}'
+    ))
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro landed_files_join(relation) %}
+  {#-
+    Joins the file versions of an external table so `landing_file_modified_at`
+    can read them; only needed by incremental staging on external tables.
+  -#}
+  {%- if var('ingestion_mode', 'external_tables') != 'snowpipe' and var('incremental_staging', false) -%}
+    LEFT JOIN ({{ landed_file_versions(relation) }}) landed_files
+        ON landed_files.file_name = METADATA$FILENAME
+  {%- endif -%}
+{% endmacro %}
@@ -0,0 +1,70 @@
+{% macro physical_design_cluster_by() %}
+  {#-
+    Clustering key of the model in var('physical_design'), for the model's
+    native `cluster_by` config: tables are created ORDER BY the key and
+    keep it across CREATE OR REPLACE rebuilds.
+  -#}
+  {%- do return((var('physical_design', {}).get(model.name) or {}).get('cluster_by')) -%}
+{% endmacro %}
+
+
+{% macro apply_physical_design() %}
+  {#-
+    Post-hook enforcing the parts of the model's entry in var('physical_design')
+    that dbt has no config for: `search_optimization` ({method: [columns]})
+    and `materialized_views` ([{name, sql, cluster_by}], `sql` selecting from
+    `__this__`); `cluster_by` goes through the model config
+    (`physical_design_cluster_by`). Idempotent: the current search
+    optimization targets (DESCRIBE SEARCH OPTIMIZATION) are compared first,
+    and a materialized view is only recreated when its definition changed or
+    it was invalidated by a rebuild of the table.
+  -#}
+  {%- set design = var('physical_design', {}).get(model.name) -%}
+  {%- if not design or not execute -%}
+    {%- do return('') -%}
+  {%- endif -%}
+  {%- set shown = run_query("SHOW TABLES LIKE '" ~ this.identifier | upper ~ "' IN SCHEMA " ~ this.database ~ "." ~ this.schema) -%}
+  {%- if shown.rows | length == 0 -%}
+    {%- do return('') -%}
+  {%- endif -%}
+  {%- set table = shown.rows[0] -%}
+
+  {#- Search optimization: only the missing method/column pairs are added -#}
+  {%- set search_optimization = design.get('search_optimization') or {} -%}
+  {%- set existing = [] -%}
+  {%- if search_optimization and table['search_optimization'] == 'ON' -%}
+    {%- for row in run_query('DESCRIBE SEARCH OPTIMIZATION ON ' ~ this) -%}
+      {%- do existing.append((row['method'] ~ '(' ~ row['target'] ~ ')') | upper) -%}
+    {%- endfor -%}
+  {%- endif -%}
+  {%- set missing = [] -%}
+  {%- for method, columns in search_optimization.items() -%}
+    {%- for column in columns if (method ~ '(' ~ column ~ ')') | upper not in existing -%}
+      {%- do missing.append((method ~ '(' ~ column ~ ')') | upper) -%}
+    {%- endfor -%}
+  {%- endfor -%}
+  {%- if missing -%}
+    {%- do run_query('ALTER TABLE ' ~ this ~ ' ADD SEARCH OPTIMIZATION ON ' ~ missing | join(', ')) -%}
+    {{ log(model.name ~ ": search optimization added on " ~ missing | join(', '), info=True) }}
+  {%- endif -%}
+
+  {#- Materialized views over the model, tagged with a hash of their definition -#}
+  {%- for view in design.get('materialized_views') or [] -%}
+    {%- set relation = api.Relation.create(database=this.database, schema=this.schema, identifier=view['name']) -%}
+    {%- set view_sql = view['sql'] | replace('__this__', this | string) -%}
+    {%- set view_cluster_by = view.get('cluster_by') or [] -%}
+    {%- set definition_hash = 'physical_design:' ~ local_md5(view_sql ~ '|' ~ view_cluster_by | join(',')) -%}
+    {%- set current = run_query("SHOW MATERIALIZED VIEWS LIKE '" ~ view['name'] | upper ~ "' IN SCHEMA " ~ this.database ~ "." ~ this.schema) -%}
+    {%- set up_to_date = current.rows | length > 0
+        and current.rows[0]['comment'] == definition_hash
+        and current.rows[0]['invalid'] in (false, 'false') -%}
+    {%- if not up_to_date -%}
+      {%- do run_query(
+          'CREATE OR REPLACE MATERIALIZED VIEW ' ~ relation
+          ~ (' CLUSTER BY (' ~ view_cluster_by | join(', ') ~ ')' if view_cluster_by else '')
+          ~ " COMMENT = '" ~ definition_hash ~ "' AS " ~ view_sql
+      ) -%}
+      {{ log(model.name ~ ": materialized view " ~ view['name'] ~ " (re)created", info=True) }}
+    {%- endif -%}
+  {%- endfor -%}
+{% endmacro %}
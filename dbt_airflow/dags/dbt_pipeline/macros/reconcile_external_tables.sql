@@ -0,0 +1,285 @@
+{% macro external_table_definitions() %}
+  {#-
+    Single source of truth for the external tables in NU_RAW_SCHEMA: column
+    expressions, stage path, file pattern and file format of each table.
+    With var('landing_format') == 'parquet', the high-frequency sources read
+    the date-partitioned Parquet written by the Airflow converter instead.
+  -#}
+  {%- set csv_pattern = '.*\\.csv' -%}
+  {%- set csv_format = "(TYPE = 'CSV' SKIP_HEADER = 1)" -%}
+
+  {%- set definitions = {
+      'pix_movements': {
+          'columns': [
+              ['id', 'BIGINT', "VALUE:c1::BIGINT"],
+              ['account_id', 'BIGINT', "VALUE:c2::BIGINT"],
+              ['pix_amount', 'NUMBER(18,2)', "TO_DECIMAL(VALUE:c3::STRING, 18, 2)"],
+              ['pix_requested_at', 'TIMESTAMP', "TRY_TO_TIMESTAMP(NULLIF(VALUE:c4::STRING, 'None'))"],
+              ['pix_completed_at', 'TIMESTAMP', "TRY_TO_TIMESTAMP(NULLIF(VALUE:c5::STRING, 'None'))"],
+              ['status', 'STRING', "VALUE:c6::STRING"],
+              ['in_or_out', 'STRING', "VALUE:c7::STRING"]
+          ],
+          'path': 'pix_movements/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'accounts': {
+          'columns': [
+              ['account_id', 'BIGINT', "VALUE:c1::BIGINT"],
+              ['account_name', 'STRING', "VALUE:c2::STRING"],
+              ['created_at', 'TIMESTAMP', "VALUE:c3::TIMESTAMP"],
+              ['status', 'STRING', "VALUE:c4::STRING"]
+          ],
+          'path': 'accounts/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'city': {
+          'columns': [
+              ['city_name', 'STRING', "VALUE:c1::STRING"],
+              ['state_id', 'BIGINT', "VALUE:c2::BIGINT"],
+              ['city_id', 'BIGINT', "VALUE:c3::BIGINT"]
+          ],
+          'path': 'city/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'country': {
+          'columns': [
+              ['country', 'STRING', "VALUE:c1::STRING"],
+              ['country_id', 'BIGINT', "VALUE:c2::BIGINT"]
+          ],
+          'path': 'country/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'customers': {
+          'columns': [
+              ['customer_id', 'BIGINT', "VALUE:c1::BIGINT"],
+              ['first_name', 'STRING', "VALUE:c2::STRING"],
+              ['last_name', 'STRING', "VALUE:c3::STRING"],
+              ['customer_city', 'BIGINT', "VALUE:c4::BIGINT"],
+              ['cpf', 'BIGINT', "VALUE:c5::BIGINT"],
+              ['country_name', 'STRING', "VALUE:c6::STRING"]
+          ],
+          'path': 'customers/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'd_month': {
+          'columns': [
+              ['month_id', 'INT', "VALUE:c1::INT"],
+              ['action_month', 'BIGINT', "VALUE:c2::BIGINT"]
+          ],
+          'path': 'd_month/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'd_time': {
+          'columns': [
+              ['time_id', 'BIGINT', "VALUE:c1::BIGINT"],
+              ['action_timestamp', 'STRING', "VALUE:c2::STRING"],
+              ['week_id', 'INT', "VALUE:c3::INT"],
+              ['month_id', 'INT', "VALUE:c4::INT"],
+              ['year_id', 'INT', "VALUE:c5::INT"],
+              ['weekday_id', 'INT', "VALUE:c6::INT"]
+          ],
+          'path': 'd_time/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'd_week': {
+          'columns': [
+              ['week_id', 'INT', "VALUE:c1::INT"],
+              ['action_week', 'INT', "VALUE:c2::INT"]
+          ],
+          'path': 'd_week/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'd_weekday': {
+          'columns': [
+              ['weekday_id', 'INT', "VALUE:c1::INT"],
+              ['action_weekday', 'STRING', "VALUE:c2::STRING"]
+          ],
+          'path': 'd_weekday/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'd_year': {
+          'columns': [
+              ['year_id', 'INT', "VALUE:c1::INT"],
+              ['action_year', 'INT', "VALUE:c2::INT"]
+          ],
+          'path': 'd_year/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'state': {
+          'columns': [
+              ['state', 'STRING', "VALUE:c1::STRING"],
+              ['country_id', 'INT', "VALUE:c2::INT"],
+              ['state_id', 'INT', "VALUE:c3::INT"]
+          ],
+          'path': 'state/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'transfer_ins': {
+          'columns': [
+              ['id', 'BIGINT', "VALUE:c1::BIGINT"],
+              ['account_id', 'BIGINT', "VALUE:c2::BIGINT"],
+              ['amount', 'NUMBER(18,2)', "TO_DECIMAL(VALUE:c3::STRING, 18, 2)"],
+              ['transaction_requested_at', 'STRING', "VALUE:c4::STRING"],
+              ['transaction_completed_at', 'STRING', "VALUE:c5::STRING"],
+              ['status', 'STRING', "VALUE:c6::STRING"]
+          ],
+          'path': 'transfer_ins/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      },
+      'transfer_outs': {
+          'columns': [
+              ['id', 'BIGINT', "VALUE:c1::BIGINT"],
+              ['account_id', 'BIGINT', "VALUE:c2::BIGINT"],
+              ['amount', 'NUMBER(18,2)', "TO_DECIMAL(VALUE:c3::STRING, 18, 2)"],
+              ['transaction_requested_at', 'STRING', "VALUE:c4::STRING"],
+              ['transaction_completed_at', 'STRING', "VALUE:c5::STRING"],
+              ['status', 'STRING', "VALUE:c6::STRING"]
+          ],
+          'path': 'transfer_outs/',
+          'pattern': csv_pattern,
+          'file_format': csv_format,
+      }
+  } -%}
+
+  {%- if var('landing_format', 'csv') == 'parquet' -%}
+    {%- do definitions.update(parquet_external_table_definitions()) -%}
+  {%- endif -%}
+
+  {%- do return(definitions) -%}
+{% endmacro %}
+
+
+{% macro parquet_external_table_definitions() %}
+  {#-
+    High-frequency sources landed as Parquet under
+    parquet/<table>/completed_date=YYYY-MM-DD/. `completed_date` is derived
+    from the file path and declared as partition column, so filters on it
+    prune files. Timestamps are typed in the files (no text parsing).
+  -#}
+  {%- set parquet_pattern = '.*\\.parquet' -%}
+  {%- set parquet_format = "(TYPE = 'PARQUET')" -%}
+  {%- set completed_date = [
+      'completed_date', 'DATE',
+      "TRY_TO_DATE(SPLIT_PART(SPLIT_PART(METADATA$FILENAME, 'completed_date=', 2), '/', 1), 'YYYY-MM-DD')"
+  ] -%}
+  {%- set transfer_columns = [
+      completed_date,
+      ['id', 'BIGINT', "VALUE:id::BIGINT"],
+      ['account_id', 'BIGINT', "VALUE:account_id::BIGINT"],
+      ['amount', 'NUMBER(18,2)', "VALUE:amount::NUMBER(18,2)"],
+      ['transaction_requested_at', 'TIMESTAMP', "VALUE:transaction_requested_at::TIMESTAMP"],
+      ['transaction_completed_at', 'TIMESTAMP', "VALUE:transaction_completed_at::TIMESTAMP"],
+      ['status', 'STRING', "VALUE:status::STRING"]
+  ] -%}
+
+  {%- do return({
+      'pix_movements': {
+          'columns': [
+              completed_date,
+              ['id', 'BIGINT', "VALUE:id::BIGINT"],
+              ['account_id', 'BIGINT', "VALUE:account_id::BIGINT"],
+              ['pix_amount', 'NUMBER(18,2)', "VALUE:pix_amount::NUMBER(18,2)"],
+              ['pix_requested_at', 'TIMESTAMP', "VALUE:pix_requested_at::TIMESTAMP"],
+              ['pix_completed_at', 'TIMESTAMP', "VALUE:pix_completed_at::TIMESTAMP"],
+              ['status', 'STRING', "VALUE:status::STRING"],
+              ['in_or_out', 'STRING', "VALUE:in_or_out::STRING"]
+          ],
+          'partition_by': ['completed_date'],
+          'path': 'parquet/pix_movements/',
+          'pattern': parquet_pattern,
+          'file_format': parquet_format,
+      },
+      'transfer_ins': {
+          'columns': transfer_columns,
+          'partition_by': ['completed_date'],
+          'path': 'parquet/transfer_ins/',
+          'pattern': parquet_pattern,
+          'file_format': parquet_format,
+      },
+      'transfer_outs': {
+          'columns': transfer_columns,
+          'partition_by': ['completed_date'],
+          'path': 'parquet/transfer_outs/',
+          'pattern': parquet_pattern,
+          'file_format': parquet_format,
+      }
+  }) -%}
+{% endmacro %}
+
+
+{% macro external_table_ddl(database, schema, table, definition) %}
+  {#- CREATE OR REPLACE statement for one external table (without its fingerprint comment). -#}
+    CREATE OR REPLACE EXTERNAL TABLE {{ database }}.{{ schema }}.{{ table }} (
+    {%- for name, data_type, expression in definition['columns'] %}
+        {{ name }} {{ data_type }} AS ({{ expression }}){{ "," if not loop.last }}
+    {%- endfor %}
+    )
+    {%- if definition.get('partition_by') %}
+    PARTITION BY ({{ definition['partition_by'] | join(', ') }})
+    {%- endif %}
+    LOCATION = @{{ database }}.{{ schema }}.nu_dataset_stage/{{ definition['path'] }}
+    PATTERN = '{{ definition['pattern'] }}'
+    FILE_FORMAT = {{ definition['file_format'] }}
+    AUTO_REFRESH = FALSE
+{%- endmacro %}
+
+
+{% macro reconcile_external_tables(database='NU_DB', schema='NU_RAW_SCHEMA', dry_run=false) %}
+  {#-
+    Idempotent reconciler for the external tables declared in
+    external_table_definitions(). Each table's DDL is fingerprinted (md5) and
+    the fingerprint is stored in the table COMMENT. DDL is only issued for
+    tables that are missing or whose live fingerprint differs, so unchanged
+    tables keep their file registration metadata.
+
+    Runs once per pipeline run from Airflow:
+        dbt run-operation reconcile_external_tables [--args '{dry_run: true}']
+  -#}
+  {%- if not execute -%}
+    {%- do return(none) -%}
+  {%- endif -%}
+
+  {% do run_query(
+      "CREATE STAGE IF NOT EXISTS " ~ database ~ "." ~ schema ~ ".nu_dataset_stage"
+      ~ " STORAGE_INTEGRATION = nu_dataset_integration"
+      ~ " URL = 'gcs://nu_dataset/Tables'"
+      ~ " FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER = 1)"
+  ) %}
+
+  {#- Fingerprints of the live external tables, read from their comments -#}
+  {% set live_comments = {} %}
+  {% for row in run_query("SHOW EXTERNAL TABLES IN SCHEMA " ~ database ~ "." ~ schema) %}
+    {% do live_comments.update({row['name'] | lower: row['comment']}) %}
+  {% endfor %}
+
+  {% set reconciled = [] %}
+  {% for table, definition in external_table_definitions().items() %}
+    {% set ddl = external_table_ddl(database, schema, table, definition) | trim %}
+    {% set fingerprint = 'dbt-fingerprint:' ~ local_md5(ddl) %}
+
+    {% if live_comments.get(table) == fingerprint %}
+      {% do log("External table " ~ table ~ " is up to date (" ~ fingerprint ~ ")", info=True) %}
+    {% else %}
+      {% set reason = 'missing' if table not in live_comments else 'definition changed' %}
+      {% do log("Reconciling external table " ~ table ~ " (" ~ reason ~ ")", info=True) %}
+      {% if not dry_run %}
+        {% do run_query(ddl ~ "\n    COMMENT = '" ~ fingerprint ~ "'") %}
+      {% endif %}
+      {% do reconciled.append(table) %}
+    {% endif %}
+  {% endfor %}
+
+  {% do log("Reconciled " ~ reconciled | length ~ " external table(s): " ~ reconciled, info=True) %}
+{% endmacro %}
@@ -0,0 +1,56 @@
+{% macro test_window_filter(column, watermark_relation, partition_column=none) %}
+  {#-
+    Limits a data test to the rows of the current run's incremental window,
+    anchored on the data rather than the wall clock: rows at or after the
+    incremental watermark of `watermark_relation` (MAX of `column` minus
+    var('incremental_lookback_days'), as in `incremental_watermark_filter`),
+    widened by var('test_window_days') to cover the data a run already
+    merged past the previous watermark. `partition_column` (a date) repeats
+    the bound so partitioned external tables prune files.
+    Renders to TRUE when var('test_mode') is 'full' (the scheduled
+    full-history audit, full refreshes) or before `watermark_relation` exists.
+  -#}
+  {%- set existing = adapter.get_relation(watermark_relation.database, watermark_relation.schema, watermark_relation.identifier) if execute else none -%}
+  {%- if var('test_mode', 'window') == 'full' or existing is none -%}
+    TRUE
+  {%- else -%}
+    {%- set days = var('incremental_lookback_days', 3) + var('test_window_days', 3) -%}
+    {%- set window_start -%}
+        (
+            SELECT COALESCE(DATEADD('day', -{{ days }}, MAX({{ column.split('.')[-1] }})), '1900-01-01'::TIMESTAMP)
+            FROM {{ existing }}
+        )
+    {%- endset -%}
+    {{ column }} >= {{ window_start }}
+    {%- if partition_column is not none %}
+    AND {{ partition_column }} >= {{ window_start }}::DATE
+    {%- endif %}
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro default__get_where_subquery(relation) -%}
+  {#-
+    dbt's `where` test config, plus the test window of the tested model:
+    generic tests of a model with `meta.test_window` ({column,
+    partition_column, watermark_model}) only check the rows of
+    `test_window_filter`, unless the test sets `full_history: true`.
+  -#}
+  {%- set filters = [] -%}
+  {%- if config.get('where') -%}
+    {%- do filters.append('(' ~ config.get('where') ~ ')') -%}
+  {%- endif -%}
+
+  {%- set tested_node = graph.nodes.get(model.attached_node) if model.attached_node else none -%}
+  {%- set window = (tested_node.config.meta or {}).get('test_window') if tested_node else none -%}
+  {%- if window and not config.get('full_history', false) and var('test_mode', 'window') != 'full' -%}
+    {%- set watermark = graph.nodes['model.' ~ project_name ~ '.' ~ window['watermark_model']] -%}
+    {%- set watermark_relation = api.Relation.create(watermark.database, watermark.schema, watermark.alias) -%}
+    {%- do filters.append(test_window_filter(window['column'], watermark_relation, window.get('partition_column'))) -%}
+  {%- endif -%}
+
+  {%- if filters -%}
+    {%- do return('(select * from ' ~ relation ~ ' where ' ~ filters | join(' and ') ~ ') dbt_subquery') -%}
+  {%- endif -%}
+  {%- do return(relation) -%}
+{%- endmacro %}
@@ -0,0 +1,43 @@
+{% macro routed_warehouse(node) %}
+  {#-
+    Warehouse a model runs on: var('warehouse_overrides') (adaptive sizing
+    set by the Airflow DAG) first, then `models` and then the first of the
+    model's tags found in `tags` of var('warehouse_routing'). None keeps the
+    profile's warehouse.
+  -#}
+  {%- set routing = var('warehouse_routing', {}) -%}
+  {%- set overrides = var('warehouse_overrides', {}) or {} -%}
+  {%- if node.name in overrides -%}
+    {%- do return(overrides[node.name]) -%}
+  {%- endif -%}
+  {%- if node.name in routing.get('models', {}) -%}
+    {%- do return(routing['models'][node.name]) -%}
+  {%- endif -%}
+  {%- for tag in node.tags if tag in routing.get('tags', {}) -%}
+    {%- if loop.first -%}
+      {%- do return(routing['tags'][tag]) -%}
+    {%- endif -%}
+  {%- endfor -%}
+  {%- do return(none) -%}
+{% endmacro %}
+
+
+{% macro use_routed_warehouse() %}
+  {#- Pre-hook switching the model's session to its routed warehouse (nothing when unrouted). -#}
+  {%- set warehouse = routed_warehouse(model) -%}
+  {%- if warehouse and warehouse | upper != target.warehouse | upper -%}
+    USE WAREHOUSE {{ warehouse }}
+  {%- endif -%}
+{% endmacro %}
+
+
+{% macro restore_warehouse() %}
+  {#-
+    Post-hook switching back to the profile's warehouse, since dbt reuses a
+    thread's session for the next model.
+  -#}
+  {%- set warehouse = routed_warehouse(model) -%}
+  {%- if warehouse and warehouse | upper != target.warehouse | upper -%}
+    USE WAREHOUSE {{ target.warehouse }}
+  {%- endif -%}
+{% endmacro %}
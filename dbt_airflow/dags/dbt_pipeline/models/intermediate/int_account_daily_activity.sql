@@ -0,0 +1,120 @@
+{{ config(
+    materialized='incremental',
+    unique_key=['account_id', 'completed_date'],
+    incremental_strategy=backfill_incremental_strategy('delete+insert'),
+    pre_hook=[
+        "{{ backfill_clear_chunk('completed_date') }}",
+        "{{ delete_left_account_days(ref('int_transactions_enriched')) }}"
+    ],
+    cluster_by=physical_design_cluster_by(),
+    tags=['intermediate', 'aggregate']
+) }}
+
+-- Mergeable daily partials (sums, counts, min/max timestamps) per account,
+-- day, channel and direction. Besides fct_transactions, this is the only model
+-- scanning int_transactions_enriched: the account dimension, the spine and the
+-- monthly summaries roll up from it. Incremental runs rebuild every
+-- (account, day) with new or updated transactions as a whole, so a
+-- transaction moving to another channel/direction leaves no stale group;
+-- a transaction moving to another day or account also rebuilds the
+-- account-day it left (from int_transactions_enriched's `_previous_*`
+-- columns), which the `delete_left_account_days` pre-hook clears first.
+
+WITH
+{% if is_incremental() %}
+-- Account-days that received new or updated transactions since the last
+-- build, and the account-days those transactions left
+affected_account_days AS (
+    SELECT
+        account_id,
+        DATE(transaction_completed_at) AS completed_date
+    FROM {{ ref('int_transactions_enriched') }}
+    WHERE transaction_completed_at IS NOT NULL
+      AND {{ loaded_since_last_build('_loaded_at') }}
+
+    UNION
+
+    SELECT
+        _previous_account_id AS account_id,
+        DATE(_previous_completed_at) AS completed_date
+    FROM {{ ref('int_transactions_enriched') }}
+    WHERE _previous_completed_at IS NOT NULL
+      AND {{ loaded_since_last_build('_loaded_at') }}
+),
+{% endif %}
+
+-- Import CTEs
+transactions AS (
+    SELECT t.*
+    FROM {{ ref('int_transactions_enriched') }} t
+    {% if is_incremental() %}
+    INNER JOIN affected_account_days ad
+        ON t.account_id = ad.account_id
+        AND DATE(t.transaction_completed_at) = ad.completed_date
+    {% endif %}
+    WHERE t.transaction_completed_at IS NOT NULL
+      AND {{ backfill_window_filter('t.transaction_completed_at') }}
+),
+
+-- Logical CTE - one row of partials per account, day, channel and direction
+daily_activity AS (
+    SELECT
+        account_id,
+        DATE(transaction_completed_at) AS completed_date,
+        transaction_channel,
+        transaction_direction,
+
+        -- Amounts
+        SUM(transaction_amount) AS total_amount,
+        SUM(signed_amount) AS net_amount,
+
+        -- Counts
+        COUNT(*) AS transaction_count,
+        COUNT(CASE WHEN transaction_size_category = 'micro' THEN 1 END) AS micro_transactions,
+        COUNT(CASE WHEN transaction_size_category = 'small' THEN 1 END) AS small_transactions,
+        COUNT(CASE WHEN transaction_size_category = 'medium' THEN 1 END) AS medium_transactions,
+        COUNT(CASE WHEN transaction_size_category = 'large' THEN 1 END) AS large_transactions,
+        COUNT(CASE WHEN transaction_size_category = 'enterprise' THEN 1 END) AS enterprise_transactions,
+
+        -- Timestamps
+        MIN(transaction_completed_at) AS first_transaction_at,
+        MAX(transaction_completed_at) AS last_transaction_at
+
+    FROM transactions
+    GROUP BY 1, 2, 3, 4
+),
+
+-- Final organization
+final AS (
+    SELECT
+        -- 1. IDENTIFIERS
+        account_id,
+
+        -- 2. DIMENSIONS
+        transaction_channel,
+        transaction_direction,
+
+        -- 3. MEASURES
+        total_amount,
+        net_amount,
+        transaction_count,
+        micro_transactions,
+        small_transactions,
+        medium_transactions,
+        large_transactions,
+        enterprise_transactions,
+
+        -- 4. DATES/TIMESTAMPS
+        completed_date,
+        DATE_TRUNC('MONTH', completed_date)::DATE AS month_date,
+        first_transaction_at,
+        last_transaction_at,
+
+        -- 5. METADATA
+        CURRENT_TIMESTAMP() AS _loaded_at
+
+    FROM daily_activity
+)
+
+-- Simple select statement
+SELECT * FROM final
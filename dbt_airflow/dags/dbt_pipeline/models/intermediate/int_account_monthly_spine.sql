@@ -1,11 +1,63 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    unique_key='account_id',
+    incremental_strategy=backfill_incremental_strategy('delete+insert'),
+    pre_hook="{{ backfill_clear_chunk('month_date') }}"
+) }}
+
+-- Incremental runs replace the whole spine of each affected account
+-- (delete+insert on account_id), so months that fall outside an account's new
+-- activity range (e.g. the 2020-01 start of an account without transactions
+-- once it has its first one) are deleted, as on a --full-refresh.
 
 WITH
+{% if is_incremental() %}
+-- Accounts whose activity range may have moved since the last build: those
+-- with new or updated transactions, those transactions moved away from,
+-- active accounts not yet in the spine, and active accounts without
+-- transactions (whose spine runs to the current month) not extended to the
+-- current month yet
+affected_accounts AS (
+    SELECT account_id
+    FROM ({{ affected_account_months(ref('int_account_daily_activity'), 'completed_date') }})
+
+    UNION
+
+    SELECT account_id
+    FROM ({{ left_account_months(ref('int_transactions_enriched')) }})
+
+    UNION
+
+    SELECT a.account_id
+    FROM {{ ref('stg_accounts') }} a
+    LEFT JOIN (
+        SELECT account_id, MAX(month_date) AS last_month_date
+        FROM {{ this }}
+        GROUP BY account_id
+    ) spine ON a.account_id = spine.account_id
+    WHERE a.account_status = 'active'
+      AND (
+          spine.account_id IS NULL
+          OR (
+              spine.last_month_date < DATE_TRUNC('MONTH', CURRENT_DATE())
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM {{ ref('int_account_daily_activity') }} d
+                  WHERE d.account_id = a.account_id
+              )
+          )
+      )
+),
+{% endif %}
+
 -- Import CTEs - bringing in data
 accounts AS (
     SELECT DISTINCT account_id 
     FROM {{ ref('stg_accounts') }}
     WHERE account_status = 'active'
+    {% if is_incremental() %}
+      AND account_id IN (SELECT account_id FROM affected_accounts)
+    {% endif %}
 ),
 
 time_dimension AS (
@@ -24,29 +76,11 @@ account_date_range AS (
         account_id,
         MIN(completed_date) AS first_transaction_date,
         MAX(completed_date) AS last_transaction_date
-    FROM (
-        SELECT 
-            account_id,
-            DATE(transaction_completed_at) AS completed_date
-        FROM {{ ref('stg_pix_movements') }}
-        WHERE transaction_status = 'completed'  -- CAMBIO: era 'active', debe ser 'completed'
-        
-        UNION ALL
-        
-        SELECT 
-            account_id,
-            DATE(transaction_completed_at) AS completed_date
-        FROM {{ ref('stg_transfer_ins') }}
-        WHERE transaction_status = 'completed'  -- CAMBIO: era 'active', debe ser 'completed'
-        
-        UNION ALL
-        
-        SELECT 
-            account_id,
-            DATE(transaction_completed_at) AS completed_date
-        FROM {{ ref('stg_transfer_outs') }}
-        WHERE transaction_status = 'completed'  -- CAMBIO: era 'active', debe ser 'completed'
-    ) all_transactions
+    FROM {{ ref('int_account_daily_activity') }}
+    WHERE completed_date IS NOT NULL
+    {% if is_incremental() %}
+      AND account_id IN (SELECT account_id FROM affected_accounts)
+    {% endif %}
     GROUP BY account_id
 ),
 
@@ -74,6 +108,8 @@ account_month_spine AS (
         COALESCE(DATE_TRUNC('MONTH', adr.first_transaction_date), '2020-01-01') 
         AND 
         COALESCE(DATE_TRUNC('MONTH', adr.last_transaction_date), CURRENT_DATE())
+      -- Only the chunk's months in backfill runs
+      AND {{ backfill_window_filter('c.month_start_date') }}
 ),
 
 -- Final organization
@@ -1,44 +1,85 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    unique_key='account_id',
+    incremental_strategy=backfill_incremental_strategy('delete+insert'),
+    pre_hook="{{ backfill_clear_chunk('month_date') }}"
+) }}
+
+-- Incremental runs replace all months of each affected account (delete+insert
+-- on account_id), following int_account_monthly_spine, so months removed from
+-- an account's spine are removed here too.
 
 WITH
+{% if is_incremental() %}
+-- Accounts to recompute: those whose spine was (re)built since the last run,
+-- those whose months received new or updated transactions and those whose
+-- months transactions moved away from
+affected_accounts AS (
+    SELECT account_id
+    FROM {{ ref('int_account_monthly_spine') }}
+    WHERE {{ loaded_since_last_build('_loaded_at') }}
+
+    UNION
+
+    SELECT account_id
+    FROM ({{ affected_account_months(ref('int_account_daily_activity'), 'completed_date') }})
+
+    UNION
+
+    SELECT account_id
+    FROM ({{ left_account_months(ref('int_transactions_enriched')) }})
+),
+{% endif %}
+
 -- Import CTEs
 spine AS (
-    SELECT * FROM {{ ref('int_account_monthly_spine') }}
+    SELECT s.*
+    FROM {{ ref('int_account_monthly_spine') }} s
+    WHERE {{ backfill_window_filter('s.month_date') }}
+    {% if is_incremental() %}
+      AND s.account_id IN (SELECT account_id FROM affected_accounts)
+    {% endif %}
 ),
 
-transactions AS (
-    SELECT * FROM {{ ref('int_transactions_enriched') }}
+daily_activity AS (
+    SELECT d.*
+    FROM {{ ref('int_account_daily_activity') }} d
+    WHERE {{ backfill_window_filter('d.completed_date') }}
+    {% if is_incremental() %}
+      AND d.account_id IN (SELECT account_id FROM affected_accounts)
+    {% endif %}
 ),
 
--- Logical CTEs - aggregate transactions by account and month
+-- Logical CTEs - roll the daily partials up to account and month
 monthly_aggregates AS (
     SELECT
-        DATE_TRUNC('MONTH', transaction_completed_at) AS month_date,
+        month_date,
         account_id,
         
         -- Volume metrics
-        SUM(CASE WHEN transaction_direction = 'in' THEN transaction_amount ELSE 0 END) AS inbound_volume,
-        SUM(CASE WHEN transaction_direction = 'out' THEN transaction_amount ELSE 0 END) AS outbound_volume,
-        SUM(signed_amount) AS net_flow,
+        SUM(CASE WHEN transaction_direction = 'in' THEN total_amount ELSE 0 END) AS inbound_volume,
+        SUM(CASE WHEN transaction_direction = 'out' THEN total_amount ELSE 0 END) AS outbound_volume,
+        SUM(net_amount) AS net_flow,
         
         -- Transaction counts
-        COUNT(*) AS total_transactions,
-        COUNT(CASE WHEN transaction_direction = 'in' THEN 1 END) AS inbound_transactions,
-        COUNT(CASE WHEN transaction_direction = 'out' THEN 1 END) AS outbound_transactions,
+        SUM(transaction_count) AS total_transactions,
+        SUM(CASE WHEN transaction_direction = 'in' THEN transaction_count ELSE 0 END) AS inbound_transactions,
+        SUM(CASE WHEN transaction_direction = 'out' THEN transaction_count ELSE 0 END) AS outbound_transactions,
         
         -- Channel breakdown
-        SUM(CASE WHEN transaction_channel = 'PIX' THEN signed_amount ELSE 0 END) AS pix_net_flow,
-        SUM(CASE WHEN transaction_channel = 'TRANSFER' THEN signed_amount ELSE 0 END) AS transfer_net_flow,
+        SUM(CASE WHEN transaction_channel = 'PIX' THEN net_amount ELSE 0 END) AS pix_net_flow,
+        SUM(CASE WHEN transaction_channel = 'TRANSFER' THEN net_amount ELSE 0 END) AS transfer_net_flow,
         
-        COUNT(CASE WHEN transaction_channel = 'PIX' THEN 1 END) AS pix_transactions,
-        COUNT(CASE WHEN transaction_channel = 'TRANSFER' THEN 1 END) AS transfer_transactions,
+        SUM(CASE WHEN transaction_channel = 'PIX' THEN transaction_count ELSE 0 END) AS pix_transactions,
+        SUM(CASE WHEN transaction_channel = 'TRANSFER' THEN transaction_count ELSE 0 END) AS transfer_transactions,
         
-        -- Average transaction values
-        AVG(CASE WHEN transaction_direction = 'in' THEN transaction_amount END) AS avg_inbound_transaction_amount,
-        AVG(CASE WHEN transaction_direction = 'out' THEN transaction_amount END) AS avg_outbound_transaction_amount
+        -- Average transaction values (sum / count of the partials)
+        SUM(CASE WHEN transaction_direction = 'in' THEN total_amount END)
+            / NULLIF(SUM(CASE WHEN transaction_direction = 'in' THEN transaction_count END), 0) AS avg_inbound_transaction_amount,
+        SUM(CASE WHEN transaction_direction = 'out' THEN total_amount END)
+            / NULLIF(SUM(CASE WHEN transaction_direction = 'out' THEN transaction_count END), 0) AS avg_outbound_transaction_amount
 
-    FROM transactions
-    WHERE transaction_completed_at IS NOT NULL
+    FROM daily_activity
     GROUP BY 1, 2
 ),
 
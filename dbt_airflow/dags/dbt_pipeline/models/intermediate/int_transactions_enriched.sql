@@ -1,9 +1,18 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    unique_key=['source_table', 'transaction_id'],
+    incremental_strategy=backfill_incremental_strategy('merge'),
+    pre_hook="{{ backfill_clear_chunk('transaction_completed_at') }}",
+    on_schema_change='append_new_columns'
+) }}
+
+{%- set moved = '(prev.account_id <> t.account_id OR DATE(prev.transaction_completed_at) <> DATE(t.transaction_completed_at))' %}
 
 WITH
 -- Import CTEs
 transactions AS (
     SELECT * FROM {{ ref('int_unified_transactions') }}
+    WHERE {{ incremental_watermark_filter('transaction_completed_at') }}
 ),
 
 time_dimension AS (
@@ -55,11 +64,30 @@ enriched AS (
             WHEN t.transaction_amount < 10000 THEN 'medium' 
             WHEN t.transaction_amount < 100000 THEN 'large'
             ELSE 'enterprise'
-        END AS transaction_size_category
+        END AS transaction_size_category,
+        
+        -- 7. METADATA
+        CURRENT_TIMESTAMP() AS _loaded_at,
+        -- Account and completion time of the row this merge replaces, only
+        -- when the transaction moved to another account or day (not on every
+        -- lookback re-merge), so the downstream models also recompute the
+        -- account-day and account-month it left
+        {% if is_incremental() -%}
+        CASE WHEN {{ moved }} THEN prev.account_id END AS _previous_account_id,
+        CASE WHEN {{ moved }} THEN prev.transaction_completed_at END AS _previous_completed_at
+        {%- else -%}
+        CAST(NULL AS BIGINT) AS _previous_account_id,
+        CAST(NULL AS TIMESTAMP) AS _previous_completed_at
+        {%- endif %}
 
     FROM transactions t
     LEFT JOIN time_dimension td 
         ON DATE(t.transaction_completed_at) = td.utc_date  
+    {% if is_incremental() %}
+    LEFT JOIN {{ this }} prev
+        ON t.source_table = prev.source_table
+        AND t.transaction_id = prev.transaction_id
+    {% endif %}
     
     WHERE t.transaction_completed_at IS NOT NULL  -- Solo transacciones con fecha
 )
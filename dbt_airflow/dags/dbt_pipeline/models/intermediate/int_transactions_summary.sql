@@ -1,45 +1,62 @@
 {{ config(materialized='table') }}
 
+-- Rolled up from the daily partials of int_account_daily_activity
+WITH monthly_activity AS (
+    SELECT
+        account_id,
+        month_date,
+        SUM(CASE WHEN transaction_direction = 'in' THEN total_amount END) AS inbound_volume,
+        SUM(CASE WHEN transaction_direction = 'out' THEN total_amount END) AS outbound_volume,
+        SUM(net_amount) AS net_flow,
+        SUM(transaction_count) AS total_transactions,
+        SUM(CASE WHEN transaction_direction = 'in' THEN transaction_count END) AS inbound_transactions,
+        SUM(CASE WHEN transaction_direction = 'out' THEN transaction_count END) AS outbound_transactions,
+        SUM(CASE WHEN transaction_channel = 'PIX' THEN net_amount END) AS pix_net_flow,
+        SUM(CASE WHEN transaction_channel = 'TRANSFER' THEN net_amount END) AS transfer_net_flow,
+        SUM(CASE WHEN transaction_channel = 'PIX' THEN transaction_count END) AS pix_transactions,
+        SUM(CASE WHEN transaction_channel = 'TRANSFER' THEN transaction_count END) AS transfer_transactions,
+        SUM(micro_transactions) AS micro_transactions,
+        SUM(small_transactions) AS small_transactions,
+        SUM(medium_transactions) AS medium_transactions,
+        SUM(large_transactions) AS large_transactions
+    FROM {{ ref('int_account_daily_activity') }}
+    GROUP BY account_id, month_date
+)
+
 SELECT
     spine.account_id,
     spine.month_date,
     spine.year,
     spine.month,
-    
+
     -- Volume metrics
-    COALESCE(SUM(CASE WHEN t.transaction_direction = 'TRANSFER_IN' THEN t.transaction_amount END), 0) AS inbound_volume,
-    COALESCE(SUM(CASE WHEN t.transaction_direction = 'TRANSFER_out' THEN t.transaction_amount END), 0) AS outbound_volume,
-    COALESCE(SUM(t.signed_amount), 0) AS net_flow,
-    
+    COALESCE(t.inbound_volume, 0) AS inbound_volume,
+    COALESCE(t.outbound_volume, 0) AS outbound_volume,
+    COALESCE(t.net_flow, 0) AS net_flow,
+
     -- Transaction counts
-    COUNT(t.transaction_id) AS total_transactions,
-    COUNT(CASE WHEN t.transaction_direction = 'TRANSFER_IN' THEN 1 END) AS inbound_transactions,
-    COUNT(CASE WHEN t.transaction_direction = 'TRANSFER_out' THEN 1 END) AS outbound_transactions,
-    
+    COALESCE(t.total_transactions, 0) AS total_transactions,
+    COALESCE(t.inbound_transactions, 0) AS inbound_transactions,
+    COALESCE(t.outbound_transactions, 0) AS outbound_transactions,
+
     -- Channel breakdown
-    COALESCE(SUM(CASE WHEN t.transaction_channel = 'PIX' THEN t.signed_amount END), 0) AS pix_net_flow,
-    COALESCE(SUM(CASE WHEN t.transaction_channel = 'TRANSFER' THEN t.signed_amount END), 0) AS transfer_net_flow,
-    
-    COUNT(CASE WHEN t.transaction_channel = 'PIX' THEN 1 END) AS pix_transactions,
-    COUNT(CASE WHEN t.transaction_channel = 'TRANSFER' THEN 1 END) AS transfer_transactions,
-    
+    COALESCE(t.pix_net_flow, 0) AS pix_net_flow,
+    COALESCE(t.transfer_net_flow, 0) AS transfer_net_flow,
+
+    COALESCE(t.pix_transactions, 0) AS pix_transactions,
+    COALESCE(t.transfer_transactions, 0) AS transfer_transactions,
+
     -- Size category analysis
-    COUNT(CASE WHEN t.transaction_size_category = 'micro' THEN 1 END) AS micro_transactions,
-    COUNT(CASE WHEN t.transaction_size_category = 'small' THEN 1 END) AS small_transactions,
-    COUNT(CASE WHEN t.transaction_size_category = 'medium' THEN 1 END) AS medium_transactions,
-    COUNT(CASE WHEN t.transaction_size_category = 'large' THEN 1 END) AS large_transactions,
-    
+    COALESCE(t.micro_transactions, 0) AS micro_transactions,
+    COALESCE(t.small_transactions, 0) AS small_transactions,
+    COALESCE(t.medium_transactions, 0) AS medium_transactions,
+    COALESCE(t.large_transactions, 0) AS large_transactions,
+
     -- Average transaction values
-    AVG(CASE WHEN t.transaction_direction = 'TRANSFER_IN' THEN t.transaction_amount END) AS avg_inbound_amount,
-    AVG(CASE WHEN t.transaction_direction = 'TRANSFER_out' THEN t.transaction_amount END) AS avg_outbound_amount
+    t.inbound_volume / NULLIF(t.inbound_transactions, 0) AS avg_inbound_amount,
+    t.outbound_volume / NULLIF(t.outbound_transactions, 0) AS avg_outbound_amount
 
 FROM {{ ref('int_account_monthly_spine') }} spine
-LEFT JOIN {{ ref('int_transactions_enriched') }} t 
-    ON spine.account_id = t.account_id 
-    AND spine.month_date = t.completed_month_date
-
-GROUP BY 
-    spine.account_id, 
-    spine.month_date, 
-    spine.year, 
-    spine.month
\ No newline at end of file
+LEFT JOIN monthly_activity t
+    ON spine.account_id = t.account_id
+    AND spine.month_date = t.month_date
@@ -1,5 +1,14 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    unique_key=['source_table', 'transaction_id'],
+    incremental_strategy=backfill_incremental_strategy('merge'),
+    pre_hook="{{ backfill_clear_chunk('transaction_completed_at') }}",
+    on_schema_change='append_new_columns'
+) }}
 
+-- Transaction ids are only unique within their source table, so rows are
+-- merged on (source_table, transaction_id): a PIX movement and a transfer
+-- sharing an id are two transactions, not an update of one another
 WITH pix_transactions AS (
     SELECT 
         transaction_id,
@@ -16,6 +25,7 @@ WITH pix_transactions AS (
         END AS transaction_type,
         source_table
     FROM {{ ref('stg_pix_movements') }}
+    WHERE {{ incremental_watermark_filter('transaction_completed_at', partition_column='completed_date') }}
 ),
 
 transfer_transactions AS (
@@ -34,6 +44,7 @@ transfer_transactions AS (
         END AS transaction_type,
         source_table
     FROM {{ ref('stg_transfer_ins') }}
+    WHERE {{ incremental_watermark_filter('transaction_completed_at', partition_column='completed_date') }}
     
     UNION ALL
     
@@ -52,6 +63,7 @@ transfer_transactions AS (
         END AS transaction_type,
         source_table
     FROM {{ ref('stg_transfer_outs') }}
+    WHERE {{ incremental_watermark_filter('transaction_completed_at', partition_column='completed_date') }}
 )
 
 SELECT * FROM pix_transactions
@@ -1,6 +1,6 @@
 {{ config(
     materialized='table',
-    cluster_by=['account_id'],
+    cluster_by=physical_design_cluster_by(),
     tags=['marts', 'dimension', 'account']
 ) }}
 
@@ -8,16 +8,16 @@ WITH accounts AS (
     SELECT * FROM {{ ref('stg_accounts') }}
 ),
 
--- Get account activity summary
+-- Get account activity summary, rolled up from the daily partials
 account_activity AS (
     SELECT 
         account_id,
-        MIN(transaction_completed_at) AS first_transaction_date,
-        MAX(transaction_completed_at) AS last_transaction_date,
-        COUNT(*) AS total_lifetime_transactions,
-        SUM(transaction_amount) AS total_lifetime_volume,
-        COUNT(DISTINCT DATE(transaction_completed_at)) AS active_days
-    FROM {{ ref('int_transactions_enriched') }}
+        MIN(first_transaction_at) AS first_transaction_date,
+        MAX(last_transaction_at) AS last_transaction_date,
+        SUM(transaction_count) AS total_lifetime_transactions,
+        SUM(total_amount) AS total_lifetime_volume,
+        COUNT(DISTINCT completed_date) AS active_days
+    FROM {{ ref('int_account_daily_activity') }}
     GROUP BY account_id
 ),
 
@@ -1,6 +1,6 @@
 {{ config(
-    materialized='table',
-    cluster_by=['customer_id'],
+    materialized='fingerprinted_table',
+    cluster_by=physical_design_cluster_by(),
     tags=['marts', 'dimension', 'customer']
 ) }}
 
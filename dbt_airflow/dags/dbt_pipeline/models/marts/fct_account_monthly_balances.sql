@@ -1,11 +1,26 @@
 {{ config(
-    materialized='table',
-    cluster_by=['account_id', 'month_date'],
+    materialized='incremental',
+    unique_key='account_id',
+    incremental_strategy=backfill_incremental_strategy('delete+insert'),
+    pre_hook="{{ backfill_clear_chunk('month_date') }}",
+    cluster_by=physical_design_cluster_by(),
     tags=['marts', 'fact', 'balances']
 ) }}
 
+-- Incremental runs replace all months of the accounts recomputed upstream
+-- since the last build (delete+insert on account_id), so months removed from
+-- int_monthly_transaction_summary are removed here too.
+
 WITH monthly_summary AS (
     SELECT * FROM {{ ref('int_monthly_transaction_summary') }}
+    WHERE {{ backfill_window_filter('month_date') }}
+    {% if is_incremental() %}
+      AND account_id IN (
+          SELECT account_id
+          FROM {{ ref('int_monthly_transaction_summary') }}
+          WHERE {{ loaded_since_last_build('_loaded_at') }}
+      )
+    {% endif %}
 ),
 
 final AS (
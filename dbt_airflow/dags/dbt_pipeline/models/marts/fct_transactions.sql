@@ -1,11 +1,16 @@
 {{ config(
-    materialized='table',
-    cluster_by=['account_id', 'completed_date'],
-    tags=['marts', 'fact', 'transactions']
+    materialized='incremental',
+    unique_key=['source_table', 'transaction_id'],
+    incremental_strategy=backfill_incremental_strategy('merge'),
+    pre_hook="{{ backfill_clear_chunk('transaction_completed_at') }}",
+    on_schema_change='append_new_columns',
+    cluster_by=physical_design_cluster_by(),
+    tags=['marts', 'fact', 'transactions', 'high_volume']
 ) }}
 
 WITH enriched_transactions AS (
     SELECT * FROM {{ ref('int_transactions_enriched') }}
+    WHERE {{ incremental_watermark_filter('transaction_completed_at') }}
 ),
 
 final AS (
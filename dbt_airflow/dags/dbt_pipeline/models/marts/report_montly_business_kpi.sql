@@ -1,6 +1,6 @@
 {{ config(
     materialized='table',
-    cluster_by=['report_month'],
+    cluster_by=physical_design_cluster_by(),
     tags=['marts', 'reporting', 'kpi']
 ) }}
 
@@ -8,14 +8,6 @@ WITH monthly_balances AS (
     SELECT * FROM {{ ref('fct_account_monthly_balances') }}
 ),
 
-transactions AS (
-    SELECT * FROM {{ ref('fct_transactions') }}
-),
-
-accounts AS (
-    SELECT * FROM {{ ref('dim_account') }}
-),
-
 -- Monthly aggregations
 monthly_kpis AS (
     SELECT
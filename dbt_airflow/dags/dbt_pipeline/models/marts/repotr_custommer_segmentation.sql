@@ -1,6 +1,6 @@
 {{ config(
     materialized='table',
-    cluster_by=['customer_segment'],
+    cluster_by=physical_design_cluster_by(),
     tags=['marts', 'reporting', 'segmentation']
 ) }}
 
@@ -1,4 +1,4 @@
-{{ config(materialized='table') }}
+{{ config(materialized='fingerprinted_table') }}
 
 SELECT 
     c.city_id AS location_id,
@@ -1,6 +1,6 @@
 {{ config(
-    materialized='table',
-    cluster_by=['utc_date'],
+    materialized='fingerprinted_table',
+    cluster_by=physical_design_cluster_by(),
     tags=['base', 'dimension', 'time']
 ) }}
 
@@ -1,14 +1,21 @@
-{{ config(materialized='view') }}
+{{ config(
+    materialized=staging_materialization(),
+    unique_key='transaction_id',
+    incremental_strategy='merge',
+    on_schema_change='append_new_columns',
+    pre_hook="{{ delete_overwritten_landed_rows(source('nu_sources', 'pix_movements')) }}"
+) }}
 
 SELECT
     -- Standardized column names and types
     id AS transaction_id,
     account_id,
     pix_amount AS transaction_amount, 
-    TO_TIMESTAMP(pix_requested_at) AS transaction_requested_at,
-    TO_TIMESTAMP(pix_completed_at) AS transaction_completed_at,
-    EXTRACT(YEAR FROM TO_TIMESTAMP(pix_completed_at)) AS completed_year,
-    EXTRACT(MONTH FROM TO_TIMESTAMP(pix_completed_at)) AS completed_month,
+    {{ landing_timestamp('pix_requested_at') }} AS transaction_requested_at,
+    {{ landing_timestamp('pix_completed_at') }} AS transaction_completed_at,
+    EXTRACT(YEAR FROM {{ landing_timestamp('pix_completed_at') }}) AS completed_year,
+    EXTRACT(MONTH FROM {{ landing_timestamp('pix_completed_at') }}) AS completed_month,
+    {{ landing_completed_date('pix_completed_at') }} AS completed_date,  -- Partition column (Parquet landing)
     status,
     in_or_out AS transaction_type,  -- pix_in and pix_out as a transaction types
     LOWER(TRIM(status)) AS transaction_status,
@@ -22,8 +29,14 @@ SELECT
     
     -- Add metadata
     'pix_movements' AS source_table,
-    CURRENT_TIMESTAMP() AS _loaded_at
+    CURRENT_TIMESTAMP() AS _loaded_at,
+    {{ landing_file_name() }} AS _source_file,
+    {{ landing_file_row_number() }} AS _source_row_number,
+    {{ landing_file_modified_at() }} AS _source_file_modified_at
 
 FROM {{ source('nu_sources', 'pix_movements') }}
+{{ landed_files_join(source('nu_sources', 'pix_movements')) }}
 -- Filter out deleted/invalid records
-WHERE status = 'completed'
\ No newline at end of file
+WHERE status = 'completed'
+  AND {{ new_landed_rows_filter() }}
+{{ dedupe_landed_rows('id') }}
@@ -1,4 +1,10 @@
-{{ config(materialized='view') }}
+{{ config(
+    materialized=staging_materialization(),
+    unique_key='transaction_id',
+    incremental_strategy='merge',
+    on_schema_change='append_new_columns',
+    pre_hook="{{ delete_overwritten_landed_rows(source('nu_sources', 'transfer_outs')) }}"
+) }}
 
 SELECT 
     id AS transaction_id,
@@ -6,16 +12,23 @@ SELECT
     amount AS transaction_amount,
     
     -- Handle string timestamps
-    TO_TIMESTAMP(transaction_requested_at) AS transaction_requested_at, 
-    TO_TIMESTAMP(CAST(transaction_completed_at AS BIGINT)) AS transaction_completed_at,
-    EXTRACT(YEAR FROM TO_TIMESTAMP(CAST(transaction_completed_at AS BIGINT))) AS completed_year,
-    EXTRACT(MONTH FROM TO_TIMESTAMP(CAST(transaction_completed_at AS BIGINT))) AS completed_month,
+    {{ landing_timestamp('transaction_requested_at') }} AS transaction_requested_at, 
+    {{ landing_timestamp('transaction_completed_at', epoch_text=true) }} AS transaction_completed_at,
+    EXTRACT(YEAR FROM {{ landing_timestamp('transaction_completed_at', epoch_text=true) }}) AS completed_year,
+    EXTRACT(MONTH FROM {{ landing_timestamp('transaction_completed_at', epoch_text=true) }}) AS completed_month,
+    {{ landing_completed_date('transaction_completed_at', epoch_text=true) }} AS completed_date,  -- Partition column (Parquet landing)
     
     LOWER(TRIM(status)) AS transaction_status,
     'out' AS transaction_direction,
     
     'transfer_outs' AS source_table,
-    CURRENT_TIMESTAMP() AS _loaded_at
+    CURRENT_TIMESTAMP() AS _loaded_at,
+    {{ landing_file_name() }} AS _source_file,
+    {{ landing_file_row_number() }} AS _source_row_number,
+    {{ landing_file_modified_at() }} AS _source_file_modified_at
 
 FROM {{ source('nu_sources', 'transfer_outs') }}
+{{ landed_files_join(source('nu_sources', 'transfer_outs')) }}
 WHERE status = 'completed'
+  AND {{ new_landed_rows_filter() }}
+{{ dedupe_landed_rows('id') }}
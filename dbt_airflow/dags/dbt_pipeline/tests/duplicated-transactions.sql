@@ -1,9 +1,14 @@
+-- Duplicates can only be introduced by the merges of the current window
+-- (see macros/test_window.sql); full-history audits check every row.
+-- Ids are unique per source table (the merge key of the transaction models)
 WITH transaction_counts AS (
     SELECT 
+        source_table,
         transaction_id,
         COUNT(*) as occurrence_count
     FROM {{ ref('int_unified_transactions') }}
-    GROUP BY transaction_id
+    WHERE {{ test_window_filter('transaction_completed_at', ref('int_unified_transactions')) }}
+    GROUP BY source_table, transaction_id
     HAVING COUNT(*) > 1
 )
 
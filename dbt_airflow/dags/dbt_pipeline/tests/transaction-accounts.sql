@@ -1,13 +1,10 @@
+-- One scan of the unified transactions (instead of the three staging views
+-- over the raw files), limited to the current window outside full audits
 SELECT 
     t.account_id,
     COUNT(*) as orphaned_transactions
-FROM (
-    SELECT account_id FROM {{ ref('stg_pix_movements') }}
-    UNION ALL
-    SELECT account_id FROM {{ ref('stg_transfer_ins') }}
-    UNION ALL  
-    SELECT account_id FROM {{ ref('stg_transfer_outs') }}
-) t
+FROM {{ ref('int_unified_transactions') }} t
 LEFT JOIN {{ ref('stg_accounts') }} a ON t.account_id = a.account_id
 WHERE a.account_id IS NULL
+  AND {{ test_window_filter('t.transaction_completed_at', ref('int_unified_transactions')) }}
 GROUP BY t.account_id
\ No newline at end of file
@@ -0,0 +1,269 @@
+"""
+Purpose: Month chunks and checkpoints of the chunked historical backfill (`nu_backfill` DAG).
+
+A backfill rebuilds the transaction and account-month models over a range of
+months into a separate backfill schema, one month chunk per dbt invocation
+(several in parallel). Once every chunk is done, `promote_backfill` replaces
+the backfilled months of the production tables with the backfill tables, in
+a single transaction; rows outside the range are left untouched. Finished
+chunks are checkpointed per phase, so a failed backfill resumed with the same
+range only runs the chunks still missing.
+
+`plan_backfill` splits the range and reads the checkpoints;
+`VariableCheckpointStore` keeps them in Airflow Variables, one per chunk, so
+chunks finishing at the same time never overwrite each other's checkpoint.
+The recorded range also marks a backfill in progress, during which the
+pipeline must not merge into the backfilled tables.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence
+
+logger = logging.getLogger(__name__)
+
+Chunk = Dict[str, str]
+
+
+def month_chunks(start_month: str, end_month: str) -> List[Chunk]:
+    """
+    Splits an inclusive range of months into one [start, end) window per month.
+
+    Args:
+        start_month (str): First month, `YYYY-MM`.
+        end_month (str): Last month, `YYYY-MM`.
+
+    Returns:
+        list: Dicts with `chunk` (`YYYY-MM`), `start` and `end` (ISO dates).
+
+    Raises:
+        ValueError: If a month is malformed or the range is empty.
+    """
+    first = date.fromisoformat(f"{start_month}-01")
+    last = date.fromisoformat(f"{end_month}-01")
+    if last < first:
+        raise ValueError(f"Backfill range {start_month}..{end_month} is empty.")
+
+    chunks = []
+    current = first
+    while current <= last:
+        following = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+        chunks.append({
+            "chunk": current.strftime("%Y-%m"),
+            "start": current.isoformat(),
+            "end": following.isoformat(),
+        })
+        current = following
+    return chunks
+
+
+class CheckpointStore(Protocol):
+    """Remembers the range of the current backfill and its finished chunks per phase."""
+
+    def load_range(self) -> Optional[str]:
+        ...
+
+    def start(self, backfill_range: str, phases: Iterable[str]) -> None:
+        """Forgets the checkpoints of the previous backfill and records the new range."""
+        ...
+
+    def is_done(self, phase: str, chunk: str) -> bool:
+        ...
+
+    def mark_done(self, phase: str, chunk: str) -> None:
+        ...
+
+
+def backfill_range(start_month: str, end_month: str) -> str:
+    return f"{start_month}..{end_month}"
+
+
+def plan_backfill(
+    start_month: str,
+    end_month: str,
+    phases: Iterable[str],
+    store: CheckpointStore,
+    restart: bool = False,
+) -> Dict[str, object]:
+    """
+    Splits the range into month chunks and drops those already checkpointed.
+
+    Checkpoints only count for the same range; a new range, or `restart`,
+    starts a fresh backfill (the backfill tables must then be recreated).
+
+    Returns:
+        dict: `fresh` (bool) and, per phase, the chunks still to run.
+    """
+    phases = list(phases)
+    chunks = month_chunks(start_month, end_month)
+    requested = backfill_range(start_month, end_month)
+
+    fresh = restart or store.load_range() != requested
+    if fresh:
+        store.start(requested, phases)
+
+    plan: Dict[str, object] = {"fresh": fresh}
+    for phase in phases:
+        plan[phase] = [chunk for chunk in chunks if not store.is_done(phase, chunk["chunk"])]
+        logger.info(f"Backfill {requested}, phase '{phase}': {len(plan[phase])} of {len(chunks)} chunks to run.")
+    return plan
+
+
+class VariableCheckpointStore:
+    """Keeps the backfill range and one checkpoint per finished chunk in Airflow Variables."""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+
+    @property
+    def range_key(self) -> str:
+        return f"{self.prefix}_range"
+
+    def chunk_key(self, phase: str, chunk: str) -> str:
+        return f"{self.prefix}_{phase}_{chunk}"
+
+    def load_range(self) -> Optional[str]:
+        from airflow.models import Variable
+
+        return Variable.get(self.range_key, default_var=None)
+
+    def start(self, backfill_range: str, phases: Iterable[str]) -> None:
+        from airflow.models import Variable
+
+        self.clear(phases)
+        Variable.set(self.range_key, backfill_range)
+
+    def clear(self, phases: Iterable[str]) -> None:
+        """Deletes the range and chunk checkpoints of the recorded backfill."""
+        from airflow.models import Variable
+
+        previous = self.load_range()
+        if not previous:
+            return
+        start_month, end_month = previous.split("..")
+        for phase in phases:
+            for chunk in month_chunks(start_month, end_month):
+                Variable.delete(self.chunk_key(phase, chunk["chunk"]))
+        Variable.delete(self.range_key)
+
+    def is_done(self, phase: str, chunk: str) -> bool:
+        from airflow.models import Variable
+
+        return Variable.get(self.chunk_key(phase, chunk), default_var=None) is not None
+
+    def mark_done(self, phase: str, chunk: str) -> None:
+        from airflow.models import Variable
+
+        Variable.set(self.chunk_key(phase, chunk), "done")
+
+
+@dataclass
+class BackfillTable:
+    """A backfilled model: its production and backfill tables and the column its chunks are windowed on."""
+
+    production: str
+    backfill: str
+    window_column: str
+
+
+class BackfillWarehouse(Protocol):
+    """Reads table columns and runs statements, optionally in one transaction."""
+
+    def columns(self, table: str) -> Optional[Dict[str, str]]:
+        """Returns {column: type} in table order, or None if the table does not exist."""
+        ...
+
+    def run(self, statements: List[str], transaction: bool = False) -> None:
+        ...
+
+
+class SnowflakeBackfillWarehouse:
+    """`BackfillWarehouse` over the Airflow Snowflake connection."""
+
+    def __init__(self, snowflake_conn_id: str):
+        self.snowflake_conn_id = snowflake_conn_id
+
+    def _hook(self):
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+
+        return SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id)
+
+    def columns(self, table: str) -> Optional[Dict[str, str]]:
+        database, schema, name = table.split(".")
+        hook = self._hook()
+        exists = hook.get_first(
+            f"SELECT COUNT(*) FROM {database}.INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+            parameters=[schema.upper(), name.upper()],
+        )[0]
+        if not exists:
+            return None
+        return {row[0]: row[1] for row in hook.get_records(f"DESCRIBE TABLE {table}")}
+
+    def run(self, statements: List[str], transaction: bool = False) -> None:
+        # Without autocommit the hook commits once, after the last statement
+        self._hook().run(statements, autocommit=not transaction)
+
+
+def promote_backfill(
+    warehouse: BackfillWarehouse,
+    tables: Sequence[BackfillTable],
+    start: str,
+    end: str,
+) -> Dict[str, str]:
+    """
+    Replaces the [start, end) window of each production table with the rows of its backfill table.
+
+    Every backfill table is checked before anything changes. Columns added by
+    the backfill are first added to production (the rows outside the window
+    keep NULL in them); then all windows are deleted and reinserted in one
+    transaction, so readers never see a half-promoted backfill. A production
+    table that does not exist yet is replaced by renaming its backfill table.
+
+    Args:
+        warehouse (BackfillWarehouse): Warehouse holding both tables.
+        tables (list): The backfilled tables.
+        start (str): First day of the backfilled range (ISO date).
+        end (str): Day after the backfilled range (ISO date).
+
+    Returns:
+        dict: {production table: 'replaced' or 'created'}.
+
+    Raises:
+        ValueError: If a backfill table does not exist.
+    """
+    backfill_columns = {}
+    for table in tables:
+        columns = warehouse.columns(table.backfill)
+        if columns is None:
+            raise ValueError(f"Backfill table {table.backfill} does not exist.")
+        backfill_columns[table.production] = columns
+
+    outcome: Dict[str, str] = {}
+    statements: List[str] = []
+    for table in tables:
+        columns = backfill_columns[table.production]
+        production_columns = warehouse.columns(table.production)
+        if production_columns is None:
+            warehouse.run([f"ALTER TABLE {table.backfill} RENAME TO {table.production}"])
+            outcome[table.production] = "created"
+            continue
+
+        existing = {name.upper() for name in production_columns}
+        added = [name for name in columns if name.upper() not in existing]
+        if added:
+            warehouse.run([f"ALTER TABLE {table.production} ADD COLUMN {name} {columns[name]}" for name in added])
+            logger.info(f"Added columns {added} to {table.production}.")
+
+        column_list = ", ".join(columns)
+        statements += [
+            f"DELETE FROM {table.production} "
+            f"WHERE {table.window_column} >= '{start}'::TIMESTAMP AND {table.window_column} < '{end}'::TIMESTAMP",
+            f"INSERT INTO {table.production} ({column_list}) SELECT {column_list} FROM {table.backfill}",
+        ]
+        outcome[table.production] = "replaced"
+
+    if statements:
+        warehouse.run(statements, transaction=True)
+    logger.info(f"Promoted the backfill of [{start}, {end}): {outcome}")
+    return outcome
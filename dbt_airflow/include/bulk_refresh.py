@@ -0,0 +1,168 @@
+"""
+Purpose: Bulk refresh of a tier's external tables as async queries over one Snowflake session.
+
+One `refresh_<table>` task per table costs a worker slot, a process and a new
+Snowflake login for a single `ALTER EXTERNAL TABLE ... REFRESH`.
+`SnowflakeBulkRefreshOperator` instead opens one connection and submits the
+refreshes of a tier as asynchronous queries (`execute_async`), keeping at most
+`max_concurrency` in flight. It polls them to completion and retries failed or
+timed-out tables on their own. The per-table status, attempts and timings are
+returned as the task's XCom, so mapped tasks can show one status per table.
+
+The scheduling (`run_bulk_refresh`) only talks to an `AsyncQueryClient` and
+takes its clock and sleep as arguments, so it can be tested with a fake client
+(`SnowflakeAsyncQueryClient` is the production implementation). This module
+does not import Airflow; the operator lives in `include.bulk_refresh_operator`.
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryPoll:
+    """State of an async query: `done`, and the error message if it failed."""
+
+    done: bool
+    error: Optional[str] = None
+
+
+class AsyncQueryClient(Protocol):
+    """Submits queries without waiting for them and polls their state."""
+
+    def submit(self, sql: str) -> str:
+        """Starts `sql` and returns its query id."""
+        ...
+
+    def poll(self, query_id: str) -> QueryPoll:
+        ...
+
+    def cancel(self, query_id: str) -> None:
+        ...
+
+
+class SnowflakeAsyncQueryClient:
+    """Async queries over one open Snowflake connector connection."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def submit(self, sql: str) -> str:
+        # The query keeps running server side once its cursor is closed
+        with self.connection.cursor() as cursor:
+            cursor.execute_async(sql)
+            return cursor.sfqid
+
+    def poll(self, query_id: str) -> QueryPoll:
+        status = self.connection.get_query_status(query_id)
+        if self.connection.is_still_running(status):
+            return QueryPoll(done=False)
+        if self.connection.is_an_error(status):
+            try:
+                self.connection.get_query_status_throw_if_error(query_id)
+            except Exception as e:
+                return QueryPoll(done=True, error=str(e))
+            return QueryPoll(done=True, error=status.name)
+        return QueryPoll(done=True)
+
+    def cancel(self, query_id: str) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT SYSTEM$CANCEL_QUERY(%s)", (query_id,))
+
+
+@dataclass
+class RefreshResult:
+    """Outcome of one table's refresh: `success`, `failed` or `timeout` (of its last attempt)."""
+
+    table: str
+    status: str
+    attempts: int
+    elapsed_seconds: float
+    query_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+def run_bulk_refresh(
+    client: AsyncQueryClient,
+    statements: Dict[str, str],
+    max_concurrency: int = 4,
+    max_attempts: int = 3,
+    retry_delay_seconds: float = 10.0,
+    query_timeout_seconds: float = 600.0,
+    poll_interval_seconds: float = 2.0,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Dict[str, RefreshResult]:
+    """
+    Runs one statement per table as async queries, at most `max_concurrency` at a time.
+
+    A table whose query fails, or runs longer than `query_timeout_seconds`
+    (it is then cancelled), is resubmitted after `retry_delay_seconds` until
+    it has run `max_attempts` times. Tables are submitted in the order of
+    `statements`.
+
+    Args:
+        client (AsyncQueryClient): Client running the queries.
+        statements (dict): {table: SQL statement}.
+
+    Returns:
+        dict: {table: RefreshResult}, where `elapsed_seconds` spans from the
+        first submission to the end of the last attempt.
+    """
+    pending = deque((table, 0.0) for table in statements)  # (table, not before)
+    running: Dict[str, Dict[str, Any]] = {}
+    attempts = {table: 0 for table in statements}
+    first_started: Dict[str, float] = {}
+    results: Dict[str, RefreshResult] = {}
+
+    while pending or running:
+        now = clock()
+        # Fill the free slots with the tables whose retry delay has passed
+        for _ in range(len(pending)):
+            if len(running) >= max_concurrency:
+                break
+            table, not_before = pending.popleft()
+            if not_before > now:
+                pending.append((table, not_before))
+                continue
+            attempts[table] += 1
+            first_started.setdefault(table, now)
+            running[table] = {"query_id": client.submit(statements[table]), "started": now}
+            logger.info(f"Submitted refresh of '{table}' (attempt {attempts[table]}): {running[table]['query_id']}")
+
+        for table, query in list(running.items()):
+            poll = client.poll(query["query_id"])
+            now = clock()
+            if poll.done and poll.error is None:
+                status, error = "success", None
+            elif poll.done:
+                status, error = "failed", poll.error
+            elif now - query["started"] > query_timeout_seconds:
+                client.cancel(query["query_id"])
+                status, error = "timeout", f"Still running after {query_timeout_seconds:.0f}s; cancelled."
+            else:
+                continue
+
+            del running[table]
+            if status != "success" and attempts[table] < max_attempts:
+                logger.warning(f"Refresh of '{table}' {status} (attempt {attempts[table]}): {error}; retrying.")
+                pending.append((table, now + retry_delay_seconds))
+                continue
+            results[table] = RefreshResult(
+                table=table,
+                status=status,
+                attempts=attempts[table],
+                elapsed_seconds=round(now - first_started[table], 3),
+                query_id=query["query_id"],
+                error=error,
+            )
+
+        if pending or running:
+            sleep(poll_interval_seconds)
+
+    return {table: results[table] for table in statements}
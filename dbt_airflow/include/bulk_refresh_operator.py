@@ -0,0 +1,107 @@
+"""
+Purpose: Airflow operator running the bulk refresh of a tier's external tables.
+
+`SnowflakeBulkRefreshOperator` opens one Snowflake connection and hands the
+tier's `ALTER EXTERNAL TABLE ... REFRESH` statements to `run_bulk_refresh`
+(`include.bulk_refresh`, which holds the Airflow-free scheduling).
+"""
+
+from dataclasses import asdict
+from typing import Callable, List, Optional
+
+from airflow.exceptions import AirflowSkipException
+from airflow.models import BaseOperator
+
+from include.bulk_refresh import AsyncQueryClient, SnowflakeAsyncQueryClient, run_bulk_refresh
+
+
+class SnowflakeBulkRefreshOperator(BaseOperator):
+    """
+    Refreshes a set of external tables as async queries over a single Snowflake connection.
+
+    The task succeeds once every refresh has finished, whatever its outcome,
+    and returns one `RefreshResult` dict per table (in `tables` order); the
+    per-table outcome is surfaced by downstream (mapped) tasks.
+
+    Args:
+        tables (list): External tables to refresh (templated). No tables skips the task.
+        snowflake_conn_id (str): Airflow Snowflake connection.
+        database (str): Database of the external tables.
+        schema (str): Schema of the external tables.
+        max_concurrency (int): Refreshes in flight at the same time.
+        max_attempts (int): Runs of a table's refresh before it is reported as failed.
+        retry_delay_seconds (float): Wait before resubmitting a failed refresh.
+        query_timeout_seconds (float): Max duration of one attempt before it is cancelled.
+        poll_interval_seconds (float): Wait between polls of the running queries.
+        client_factory (callable): Returns an `AsyncQueryClient`; defaults to a
+            `SnowflakeAsyncQueryClient` over a connection of `snowflake_conn_id`.
+    """
+
+    template_fields = ("tables",)
+
+    def __init__(
+        self,
+        *,
+        tables: List[str],
+        snowflake_conn_id: str,
+        database: str,
+        schema: str,
+        max_concurrency: int = 4,
+        max_attempts: int = 3,
+        retry_delay_seconds: float = 10.0,
+        query_timeout_seconds: float = 600.0,
+        poll_interval_seconds: float = 2.0,
+        client_factory: Optional[Callable[[], AsyncQueryClient]] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.tables = tables
+        self.snowflake_conn_id = snowflake_conn_id
+        self.database = database
+        self.schema = schema
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self.query_timeout_seconds = query_timeout_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.client_factory = client_factory
+
+    def execute(self, context):
+        if not self.tables:
+            raise AirflowSkipException("No external table to refresh.")
+        for table in self.tables:
+            if not table.replace("_", "").isalnum():
+                raise ValueError(f"Invalid table name '{table}'. Only alphanumeric and underscores are allowed.")
+
+        connection = None
+        if self.client_factory:
+            client = self.client_factory()
+        else:
+            from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+
+            connection = SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id).get_conn()
+            client = SnowflakeAsyncQueryClient(connection)
+
+        try:
+            results = run_bulk_refresh(
+                client,
+                {
+                    table: f"ALTER EXTERNAL TABLE {self.database}.{self.schema}.{table} REFRESH"
+                    for table in self.tables
+                },
+                max_concurrency=self.max_concurrency,
+                max_attempts=self.max_attempts,
+                retry_delay_seconds=self.retry_delay_seconds,
+                query_timeout_seconds=self.query_timeout_seconds,
+                poll_interval_seconds=self.poll_interval_seconds,
+            )
+        finally:
+            if connection is not None:
+                connection.close()
+
+        for result in results.values():
+            self.log.info(
+                f"'{result.table}': {result.status} after {result.attempts} attempt(s) "
+                f"in {result.elapsed_seconds:.1f}s."
+            )
+        return [asdict(result) for result in results.values()]
@@ -0,0 +1,213 @@
+"""
+Purpose: Clustering health of the tables with a declared clustering key.
+
+The physical design of the dbt models (clustering keys, search optimization,
+materialized views) is declared once, in the `physical_design` var of
+`dbt_project.yml`, and enforced after each build by the `apply_physical_design`
+post-hook. This module monitors whether the clustering still pays off: after
+every pipeline run it reads `SYSTEM$CLUSTERING_INFORMATION` for each
+clustered table (average depth and overlaps, constant partitions), stores one
+row per table in the `clustering_metrics` table, and flags tables whose
+average depth grew well beyond their trailing median, i.e. whose partition
+pruning has degraded (automatic clustering suspended or falling behind, or a
+key that no longer matches the data).
+
+`ClusteringInfoProvider` abstracts the Snowflake lookup so the parsing and
+flagging can be tested without Snowflake.
+"""
+
+import json
+import logging
+import statistics
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Column order of the `clustering_metrics` table
+CLUSTERING_COLUMNS = (
+    "dag_id",
+    "run_id",
+    "collected_at",
+    "table_name",
+    "cluster_by_keys",
+    "total_partition_count",
+    "total_constant_partition_count",
+    "average_overlaps",
+    "average_depth",
+    "trailing_median_depth",
+    "is_degraded",
+)
+
+
+def clustered_tables(project_dir: str) -> Dict[str, List[str]]:
+    """
+    Returns {model name: clustering columns} of the `physical_design` var in `dbt_project.yml`.
+    """
+    with open(f"{project_dir}/dbt_project.yml") as f:
+        project = yaml.safe_load(f)
+    design = (project.get("vars") or {}).get("physical_design") or {}
+    return {name: spec["cluster_by"] for name, spec in design.items() if (spec or {}).get("cluster_by")}
+
+
+class ClusteringInfoProvider(Protocol):
+    """Returns the raw `SYSTEM$CLUSTERING_INFORMATION` JSON of a table."""
+
+    def fetch(self, table: str) -> str:
+        ...
+
+
+class SnowflakeClusteringInfoProvider:
+    """Calls `SYSTEM$CLUSTERING_INFORMATION` through the Airflow Snowflake connection."""
+
+    def __init__(self, snowflake_conn_id: str):
+        self.snowflake_conn_id = snowflake_conn_id
+
+    def fetch(self, table: str) -> str:
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+
+        hook = SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id)
+        return hook.get_first("SELECT SYSTEM$CLUSTERING_INFORMATION(%s)", parameters=[table])[0]
+
+
+def parse_clustering_information(table: str, raw: str) -> Dict[str, Any]:
+    """
+    Extracts the depth/overlap stats of one `SYSTEM$CLUSTERING_INFORMATION` result.
+
+    Returns:
+        dict: `table_name`, `cluster_by_keys`, partition counts, `average_overlaps`
+        and `average_depth`.
+    """
+    info = json.loads(raw)
+    return {
+        "table_name": table,
+        "cluster_by_keys": info.get("cluster_by_keys"),
+        "total_partition_count": info.get("total_partition_count"),
+        "total_constant_partition_count": info.get("total_constant_partition_count"),
+        "average_overlaps": info.get("average_overlaps"),
+        "average_depth": info.get("average_depth"),
+    }
+
+
+def collect_clustering_stats(
+    tables: Sequence[str],
+    provider: ClusteringInfoProvider,
+    dag_id: str,
+    run_id: str,
+    collected_at: datetime,
+) -> List[Dict[str, Any]]:
+    """
+    Reads the clustering stats of every table; tables that cannot be read (e.g. not built yet) are skipped.
+
+    Returns:
+        list: One dict per table with the `CLUSTERING_COLUMNS` keys (the
+        degradation columns are filled by `flag_degraded_clustering`).
+    """
+    rows = []
+    for table in tables:
+        try:
+            stats = parse_clustering_information(table, provider.fetch(table))
+        except Exception as e:
+            logger.warning(f"Could not read the clustering information of {table}: {e}")
+            continue
+        rows.append({
+            "dag_id": dag_id,
+            "run_id": run_id,
+            "collected_at": collected_at,
+            **stats,
+            "trailing_median_depth": None,
+            "is_degraded": False,
+        })
+    return rows
+
+
+def flag_degraded_clustering(
+    rows: List[Dict[str, Any]],
+    trailing_depths: Dict[str, List[float]],
+    factor: float = 2.0,
+    min_depth: float = 4.0,
+    min_history: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    Marks tables whose average clustering depth is more than `factor`× their trailing median.
+
+    Args:
+        rows (list): Rows from `collect_clustering_stats` (updated in place).
+        trailing_depths (dict): {table_name: [previous average depths]}.
+        factor (float): Growth of the depth that counts as degraded pruning.
+        min_depth (float): Ignore shallower tables (a few overlapping partitions prune fine).
+        min_history (int): Previous runs needed before a table can be flagged.
+
+    Returns:
+        list: The degraded rows.
+    """
+    degraded = []
+    for row in rows:
+        previous = trailing_depths.get(row["table_name"]) or []
+        if len(previous) < min_history or row["average_depth"] is None:
+            continue
+
+        median: Optional[float] = statistics.median(previous)
+        row["trailing_median_depth"] = median
+        if row["average_depth"] >= min_depth and row["average_depth"] > factor * median:
+            row["is_degraded"] = True
+            degraded.append(row)
+            logger.warning(
+                f"Clustering degraded: {row['table_name']} average depth {row['average_depth']:.1f} "
+                f"vs. trailing median {median:.1f} ({len(previous)} runs); partition pruning suffers."
+            )
+    return degraded
+
+
+class SnowflakeClusteringStore:
+    """Persists clustering stats to the `clustering_metrics` table and reads the trailing depths."""
+
+    def __init__(self, snowflake_conn_id: str, table: str):
+        self.snowflake_conn_id = snowflake_conn_id
+        self.table = table
+
+    def _hook(self):
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+
+        return SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id)
+
+    def ensure_table(self) -> None:
+        self._hook().run(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                dag_id STRING, run_id STRING, collected_at TIMESTAMP_NTZ,
+                table_name STRING, cluster_by_keys STRING,
+                total_partition_count NUMBER, total_constant_partition_count NUMBER,
+                average_overlaps FLOAT, average_depth FLOAT,
+                trailing_median_depth FLOAT, is_degraded BOOLEAN
+            )
+        """)
+
+    def trailing_depths(self, tables: Sequence[str], window: int) -> Dict[str, List[float]]:
+        """Returns the last `window` average depths per table, newest first."""
+        if not tables:
+            return {}
+        placeholders = ", ".join(["%s"] * len(tables))
+        rows = self._hook().get_records(
+            f"""
+            SELECT table_name, average_depth
+            FROM {self.table}
+            WHERE table_name IN ({placeholders})
+              AND average_depth IS NOT NULL
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY table_name ORDER BY collected_at DESC) <= {int(window)}
+            """,
+            parameters=list(tables),
+        )
+        history: Dict[str, List[float]] = {}
+        for table, depth in rows:
+            history.setdefault(table, []).append(float(depth))
+        return history
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self._hook().insert_rows(
+                self.table,
+                rows=[tuple(row[column] for column in CLUSTERING_COLUMNS) for row in rows],
+                target_fields=list(CLUSTERING_COLUMNS),
+            )
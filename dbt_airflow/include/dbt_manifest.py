@@ -0,0 +1,213 @@
+"""
+Purpose: Prebuilt dbt manifest for rendering the Cosmos `DbtTaskGroup`.
+
+Without a manifest, every scheduler parse of `dbt_dag.py` makes Cosmos run
+`dbt ls` (or parse the project itself) to build the task graph, a cost that
+grows with the number of models. Instead, the DAG renders from a cached
+`manifest.json` (`LoadMode.DBT_MANIFEST`).
+
+The cache lives in `<project>/target/cosmos_manifest/` next to a hash of every
+file of the dbt project (`project_fingerprint`). `ensure_manifest` reuses the
+manifest while the hash matches and regenerates it with `dbt parse` only when
+a file under the project changed. The Docker image (or CI) prebuilds it:
+
+    python -m include.dbt_manifest <project_dir> <dbt_executable>
+
+The DAG file never builds it: at parse time `prebuilt_manifest` only stats
+the project files and returns the manifest if none is newer than it, else
+None so the DAG falls back to Cosmos' `LoadMode.AUTOMATIC`.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_SUBDIR = os.path.join("target", "cosmos_manifest")
+MANIFEST_FILE = "manifest.json"
+FINGERPRINT_FILE = "project.sha256"
+
+# Generated or downloaded content that does not change the project graph
+EXCLUDED_DIRS = ("target", "dbt_packages", "logs", "__pycache__", ".git")
+
+# `dbt parse` needs a profile of the right adapter type but never connects
+_PARSE_PROFILE = """
+{profile}:
+  target: parse
+  outputs:
+    parse:
+      type: snowflake
+      account: parse_only
+      user: parse_only
+      password: parse_only
+      database: parse_only
+      schema: parse_only
+      warehouse: parse_only
+      threads: 1
+"""
+
+
+def manifest_dir(project_dir: str) -> str:
+    """Returns the directory holding the cached manifest of a dbt project."""
+    return os.path.join(project_dir, MANIFEST_SUBDIR)
+
+
+def _project_files(project_dir: str, excluded_dirs: Iterable[str]) -> Iterable[str]:
+    excluded = set(excluded_dirs)
+    for dirpath, dirnames, filenames in os.walk(project_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in excluded)
+        for filename in sorted(filenames):
+            yield os.path.join(dirpath, filename)
+
+
+def project_fingerprint(project_dir: str, excluded_dirs: Iterable[str] = EXCLUDED_DIRS) -> str:
+    """
+    Content hash of a dbt project.
+
+    Hashes the relative path and content of every file, skipping generated
+    folders (`target/`, `dbt_packages/`, ...), so any edit, addition, removal
+    or rename changes the fingerprint.
+
+    Args:
+        project_dir (str): Root of the dbt project.
+        excluded_dirs (Iterable[str]): Directory names ignored at any depth.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for path in _project_files(project_dir, excluded_dirs):
+        relpath = os.path.relpath(path, project_dir).replace(os.sep, "/")
+        digest.update(relpath.encode())
+        digest.update(b"\0")
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def run_dbt_parse(project_dir: str, target_dir: str, dbt_executable_path: str) -> None:
+    """
+    Writes `manifest.json` for the project into `target_dir` with `dbt deps` + `dbt parse`.
+
+    Uses a throwaway profile, so no warehouse credentials are needed.
+
+    Raises:
+        subprocess.CalledProcessError: If dbt exits with an error.
+    """
+    profile_name = "default"
+    with open(os.path.join(project_dir, "dbt_project.yml")) as f:
+        for line in f:
+            if line.startswith("profile:"):
+                profile_name = line.split(":", 1)[1].strip().strip("'\"")
+
+    with tempfile.TemporaryDirectory() as profiles_dir:
+        with open(os.path.join(profiles_dir, "profiles.yml"), "w") as f:
+            f.write(_PARSE_PROFILE.format(profile=profile_name))
+
+        common_args = ["--project-dir", project_dir, "--profiles-dir", profiles_dir]
+        if os.path.exists(os.path.join(project_dir, "packages.yml")):
+            subprocess.run([dbt_executable_path, "deps", *common_args], check=True, capture_output=True, text=True)
+        subprocess.run(
+            [dbt_executable_path, "parse", *common_args, "--target-path", target_dir],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+
+
+def ensure_manifest(
+    project_dir: str,
+    dbt_executable_path: str,
+    build: Optional[Callable[[str, str], None]] = None,
+) -> Optional[str]:
+    """
+    Returns the path of an up-to-date cached manifest, regenerating it only on change.
+
+    The manifest is rebuilt in a scratch directory and swapped in with its
+    fingerprint, so a concurrent parse never sees a half-written manifest. If
+    regeneration fails, the previous (stale) manifest is kept and returned so
+    the DAG still renders; with no manifest at all, None is returned and the
+    caller should fall back to Cosmos' default load mode.
+
+    Args:
+        project_dir (str): Root of the dbt project.
+        dbt_executable_path (str): dbt binary used to regenerate the manifest.
+        build (callable): Optional `build(project_dir, target_dir)` override
+            (e.g. a fake in tests); defaults to `run_dbt_parse`.
+
+    Returns:
+        str | None: Path of `manifest.json`, or None if none could be produced.
+    """
+    cache_dir = manifest_dir(project_dir)
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+    fingerprint_path = os.path.join(cache_dir, FINGERPRINT_FILE)
+
+    fingerprint = project_fingerprint(project_dir)
+    if os.path.exists(manifest_path) and os.path.exists(fingerprint_path):
+        with open(fingerprint_path) as f:
+            if f.read().strip() == fingerprint:
+                return manifest_path
+
+    build = build or (lambda project, target: run_dbt_parse(project, target, dbt_executable_path))
+    logger.info(f"dbt project changed (fingerprint {fingerprint[:12]}); regenerating {manifest_path}.")
+    try:
+        os.makedirs(os.path.dirname(cache_dir), exist_ok=True)
+        scratch_dir = tempfile.mkdtemp(prefix="cosmos_manifest_", dir=os.path.dirname(cache_dir))
+        try:
+            build(project_dir, scratch_dir)
+            # `dbt deps` may have rewritten the lock file; hash the project as parsed
+            with open(os.path.join(scratch_dir, FINGERPRINT_FILE), "w") as f:
+                f.write(project_fingerprint(project_dir))
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            os.replace(scratch_dir, cache_dir)
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+    except Exception as e:
+        stderr = getattr(e, "stderr", None) or ""
+        logger.warning(f"Could not regenerate the dbt manifest: {e} {stderr}".strip())
+        return manifest_path if os.path.exists(manifest_path) else None
+
+    return manifest_path
+
+
+def prebuilt_manifest(project_dir: str, excluded_dirs: Iterable[str] = EXCLUDED_DIRS) -> Optional[str]:
+    """
+    Returns the manifest prebuilt by `ensure_manifest`, if still current; never builds one.
+
+    Cheap enough for DAG parsing: no file is read or hashed and dbt is not
+    run, the modification times of the project files are compared with the
+    manifest's.
+
+    Args:
+        project_dir (str): Root of the dbt project.
+        excluded_dirs (Iterable[str]): Directory names ignored at any depth.
+
+    Returns:
+        str | None: Path of `manifest.json`, or None if it is missing or a
+        project file changed after it was built.
+    """
+    manifest_path = os.path.join(manifest_dir(project_dir), MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        logger.info(f"No prebuilt dbt manifest at {manifest_path}.")
+        return None
+
+    built_at = os.path.getmtime(manifest_path)
+    for path in _project_files(project_dir, excluded_dirs):
+        if os.path.getmtime(path) > built_at:
+            logger.warning(f"The prebuilt dbt manifest is older than {path}; not using it.")
+            return None
+    return manifest_path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    path = ensure_manifest(project_dir=sys.argv[1], dbt_executable_path=sys.argv[2])
+    if path is None:
+        sys.exit("No dbt manifest could be generated.")
+    print(path)
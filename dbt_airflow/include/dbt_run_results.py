@@ -0,0 +1,105 @@
+"""
+Purpose: Per-node results of batched dbt invocations, read from `run_results.json`.
+
+In the batched execution mode (`NU_DBT_EXECUTION_MODE=batched`), a whole layer
+of the dbt project runs in one `dbt build`, so Airflow no longer has a task per
+model. `push_node_results` is passed to the Cosmos operator as `callback`: it
+runs in the operator's temporary project directory after dbt finishes (also
+when dbt fails) and pushes one summary per model/test/seed/snapshot to XCom.
+Mapped tasks in the DAG then surface each node's status in the Airflow UI
+(see `node_outcome`).
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RUN_RESULTS_PATH = os.path.join("target", "run_results.json")
+# XCom key holding the node summaries of one dbt invocation
+NODE_RESULTS_XCOM_KEY = "node_results"
+
+# dbt statuses, see https://docs.getdbt.com/reference/artifacts/run-results-json
+FAILED_STATUSES = ("error", "fail", "runtime error")
+SKIPPED_STATUSES = ("skipped",)
+# Message of `fingerprinted_table` models whose SQL and upstream data did not change
+UNCHANGED_MESSAGE = "UNCHANGED"
+
+
+def load_run_results(project_dir: str) -> Optional[Dict[str, Any]]:
+    """Returns the parsed `target/run_results.json` of a project, or None if dbt wrote none."""
+    path = os.path.join(project_dir, RUN_RESULTS_PATH)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def summarize_run_results(run_results: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Flattens `run_results.json` into one JSON-serializable summary per node.
+
+    Args:
+        run_results (dict): Parsed `run_results.json` (None yields an empty list).
+
+    Returns:
+        list: Dicts with `unique_id`, `name`, `resource_type`, `status`,
+        `execution_time`, `message`, `failures`, `rows_affected`, `query_id`
+        and `invocation_id`, in execution order.
+    """
+    if not run_results:
+        return []
+
+    invocation_id = run_results.get("metadata", {}).get("invocation_id")
+    nodes = []
+    for result in run_results.get("results", []):
+        unique_id = result["unique_id"]
+        parts = unique_id.split(".")
+        adapter_response = result.get("adapter_response") or {}
+        nodes.append({
+            "unique_id": unique_id,
+            # Test ids end with a hash: test.<package>.<name>.<hash>
+            "name": parts[2] if parts[0] == "test" and len(parts) > 3 else parts[-1],
+            "resource_type": parts[0],
+            "status": result.get("status"),
+            "execution_time": result.get("execution_time"),
+            "message": result.get("message"),
+            "failures": result.get("failures"),
+            "rows_affected": adapter_response.get("rows_affected"),
+            "query_id": adapter_response.get("query_id"),
+            "invocation_id": invocation_id,
+        })
+    return nodes
+
+
+def push_node_results(project_dir: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> List[Dict[str, Any]]:
+    """
+    Cosmos `callback`: pushes the node summaries of the finished dbt invocation to XCom.
+
+    Args:
+        project_dir (str): Temporary project directory the operator ran dbt in.
+        context (dict): The Airflow task context, injected by Cosmos.
+
+    Returns:
+        list: The node summaries (see `summarize_run_results`).
+    """
+    nodes = summarize_run_results(load_run_results(project_dir))
+    if not nodes:
+        logger.warning(f"No run results found in '{project_dir}'; dbt probably failed before running any node.")
+    if context is not None:
+        context["ti"].xcom_push(key=NODE_RESULTS_XCOM_KEY, value=nodes)
+    return nodes
+
+
+def node_outcome(node: Dict[str, Any]) -> str:
+    """Classifies a node summary as `failed`, `skipped`, `unchanged` (not rebuilt) or `success`."""
+    status = (node.get("status") or "").lower()
+    if status in FAILED_STATUSES:
+        return "failed"
+    if status in SKIPPED_STATUSES:
+        return "skipped"
+    if node.get("message") == UNCHANGED_MESSAGE:
+        return "unchanged"
+    return "success"
@@ -0,0 +1,174 @@
+"""
+Purpose: Metadata-only validation of the Snowflake external tables after a refresh.
+
+Validation reads the file registration metadata that Snowflake keeps for each
+external table (`INFORMATION_SCHEMA.EXTERNAL_TABLE_FILES`) together with
+`last_altered` from `INFORMATION_SCHEMA.TABLES`, in a single query for all
+tables. No CSV in GCS is scanned unless the opt-in deep check (`COUNT(*)` per
+table) is requested.
+
+`build_validation_sql` renders the query and `build_validation_report` turns its
+rows into a per-table freshness/volume report.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Row layout returned by the query built in `build_validation_sql`
+RESULT_COLUMNS = (
+    "table_name",
+    "file_count",
+    "total_bytes",
+    "last_registered_at",
+    "last_altered",
+    "row_count",
+    "checked_at",
+)
+
+
+def build_validation_sql(database: str, schema: str, tables: Sequence[str], deep: bool = False) -> str:
+    """
+    Renders one query returning registration metadata for every external table.
+
+    Table names must already be validated identifiers (alphanumeric/underscore);
+    the schema is bound as the only query parameter (`%s`).
+
+    Args:
+        database (str): Snowflake database holding the external tables.
+        schema (str): Schema of the external tables.
+        tables (Sequence[str]): Table names to validate.
+        deep (bool): Also run `COUNT(*)` on each table (scans the files in GCS).
+
+    Returns:
+        str: SQL returning one row per table with the `RESULT_COLUMNS` layout.
+    """
+    file_stats = "\n            UNION ALL\n".join(
+        f"""            SELECT '{table}' AS table_name,
+                   COUNT(*) AS file_count,
+                   COALESCE(SUM(file_size), 0) AS total_bytes,
+                   MAX(registered_on) AS last_registered_at
+            FROM TABLE({database}.information_schema.external_table_files(
+                TABLE_NAME => '{database}.{schema}.{table}'))"""
+        for table in tables
+    )
+
+    if deep:
+        row_counts = "\n            UNION ALL\n".join(
+            f"            SELECT '{table}' AS table_name, COUNT(*) AS row_count FROM {database}.{schema}.{table}"
+            for table in tables
+        )
+    else:
+        row_counts = "            SELECT NULL::STRING AS table_name, NULL::NUMBER AS row_count WHERE FALSE"
+
+    return f"""
+        WITH file_stats AS (
+{file_stats}
+        ),
+        table_stats AS (
+            SELECT LOWER(table_name) AS table_name, last_altered
+            FROM {database}.information_schema.tables
+            WHERE table_schema = %s
+              AND table_type = 'EXTERNAL TABLE'
+        ),
+        row_counts AS (
+{row_counts}
+        )
+        SELECT f.table_name,
+               f.file_count,
+               f.total_bytes,
+               f.last_registered_at,
+               t.last_altered,
+               r.row_count,
+               CURRENT_TIMESTAMP() AS checked_at
+        FROM file_stats f
+        LEFT JOIN table_stats t ON t.table_name = f.table_name
+        LEFT JOIN row_counts r ON r.table_name = f.table_name
+        ORDER BY f.table_name;
+    """
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def build_validation_report(
+    rows: Iterable[Sequence],
+    tiers: Dict[str, List[str]],
+    freshness_thresholds: Dict[str, timedelta],
+    refreshed_tables: Iterable[str],
+    critical_tiers: Iterable[str] = ("high_frequency",),
+) -> Tuple[Dict[str, dict], List[str]]:
+    """
+    Evaluates freshness and volume for each external table.
+
+    Status per table:
+    -   `empty`: no files registered (or zero rows on a deep check).
+    -   `stale`: refreshed this run, but `last_altered` is older than the tier's
+        threshold, i.e. the refresh did not take effect.
+    -   `fresh`: refreshed this run and recently altered.
+    -   `unchanged`: not refreshed this run (no new objects in GCS) or its tier
+        has no freshness threshold.
+
+    Args:
+        rows (Iterable[Sequence]): Query rows in `RESULT_COLUMNS` order.
+        tiers (dict): {tier: [tables]}, as in `EXTERNAL_TABLES_CONFIG`.
+        freshness_thresholds (dict): {tier: max age of `last_altered`}.
+        refreshed_tables (Iterable[str]): Tables refreshed this run.
+        critical_tiers (Iterable[str]): Tiers whose stale tables are critical errors.
+
+    Returns:
+        tuple: (report, critical_errors) where report is {table: {...}} and
+        critical_errors lists human-readable messages that must fail the run.
+    """
+    tier_by_table = {table: tier for tier, tables in tiers.items() for table in tables}
+    refreshed = set(refreshed_tables)
+    critical_tiers = set(critical_tiers)
+
+    report = {}
+    critical_errors = []
+    for row in rows:
+        record = dict(zip(RESULT_COLUMNS, row))
+        table = record["table_name"]
+        tier = tier_by_table.get(table)
+        threshold = freshness_thresholds.get(tier)
+        last_altered = record["last_altered"]
+        checked_at = record["checked_at"]
+        age = (checked_at - last_altered) if last_altered and checked_at else None
+
+        if record["file_count"] == 0 or record["row_count"] == 0:
+            status = "empty"
+        elif table in refreshed and threshold is not None:
+            status = "fresh" if age is not None and age <= threshold else "stale"
+        else:
+            status = "unchanged"
+
+        if status == "stale" and tier in critical_tiers:
+            critical_errors.append(f"'{table}' ({tier}) not refreshed within {threshold} (last altered {last_altered})")
+
+        report[table] = {
+            "tier": tier,
+            "status": status,
+            "refreshed_this_run": table in refreshed,
+            "file_count": record["file_count"],
+            "total_bytes": record["total_bytes"],
+            "row_count": record["row_count"],
+            "last_registered_at": _isoformat(record["last_registered_at"]),
+            "last_altered": _isoformat(last_altered),
+            "age_seconds": int(age.total_seconds()) if age is not None else None,
+        }
+
+    return report, critical_errors
+
+
+def summarize_by_tier(report: Dict[str, dict], tiers: Dict[str, List[str]]) -> Dict[str, dict]:
+    """Counts tables per status for each tier, listing the non-healthy ones."""
+    summary = {}
+    for tier, tables in tiers.items():
+        statuses = {table: report[table]["status"] for table in tables if table in report}
+        summary[tier] = {
+            "fresh_count": sum(1 for s in statuses.values() if s == "fresh"),
+            "unchanged_count": sum(1 for s in statuses.values() if s == "unchanged"),
+            "stale_tables": sorted(t for t, s in statuses.items() if s == "stale"),
+            "empty_tables": sorted(t for t, s in statuses.items() if s == "empty"),
+        }
+    return summary
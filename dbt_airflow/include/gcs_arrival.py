@@ -0,0 +1,216 @@
+"""
+Purpose: Deferrable, per-table arrival sensing for the GCS landing zone.
+
+`GCSNewObjectsSensor` replaces the poke-mode prefix sensor. Instead of holding
+a worker slot and succeeding as soon as *any* file exists under `Tables/`, it
+defers to `GCSNewObjectsTrigger`, which runs in the triggerer and polls every
+table's `Tables/<table>/` prefix separately. It fires only when an object newer
+than the table's watermark shows up, and emits the newly arrived objects per
+table so downstream tasks can use them.
+
+Watermarks are the highest object generation recorded for each table in the
+manifest of the last validated run (see `include.gcs_manifest`). GCS
+generations are creation timestamps in microseconds, so any object written
+after that run has a higher generation.
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol
+
+from airflow.exceptions import AirflowException
+from airflow.sensors.base import BaseSensorOperator
+from airflow.triggers.base import BaseTrigger, TriggerEvent
+
+from include.gcs_manifest import Manifest, ManifestStore, table_prefix
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncObjectClient(Protocol):
+    """
+    Async listing of the objects under a prefix.
+
+    Each object is a dict with `name`, `generation` and `size` keys.
+    """
+
+    async def list_objects(self, bucket: str, prefix: str) -> List[Dict[str, Any]]:
+        ...
+
+
+class GCSAsyncObjectClient:
+    """Lists GCS objects with the non-blocking client of `GCSAsyncHook`."""
+
+    def __init__(self, gcp_conn_id: str):
+        self.gcp_conn_id = gcp_conn_id
+
+    async def list_objects(self, bucket: str, prefix: str) -> List[Dict[str, Any]]:
+        from aiohttp import ClientSession
+        from airflow.providers.google.cloud.hooks.gcs import GCSAsyncHook
+
+        hook = GCSAsyncHook(gcp_conn_id=self.gcp_conn_id)
+        items = []
+        async with ClientSession() as session:
+            storage = await hook.get_storage_client(session)
+            params = {"prefix": prefix}
+            while True:
+                response = await storage.list_objects(bucket, params=params)
+                items.extend(response.get("items", []))
+                if not response.get("nextPageToken"):
+                    break
+                params["pageToken"] = response["nextPageToken"]
+
+        return [
+            {"name": item["name"], "generation": int(item["generation"]), "size": int(item["size"])}
+            for item in items
+            if not item["name"].endswith("/")  # Skip "folder" placeholder objects
+        ]
+
+
+def generation_watermarks(manifest: Manifest) -> Dict[str, int]:
+    """Returns the highest object generation recorded per table (0 for empty tables)."""
+    return {table: state.get("generation", 0) for table, state in (manifest or {}).items()}
+
+
+async def find_new_objects(
+    client: AsyncObjectClient,
+    bucket: str,
+    table_prefixes: Dict[str, str],
+    watermarks: Dict[str, int],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Lists every table prefix concurrently and keeps the objects above each table's watermark.
+
+    Returns:
+        dict: {table: [objects]} for the tables with at least one new object.
+    """
+    tables = list(table_prefixes)
+    listings = await asyncio.gather(
+        *(client.list_objects(bucket, table_prefixes[table]) for table in tables)
+    )
+    new_objects = {}
+    for table, objects in zip(tables, listings):
+        watermark = watermarks.get(table, 0)
+        arrived = sorted(
+            (obj for obj in objects if obj["generation"] > watermark),
+            key=lambda obj: obj["generation"],
+        )
+        if arrived:
+            new_objects[table] = arrived
+    return new_objects
+
+
+class GCSNewObjectsTrigger(BaseTrigger):
+    """
+    Polls each table's GCS prefix until objects newer than its watermark arrive.
+
+    Args:
+        bucket (str): GCS bucket name.
+        table_prefixes (dict): {table: prefix} to watch.
+        watermarks (dict): {table: generation}; only higher generations count as new.
+        gcp_conn_id (str): Airflow connection used by the default GCS client.
+        poke_interval (float): Seconds between listings.
+        client (AsyncObjectClient): Optional client override (e.g. a fake in tests).
+            It is not serialized; the triggerer always uses `GCSAsyncObjectClient`.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        table_prefixes: Dict[str, str],
+        watermarks: Dict[str, int],
+        gcp_conn_id: str,
+        poke_interval: float = 60.0,
+        client: Optional[AsyncObjectClient] = None,
+    ):
+        super().__init__()
+        self.bucket = bucket
+        self.table_prefixes = table_prefixes
+        self.watermarks = watermarks
+        self.gcp_conn_id = gcp_conn_id
+        self.poke_interval = poke_interval
+        self._client = client
+
+    def serialize(self):
+        return (
+            "include.gcs_arrival.GCSNewObjectsTrigger",
+            {
+                "bucket": self.bucket,
+                "table_prefixes": self.table_prefixes,
+                "watermarks": self.watermarks,
+                "gcp_conn_id": self.gcp_conn_id,
+                "poke_interval": self.poke_interval,
+            },
+        )
+
+    async def run(self) -> AsyncIterator[TriggerEvent]:
+        client = self._client or GCSAsyncObjectClient(self.gcp_conn_id)
+        try:
+            while True:
+                new_objects = await find_new_objects(client, self.bucket, self.table_prefixes, self.watermarks)
+                if new_objects:
+                    yield TriggerEvent({"status": "success", "new_objects": new_objects})
+                    return
+                self.log.info(f"No new objects in gs://{self.bucket}; sleeping {self.poke_interval}s.")
+                await asyncio.sleep(self.poke_interval)
+        except Exception as e:
+            yield TriggerEvent({"status": "error", "message": str(e)})
+
+
+class GCSNewObjectsSensor(BaseSensorOperator):
+    """
+    Waits, without holding a worker slot, for new objects under each table's prefix.
+
+    On success the task returns (and pushes to XCom) {table: [objects]} with the
+    objects that arrived since the watermark of the last validated run.
+
+    Args:
+        bucket (str): GCS bucket name.
+        tables (list): Tables to watch; each maps to `<data_prefix>/<table>/`.
+        data_prefix (str): Root landing prefix, e.g. `Tables/`.
+        manifest_store (ManifestStore): Store holding the last validated manifest.
+        gcp_conn_id (str): Airflow GCP connection.
+    """
+
+    template_fields = ("bucket",)
+
+    def __init__(
+        self,
+        *,
+        bucket: str,
+        tables: List[str],
+        data_prefix: str,
+        manifest_store: ManifestStore,
+        gcp_conn_id: str = "google_cloud_default",
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.bucket = bucket
+        self.tables = tables
+        self.data_prefix = data_prefix
+        self.manifest_store = manifest_store
+        self.gcp_conn_id = gcp_conn_id
+
+    def execute(self, context):
+        watermarks = generation_watermarks(self.manifest_store.load())
+        self.defer(
+            trigger=GCSNewObjectsTrigger(
+                bucket=self.bucket,
+                table_prefixes={table: table_prefix(self.data_prefix, table) for table in self.tables},
+                watermarks={table: watermarks.get(table, 0) for table in self.tables},
+                gcp_conn_id=self.gcp_conn_id,
+                poke_interval=self.poke_interval,
+            ),
+            method_name="execute_complete",
+            timeout=timedelta(seconds=self.timeout),
+        )
+
+    def execute_complete(self, context, event: Dict[str, Any]):
+        if event.get("status") != "success":
+            raise AirflowException(f"GCS arrival trigger failed: {event.get('message')}")
+
+        new_objects = event["new_objects"]
+        for table, objects in new_objects.items():
+            self.log.info(f"{len(objects)} new object(s) for '{table}'.")
+        return new_objects
@@ -0,0 +1,274 @@
+"""
+Purpose: Change detection for the GCS landing zone used by `nu_data_pipeline`.
+
+Each table lands its files under `Tables/<table>/`. A manifest holds one
+fixed-size state per table, whatever the number of landed objects: the highest
+object generation (the table's high-water mark), the object count and a digest
+of the listing. Comparing the current states with the ones stored after the
+previous successful run tells the DAG which external tables actually need an
+`ALTER EXTERNAL TABLE ... REFRESH`; any new, overwritten or removed object
+changes the digest.
+
+GCS generations are write timestamps, so the objects written since the last
+run are the ones above the stored high-water mark (`new_objects`): tasks
+needing them list their own table's prefix instead of receiving object lists.
+
+Both the object listing and the manifest storage are pluggable so the logic
+can be exercised against a local directory tree in tests:
+-   `GCSObjectLister` / `LocalObjectLister` list the objects under a prefix.
+-   `VariableManifestStore` / `LocalFileManifestStore` persist the snapshot.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+# {table: {"generation": highest object generation, "objects": object count, "digest": listing hash}}
+Manifest = Dict[str, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    """A single landed object, identified by name, generation and size."""
+
+    name: str
+    generation: int
+    size: int
+
+
+class ObjectLister(Protocol):
+    """Lists the objects stored under a prefix."""
+
+    def list_objects(self, prefix: str) -> List[ObjectInfo]:
+        ...
+
+
+class ManifestStore(Protocol):
+    """Persists the manifest of the last successfully processed snapshot."""
+
+    def load(self) -> Manifest:
+        ...
+
+    def save(self, manifest: Manifest) -> None:
+        ...
+
+
+# =============================================================================
+# OBJECT LISTERS
+# =============================================================================
+
+class GCSObjectLister:
+    """Lists objects in a GCS bucket through the Airflow GCS connection."""
+
+    def __init__(self, bucket: str, gcp_conn_id: str):
+        self.bucket = bucket
+        self.gcp_conn_id = gcp_conn_id
+
+    def list_objects(self, prefix: str) -> List[ObjectInfo]:
+        from airflow.providers.google.cloud.hooks.gcs import GCSHook
+
+        client = GCSHook(gcp_conn_id=self.gcp_conn_id).get_conn()
+        return [
+            ObjectInfo(name=blob.name, generation=int(blob.generation), size=int(blob.size))
+            for blob in client.list_blobs(self.bucket, prefix=prefix)
+            if not blob.name.endswith("/")  # Skip "folder" placeholder objects
+        ]
+
+
+class LocalObjectLister:
+    """
+    Lists files under a local directory as if it were a bucket.
+
+    Object names are POSIX paths relative to `root`, and the file's
+    modification time (ns) stands in for the GCS generation.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def list_objects(self, prefix: str) -> List[ObjectInfo]:
+        base = os.path.join(self.root, prefix)
+        objects = []
+        for dirpath, _, filenames in os.walk(base):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                stat = os.stat(path)
+                name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                objects.append(ObjectInfo(name=name, generation=stat.st_mtime_ns, size=stat.st_size))
+        return sorted(objects, key=lambda obj: obj.name)
+
+
+# =============================================================================
+# MANIFEST STORES
+# =============================================================================
+
+class VariableManifestStore:
+    """Stores the manifest as a JSON Airflow Variable."""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def load(self) -> Manifest:
+        from airflow.models import Variable
+
+        return upgrade_manifest(Variable.get(self.key, default_var={}, deserialize_json=True))
+
+    def save(self, manifest: Manifest) -> None:
+        from airflow.models import Variable
+
+        Variable.set(self.key, manifest, serialize_json=True)
+
+
+class LocalFileManifestStore:
+    """Stores the manifest as a JSON file on the local filesystem."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Manifest:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r") as f:
+            return upgrade_manifest(json.load(f))
+
+    def save(self, manifest: Manifest) -> None:
+        with open(self.path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+# =============================================================================
+# SNAPSHOT & DIFF
+# =============================================================================
+
+def table_prefix(data_prefix: str, table: str) -> str:
+    """Returns the landing prefix of a table, e.g. `Tables/pix_movements/`."""
+    return f"{data_prefix.rstrip('/')}/{table}/"
+
+
+def table_state(objects: Iterable[ObjectInfo]) -> Dict[str, Any]:
+    """
+    Summarizes a table's listing in a fixed-size state.
+
+    Returns:
+        dict: `generation` (highest object generation, 0 when empty), `objects`
+        (count) and `digest` (SHA-256 of the sorted names, generations and sizes).
+    """
+    objects = sorted(objects, key=lambda obj: obj.name)
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update(f"{obj.name}\t{obj.generation}\t{obj.size}\n".encode())
+    return {
+        "generation": max((obj.generation for obj in objects), default=0),
+        "objects": len(objects),
+        "digest": digest.hexdigest(),
+    }
+
+
+def upgrade_manifest(manifest: Dict[str, Any]) -> Manifest:
+    """Converts the tables stored as a per-object manifest ({object_name: [generation, size]}) to table states."""
+    return {
+        table: state if "digest" in state else table_state(
+            ObjectInfo(name=name, generation=meta[0], size=meta[1]) for name, meta in state.items()
+        )
+        for table, state in (manifest or {}).items()
+    }
+
+
+def snapshot_tables(lister: ObjectLister, tables: Iterable[str], data_prefix: str) -> Manifest:
+    """
+    Lists every table's landing prefix and builds the current manifest.
+
+    Args:
+        lister (ObjectLister): Source of object listings (GCS or local).
+        tables (Iterable[str]): Table names; each maps to `<data_prefix>/<table>/`.
+        data_prefix (str): Root prefix under which tables land, e.g. `Tables/`.
+
+    Returns:
+        Manifest: {table: state} (see `table_state`).
+    """
+    manifest = {}
+    for table in tables:
+        objects = lister.list_objects(table_prefix(data_prefix, table))
+        manifest[table] = table_state(objects)
+        logger.info(f"Listed {len(objects)} objects for '{table}'.")
+    return manifest
+
+
+def changed_tables(previous: Manifest, current: Manifest) -> List[str]:
+    """Returns the sorted tables whose landing prefix differs between snapshots."""
+    return sorted(
+        table for table, state in current.items()
+        if (previous.get(table) or {}).get("digest") != state["digest"]
+    )
+
+
+def new_objects(
+    lister: ObjectLister,
+    table: str,
+    data_prefix: str,
+    since_generation: int = 0,
+    until_generation: Optional[int] = None,
+) -> List[ObjectInfo]:
+    """
+    Lists the objects of a table written after `since_generation`, new or overwritten in place.
+
+    Args:
+        lister (ObjectLister): Source of object listings.
+        table (str): Table whose prefix is listed.
+        data_prefix (str): Root landing prefix.
+        since_generation (int): High-water mark of the last validated run (0: every object).
+        until_generation (int): High-water mark of this run's snapshot, so objects
+            landed after it are left to the next run.
+
+    Returns:
+        list: The objects, by generation.
+    """
+    return sorted(
+        (
+            obj for obj in lister.list_objects(table_prefix(data_prefix, table))
+            if obj.generation > since_generation and (until_generation is None or obj.generation <= until_generation)
+        ),
+        key=lambda obj: (obj.generation, obj.name),
+    )
+
+
+def detect_changes(
+    lister: ObjectLister,
+    store: ManifestStore,
+    tables: Iterable[str],
+    data_prefix: str,
+    force: Optional[bool] = False,
+) -> Dict[str, object]:
+    """
+    Snapshots the landing zone and compares it with the stored manifest.
+
+    The new snapshot is *not* saved here: it should only be committed (with
+    `store.save`) once the refresh it triggers has been validated, so a failed
+    run is retried against the same baseline.
+
+    Args:
+        lister (ObjectLister): Source of object listings.
+        store (ManifestStore): Where the previous snapshot is kept.
+        tables (Iterable[str]): Tables to inspect.
+        data_prefix (str): Root landing prefix.
+        force (bool): Report every table as changed (e.g. on full refreshes).
+
+    Returns:
+        dict: `changed_tables` (sorted list), the stored `previous` manifest and
+        the new `manifest`.
+    """
+    tables = list(tables)
+    previous = store.load() or {}
+    current = snapshot_tables(lister, tables, data_prefix)
+    changed = sorted(tables) if force else changed_tables(previous, current)
+    logger.info(f"Tables with new or modified objects: {changed}")
+    return {
+        "changed_tables": changed,
+        "previous": previous,
+        "manifest": current,
+    }
@@ -0,0 +1,286 @@
+"""
+Purpose: Columnar, date-partitioned landing format for the high-frequency sources.
+
+`pix_movements`, `transfer_ins` and `transfer_outs` land as CSV under
+`Tables/<table>/`. Every staging query over a CSV external table parses all of
+its text and cannot prune by date. This module converts newly landed CSVs into
+Parquet with an explicit schema, partitioned Hive-style by completion date:
+
+    Tables/parquet/<table>/completed_date=YYYY-MM-DD/<csv stem>.parquet
+
+The Parquet external tables (`var('landing_format') == 'parquet'` in dbt)
+derive `completed_date` from the file path, so staging filters on it prune
+whole files.
+
+CSVs are streamed one block at a time (`pyarrow.csv.open_csv`), and each block
+is split by date and appended as a row group to that partition's file, so
+memory is bounded by the block size regardless of the file size. All I/O goes
+through a `pyarrow.fs.FileSystem`, so the converter runs against GCS in the DAG
+(`gcs_filesystem`) and against a local directory tree in tests.
+"""
+
+import logging
+import posixpath
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.fs as pa_fs
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMN = "completed_date"
+# Partition of rows without a completion timestamp (Hive convention)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+# Values the source systems write for missing fields
+CSV_NULL_VALUES = ["", "None", "NULL", "null"]
+DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024  # Bytes of CSV parsed per batch
+
+
+@dataclass(frozen=True)
+class LandingSchema:
+    """
+    Explicit schema of a landed CSV.
+
+    Attributes:
+        columns: (name, Arrow type) in CSV column order; the Parquet file keeps
+            these names and types.
+        timestamp_columns: Columns landed as epoch seconds or ISO-8601 text,
+            parsed into `timestamp[us]` (UTC, no time zone).
+        partition_source: Timestamp column whose date is the partition value.
+    """
+
+    columns: Tuple[Tuple[str, pa.DataType], ...]
+    timestamp_columns: Tuple[str, ...]
+    partition_source: str
+
+    @property
+    def schema(self) -> pa.Schema:
+        return pa.schema(self.columns)
+
+    @property
+    def read_types(self) -> Dict[str, pa.DataType]:
+        """CSV column types; timestamps are read as text and parsed afterwards."""
+        return {
+            name: pa.string() if name in self.timestamp_columns else data_type
+            for name, data_type in self.columns
+        }
+
+
+_TRANSFER_SCHEMA = LandingSchema(
+    columns=(
+        ("id", pa.int64()),
+        ("account_id", pa.int64()),
+        ("amount", pa.decimal128(18, 2)),
+        ("transaction_requested_at", pa.timestamp("us")),
+        ("transaction_completed_at", pa.timestamp("us")),
+        ("status", pa.string()),
+    ),
+    timestamp_columns=("transaction_requested_at", "transaction_completed_at"),
+    partition_source="transaction_completed_at",
+)
+
+LANDING_SCHEMAS: Dict[str, LandingSchema] = {
+    "pix_movements": LandingSchema(
+        columns=(
+            ("id", pa.int64()),
+            ("account_id", pa.int64()),
+            ("pix_amount", pa.decimal128(18, 2)),
+            ("pix_requested_at", pa.timestamp("us")),
+            ("pix_completed_at", pa.timestamp("us")),
+            ("status", pa.string()),
+            ("in_or_out", pa.string()),
+        ),
+        timestamp_columns=("pix_requested_at", "pix_completed_at"),
+        partition_source="pix_completed_at",
+    ),
+    "transfer_ins": _TRANSFER_SCHEMA,
+    "transfer_outs": _TRANSFER_SCHEMA,
+}
+
+
+# =============================================================================
+# PATHS & FILESYSTEMS
+# =============================================================================
+
+def parquet_prefix(data_prefix: str, table: str) -> str:
+    """Returns the Parquet landing prefix of a table, e.g. `Tables/parquet/pix_movements/`."""
+    return f"{data_prefix.rstrip('/')}/parquet/{table}/"
+
+
+def partition_path(data_prefix: str, table: str, partition: str, stem: str) -> str:
+    """Returns the Parquet file written for one CSV (`stem`) in one date partition."""
+    return f"{parquet_prefix(data_prefix, table)}{PARTITION_COLUMN}={partition}/{stem}.parquet"
+
+
+def gcs_filesystem(bucket: str, gcp_conn_id: str) -> pa_fs.FileSystem:
+    """
+    Returns a `pyarrow.fs` filesystem rooted at a GCS bucket.
+
+    Authenticates with an access token from the Airflow GCP connection, so the
+    converter uses the same credentials as the rest of the DAG.
+    """
+    from airflow.providers.google.cloud.hooks.gcs import GCSHook
+    from google.auth.transport.requests import Request
+
+    credentials = GCSHook(gcp_conn_id=gcp_conn_id).get_credentials()
+    credentials.refresh(Request())
+    gcs = pa_fs.GcsFileSystem(
+        access_token=credentials.token,
+        credential_token_expiration=credentials.expiry,
+    )
+    return pa_fs.SubTreeFileSystem(bucket, gcs)
+
+
+# =============================================================================
+# CONVERSION
+# =============================================================================
+
+def parse_timestamps(values: pa.Array) -> pa.Array:
+    """
+    Parses landed timestamp text into `timestamp[us]`.
+
+    Digit-only values are epoch seconds (as Snowflake's `TO_TIMESTAMP` treats
+    them); anything else must be ISO-8601. Nulls stay null.
+    """
+    is_epoch = pc.fill_null(pc.match_substring_regex(values, r"^\d+$"), False)
+    null_text = pa.scalar(None, pa.string())
+
+    epoch_seconds = pc.cast(pc.if_else(is_epoch, values, null_text), pa.int64())
+    from_epoch = pc.cast(pc.multiply(epoch_seconds, 1_000_000), pa.timestamp("us"))
+    from_text = pc.cast(pc.if_else(is_epoch, null_text, values), pa.timestamp("us"))
+    return pc.coalesce(from_epoch, from_text)
+
+
+def _to_landing_batch(batch: pa.RecordBatch, landing_schema: LandingSchema) -> pa.RecordBatch:
+    arrays = [
+        parse_timestamps(batch.column(name)) if name in landing_schema.timestamp_columns else batch.column(name)
+        for name, _ in landing_schema.columns
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=landing_schema.schema)
+
+
+def _partition_values(batch: pa.RecordBatch, landing_schema: LandingSchema) -> pa.Array:
+    dates = pc.strftime(batch.column(landing_schema.partition_source), format="%Y-%m-%d")
+    return pc.fill_null(dates, NULL_PARTITION)
+
+
+def convert_csv_to_parquet(
+    filesystem: pa_fs.FileSystem,
+    source_path: str,
+    table: str,
+    data_prefix: str,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Dict[str, int]:
+    """
+    Streams one landed CSV into date-partitioned Parquet files.
+
+    One Parquet file per date partition is kept open while the CSV is read;
+    each CSV block is split by date and appended to those files as row groups.
+
+    Args:
+        filesystem (pyarrow.fs.FileSystem): Filesystem rooted at the bucket.
+        source_path (str): CSV path relative to the bucket, e.g. `Tables/pix_movements/x.csv`.
+        table (str): Table name; selects the schema in `LANDING_SCHEMAS`.
+        data_prefix (str): Root landing prefix, e.g. `Tables/`.
+        block_size (int): Bytes of CSV parsed per batch (bounds memory use).
+
+    Returns:
+        dict: {partition value: rows written}.
+    """
+    landing_schema = LANDING_SCHEMAS[table]
+    stem = posixpath.splitext(posixpath.basename(source_path))[0]
+    writers: Dict[str, pq.ParquetWriter] = {}
+    rows_by_partition: Dict[str, int] = {}
+
+    read_options = pa_csv.ReadOptions(
+        column_names=[name for name, _ in landing_schema.columns],
+        skip_rows=1,  # Header row
+        block_size=block_size,
+    )
+    convert_options = pa_csv.ConvertOptions(
+        column_types=landing_schema.read_types,
+        null_values=CSV_NULL_VALUES,
+        strings_can_be_null=True,
+    )
+
+    try:
+        with filesystem.open_input_stream(source_path) as source:
+            reader = pa_csv.open_csv(source, read_options=read_options, convert_options=convert_options)
+            for raw_batch in reader:
+                batch = _to_landing_batch(raw_batch, landing_schema)
+                partitions = _partition_values(batch, landing_schema)
+
+                for partition in pc.unique(partitions).to_pylist():
+                    part = batch.filter(pc.equal(partitions, partition))
+                    if partition not in writers:
+                        path = partition_path(data_prefix, table, partition, stem)
+                        filesystem.create_dir(posixpath.dirname(path), recursive=True)
+                        writers[partition] = pq.ParquetWriter(path, landing_schema.schema, filesystem=filesystem)
+                    writers[partition].write_batch(part)
+                    rows_by_partition[partition] = rows_by_partition.get(partition, 0) + part.num_rows
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    logger.info(f"Converted '{source_path}' into {len(writers)} partition(s) ({sum(rows_by_partition.values())} rows).")
+    return rows_by_partition
+
+
+def _existing_outputs(filesystem: pa_fs.FileSystem, data_prefix: str, table: str) -> Dict[str, List[str]]:
+    """Maps each CSV stem to the Parquet files already written for it."""
+    selector = pa_fs.FileSelector(parquet_prefix(data_prefix, table), allow_not_found=True, recursive=True)
+    outputs: Dict[str, List[str]] = {}
+    for info in filesystem.get_file_info(selector):
+        if info.type == pa_fs.FileType.File and info.path.endswith(".parquet"):
+            stem = posixpath.splitext(posixpath.basename(info.path))[0]
+            outputs.setdefault(stem, []).append(info.path)
+    return outputs
+
+
+def convert_landed_objects(
+    filesystem: pa_fs.FileSystem,
+    objects_by_table: Dict[str, Iterable[str]],
+    data_prefix: str,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Dict[str, dict]:
+    """
+    Converts the given landed CSVs of each table to partitioned Parquet.
+
+    Previous outputs of a CSV are deleted before it is converted again, so a
+    CSV overwritten in place with different dates does not leave stale
+    partitions behind. Tables without a `LANDING_SCHEMAS` entry and non-CSV
+    objects are ignored.
+
+    Args:
+        filesystem (pyarrow.fs.FileSystem): Filesystem rooted at the bucket.
+        objects_by_table (dict): {table: [CSV object names]}, e.g. the objects
+            written since the last run (`include.gcs_manifest.new_objects`).
+        data_prefix (str): Root landing prefix, e.g. `Tables/`.
+        block_size (int): Bytes of CSV parsed per batch.
+
+    Returns:
+        dict: {table: {"files": n, "rows": n, "partitions": [sorted values]}}.
+    """
+    summary = {}
+    for table, names in objects_by_table.items():
+        csv_names = sorted(name for name in names if name.lower().endswith(".csv"))
+        if table not in LANDING_SCHEMAS or not csv_names:
+            continue
+
+        existing = _existing_outputs(filesystem, data_prefix, table)
+        rows, partitions = 0, set()
+        for name in csv_names:
+            stem = posixpath.splitext(posixpath.basename(name))[0]
+            for stale_path in existing.get(stem, []):
+                filesystem.delete_file(stale_path)
+
+            written = convert_csv_to_parquet(filesystem, name, table, data_prefix, block_size=block_size)
+            rows += sum(written.values())
+            partitions.update(written)
+
+        summary[table] = {"files": len(csv_names), "rows": rows, "partitions": sorted(partitions)}
+    return summary
@@ -0,0 +1,248 @@
+"""
+Purpose: Per-model performance telemetry for the dbt transformations.
+
+After `dbt_transformation`, every model and test of the run has a node summary
+in XCom (pushed by the `include.dbt_run_results.push_node_results` Cosmos
+callback) with its execution time, rows affected and Snowflake query id. This
+module joins those summaries with Snowflake's query history (bytes scanned,
+partitions scanned vs. total, spill, warehouse) and flags regressions against
+each node's trailing median execution time.
+
+The query-history lookup is a `QueryHistoryProvider`, so the metrics can be
+built and tested without Snowflake (`SnowflakeQueryHistoryProvider` is the
+production implementation). `SnowflakeMetricsStore` persists the rows to the
+`pipeline_metrics` table and reads the trailing history back.
+"""
+
+import logging
+import statistics
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence
+
+from include.dbt_run_results import node_outcome
+
+logger = logging.getLogger(__name__)
+
+# Query history fields copied onto each metric row
+QUERY_HISTORY_FIELDS = (
+    "warehouse_name",
+    "bytes_scanned",
+    "partitions_scanned",
+    "partitions_total",
+    "bytes_spilled_to_local_storage",
+    "bytes_spilled_to_remote_storage",
+    "total_elapsed_time_ms",
+)
+
+# Column order of the `pipeline_metrics` table
+METRIC_COLUMNS = (
+    "dag_id",
+    "run_id",
+    "collected_at",
+    "unique_id",
+    "name",
+    "resource_type",
+    "status",
+    "execution_time",
+    "rows_affected",
+    "query_id",
+    *QUERY_HISTORY_FIELDS,
+    "trailing_median_time",
+    "is_regression",
+)
+
+
+class QueryHistoryProvider(Protocol):
+    """Looks up Snowflake query history for a set of query ids."""
+
+    def fetch(self, query_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Returns {query_id: {field: value}} with the `QUERY_HISTORY_FIELDS` keys."""
+        ...
+
+
+class SnowflakeQueryHistoryProvider:
+    """
+    Reads `INFORMATION_SCHEMA.QUERY_HISTORY()` through the Airflow Snowflake connection.
+
+    The table function has no ingestion latency (unlike `ACCOUNT_USAGE`) and
+    covers the last 7 days of queries of the connection's user, which is the
+    user dbt runs as.
+    """
+
+    def __init__(self, snowflake_conn_id: str, database: str, result_limit: int = 10000):
+        self.snowflake_conn_id = snowflake_conn_id
+        self.database = database
+        self.result_limit = result_limit
+
+    def fetch(self, query_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+
+        if not query_ids:
+            return {}
+        placeholders = ", ".join(["%s"] * len(query_ids))
+        sql = f"""
+            SELECT query_id,
+                   warehouse_name,
+                   bytes_scanned,
+                   partitions_scanned,
+                   partitions_total,
+                   bytes_spilled_to_local_storage,
+                   bytes_spilled_to_remote_storage,
+                   total_elapsed_time
+            FROM TABLE({self.database}.information_schema.query_history(RESULT_LIMIT => {int(self.result_limit)}))
+            WHERE query_id IN ({placeholders})
+        """
+        rows = SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id).get_records(sql, parameters=list(query_ids))
+        return {row[0]: dict(zip(QUERY_HISTORY_FIELDS, row[1:])) for row in rows}
+
+
+class SnowflakeMetricsStore:
+    """Persists metric rows to the `pipeline_metrics` table and reads the trailing history."""
+
+    def __init__(self, snowflake_conn_id: str, table: str):
+        self.snowflake_conn_id = snowflake_conn_id
+        self.table = table
+
+    def _hook(self):
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+
+        return SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id)
+
+    def ensure_table(self) -> None:
+        self._hook().run(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                dag_id STRING, run_id STRING, collected_at TIMESTAMP_NTZ,
+                unique_id STRING, name STRING, resource_type STRING, status STRING,
+                execution_time FLOAT, rows_affected NUMBER, query_id STRING,
+                warehouse_name STRING, bytes_scanned NUMBER,
+                partitions_scanned NUMBER, partitions_total NUMBER,
+                bytes_spilled_to_local_storage NUMBER, bytes_spilled_to_remote_storage NUMBER,
+                total_elapsed_time_ms NUMBER, trailing_median_time FLOAT, is_regression BOOLEAN
+            )
+        """)
+
+    def trailing_execution_times(self, unique_ids: Sequence[str], window: int) -> Dict[str, List[float]]:
+        """Returns the last `window` successful execution times per node, newest first."""
+        if not unique_ids:
+            return {}
+        placeholders = ", ".join(["%s"] * len(unique_ids))
+        rows = self._hook().get_records(
+            f"""
+            SELECT unique_id, execution_time
+            FROM {self.table}
+            WHERE unique_id IN ({placeholders})
+              AND status IN ('success', 'pass')
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY unique_id ORDER BY collected_at DESC) <= {int(window)}
+            """,
+            parameters=list(unique_ids),
+        )
+        history: Dict[str, List[float]] = {}
+        for unique_id, execution_time in rows:
+            history.setdefault(unique_id, []).append(float(execution_time))
+        return history
+
+    def latest_model_runs(self, dag_id: str) -> Dict[str, Dict[str, Any]]:
+        """Returns the metrics of each model's last successful run in `dag_id`, by model name."""
+        rows = self._hook().get_records(
+            f"""
+            SELECT name, execution_time, bytes_scanned, bytes_spilled_to_remote_storage, warehouse_name
+            FROM {self.table}
+            WHERE dag_id = %s
+              AND resource_type = 'model'
+              AND status = 'success'
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY unique_id ORDER BY collected_at DESC) = 1
+            """,
+            parameters=[dag_id],
+        )
+        fields = ("execution_time", "bytes_scanned", "bytes_spilled_to_remote_storage", "warehouse_name")
+        return {row[0]: dict(zip(fields, row[1:])) for row in rows}
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self._hook().insert_rows(
+                self.table,
+                rows=[tuple(row[column] for column in METRIC_COLUMNS) for row in rows],
+                target_fields=list(METRIC_COLUMNS),
+            )
+
+
+def build_metrics(
+    node_results: Iterable[Dict[str, Any]],
+    history_provider: QueryHistoryProvider,
+    dag_id: str,
+    run_id: str,
+    collected_at: datetime,
+) -> List[Dict[str, Any]]:
+    """
+    Joins dbt node summaries with the query history of their Snowflake queries.
+
+    Nodes without a query id (e.g. ephemeral or skipped nodes) keep None in the
+    query history fields. A node reported by several invocations (e.g. retries)
+    keeps its last result. Models skipped by their fingerprint get the
+    `unchanged` status, so they do not count in the trailing execution times.
+
+    Returns:
+        list: One dict per node with the `METRIC_COLUMNS` keys (regression
+        columns are filled by `flag_regressions`).
+    """
+    nodes = {node["unique_id"]: node for node in node_results}
+    query_ids = sorted({node["query_id"] for node in nodes.values() if node.get("query_id")})
+    history = history_provider.fetch(query_ids) if query_ids else {}
+
+    rows = []
+    for unique_id, node in nodes.items():
+        query_stats = history.get(node.get("query_id")) or {}
+        rows.append({
+            "dag_id": dag_id,
+            "run_id": run_id,
+            "collected_at": collected_at,
+            "unique_id": unique_id,
+            "name": node.get("name"),
+            "resource_type": node.get("resource_type"),
+            "status": "unchanged" if node_outcome(node) == "unchanged" else node.get("status"),
+            "execution_time": node.get("execution_time"),
+            "rows_affected": node.get("rows_affected"),
+            "query_id": node.get("query_id"),
+            **{field: query_stats.get(field) for field in QUERY_HISTORY_FIELDS},
+            "trailing_median_time": None,
+            "is_regression": False,
+        })
+    return rows
+
+
+def flag_regressions(
+    rows: List[Dict[str, Any]],
+    trailing_times: Dict[str, List[float]],
+    factor: float = 2.0,
+    min_seconds: float = 5.0,
+    min_history: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    Marks nodes more than `factor`× slower than their trailing median execution time.
+
+    Args:
+        rows (list): Metric rows from `build_metrics` (updated in place).
+        trailing_times (dict): {unique_id: [previous execution times]}.
+        factor (float): Slowdown ratio that counts as a regression.
+        min_seconds (float): Ignore nodes faster than this (noise on tiny models).
+        min_history (int): Previous runs needed before a node can be flagged.
+
+    Returns:
+        list: The regressed rows.
+    """
+    regressions = []
+    for row in rows:
+        previous = trailing_times.get(row["unique_id"]) or []
+        if len(previous) < min_history or row["execution_time"] is None:
+            continue
+
+        median: Optional[float] = statistics.median(previous)
+        row["trailing_median_time"] = median
+        if row["execution_time"] >= min_seconds and row["execution_time"] > factor * median:
+            row["is_regression"] = True
+            regressions.append(row)
+            logger.warning(
+                f"Regression: {row['unique_id']} took {row['execution_time']:.1f}s "
+                f"vs. trailing median {median:.1f}s ({len(previous)} runs)."
+            )
+    return regressions
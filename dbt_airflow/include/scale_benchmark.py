@@ -0,0 +1,505 @@
+"""
+Purpose: Local scale benchmark of the dbt models on DuckDB, without Snowflake.
+
+Runs the project's staging -> intermediate -> marts graph on an embedded DuckDB
+database over synthetic sources (`include.synthetic_data`) and reports, per
+model and scale, the wall time, peak process memory and row count.
+
+The models are rendered with a minimal Jinja context (`ref`, `source`, `var`,
+`config` and the project macros; `is_incremental()` is false, i.e. a full
+build, unless the renderer is built for incremental runs), then the few Snowflake-only functions they use are rewritten to DuckDB
+equivalents (`SNOWFLAKE_SHIMS`). Every model is built as a table, including
+staging views, so each model's cost is measured on its own instead of being
+folded into its first downstream table.
+
+Two checks catch row blow-ups before they reach production:
+
+- fan-out: a model returning more rows than all its inputs together (every
+  model of this project filters, aggregates, unions or joins 1:1 its inputs);
+- explicit bounds (`ROW_BOUNDS`), e.g. the account x month spine can never
+  exceed active accounts x calendar months.
+
+    python -m include.scale_benchmark --scales 1m 10m --data-root /tmp/nu_benchmark
+
+DuckDB is a benchmark-only dependency (`pip install duckdb`); it is not needed
+by the Airflow image.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+import yaml
+from jinja2 import Environment
+from jinja2.runtime import Context, Macro
+
+from include.synthetic_data import SCALES, config_for_scale, generate_dataset
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROJECT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "dags", "dbt_pipeline")
+LAYERS = ("staging", "intermediate", "marts")
+
+# (pattern, replacement) rewrites of Snowflake syntax DuckDB lacks
+SNOWFLAKE_SHIMS: Tuple[Tuple[str, str], ...] = (
+    (r"\bCURRENT_TIMESTAMP\(\)", "CURRENT_TIMESTAMP::TIMESTAMP"),
+    (r"\bCURRENT_DATE\(\)", "CURRENT_DATE"),
+    # Registered files of an external table (their versions are not tracked)
+    (
+        r"\bTABLE\(\w+\.INFORMATION_SCHEMA\.EXTERNAL_TABLE_FILES\(\s*TABLE_NAME\s*=>\s*'\w+\.(\w+\.\w+)'\s*\)\)",
+        r"(SELECT DISTINCT filename AS file_name, CAST(NULL AS TIMESTAMP) AS last_modified FROM \1)",
+    ),
+    # External table pseudo-columns, exposed by `read_parquet` on the source views
+    (r"\bMETADATA\$FILENAME\b", "filename"),
+    (r"\bMETADATA\$FILE_ROW_NUMBER\b", "file_row_number"),
+    (r"\bTRY_TO_TIMESTAMP\(", "sf_try_to_timestamp("),
+    (r"\bTO_TIMESTAMP\(", "sf_to_timestamp("),
+    (r"\b(?:TO_)?DATE\(", "sf_to_date("),
+    (r"\bLPAD\(", "sf_lpad("),
+    # Snowflake casts numbers to text implicitly in string functions
+    *((rf"\b{function}\(", f"sf_{function.lower()}(") for function in ("LENGTH", "TRIM", "UPPER", "LOWER")),
+)
+
+# DuckDB macros backing the shims, with Snowflake's implicit casts
+SHIM_MACROS = (
+    "CREATE OR REPLACE MACRO sf_try_to_timestamp(x) AS TRY_CAST(CAST(x AS VARCHAR) AS TIMESTAMP)",
+    # Typed timestamps pass through; numbers and integer-looking text are
+    # epoch seconds, as in Snowflake
+    """CREATE OR REPLACE MACRO sf_to_timestamp(x) AS CASE
+        WHEN typeof(x) = 'TIMESTAMP' THEN TRY_CAST(x AS TIMESTAMP)
+        WHEN typeof(x) IN ('BIGINT', 'INTEGER') THEN make_timestamp(CAST(CAST(x AS VARCHAR) AS BIGINT) * 1000000)
+        ELSE COALESCE(
+            TRY_CAST(CAST(x AS VARCHAR) AS TIMESTAMP),
+            make_timestamp(TRY_CAST(CAST(x AS VARCHAR) AS BIGINT) * 1000000)
+        )
+    END""",
+    "CREATE OR REPLACE MACRO sf_to_date(x) AS CAST(x AS DATE)",
+    "CREATE OR REPLACE MACRO dateadd(part, n, x) AS x + CAST(n || ' ' || part AS INTERVAL)",
+    "CREATE OR REPLACE MACRO sf_lpad(x, n, c) AS lpad(CAST(x AS VARCHAR), n, c)",
+    *(
+        f"CREATE OR REPLACE MACRO sf_{function}(x) AS {function}(CAST(x AS VARCHAR))"
+        for function in ("length", "trim", "upper", "lower")
+    ),
+)
+
+# Upper bounds on model row counts, as SQL over already built models
+ROW_BOUNDS = {
+    "int_account_monthly_spine": (
+        "(SELECT COUNT(DISTINCT account_id) FROM stg_accounts WHERE account_status = 'active')"
+        " * (SELECT COUNT(DISTINCT month_start_date) FROM base_time_dimension)"
+    ),
+}
+
+REF_PATTERN = re.compile(r"""\bref\(\s*['"](\w+)['"]\s*\)""")
+SOURCE_PATTERN = re.compile(r"""\bsource\(\s*['"](\w+)['"]\s*,\s*['"](\w+)['"]\s*\)""")
+
+
+@dataclass
+class Model:
+    """A dbt model of the project: its raw SQL and direct inputs."""
+
+    name: str
+    layer: str
+    raw_sql: str
+    refs: List[str]
+    sources: List[Tuple[str, str]]
+    # Arguments of the model's `config()` call, set when it is rendered
+    config: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SourceRelation:
+    """A `source()` relation; renders as `<schema>.<identifier>` like the benchmark's source views."""
+
+    database: str
+    schema: str
+    identifier: str
+
+    def __str__(self) -> str:
+        return f"{self.schema}.{self.identifier}"
+
+
+@dataclass
+class ModelResult:
+    """Benchmark measurements of one model build."""
+
+    name: str
+    layer: str
+    seconds: float
+    peak_memory_bytes: int
+    rows: int
+    input_rows: int
+
+
+@dataclass
+class BenchmarkReport:
+    """Results of one scale: per-model measurements and the row checks that failed."""
+
+    scale: str
+    source_rows: Dict[str, int]
+    models: List[ModelResult] = field(default_factory=list)
+    violations: List[str] = field(default_factory=list)
+
+
+def load_models(project_dir: str = DEFAULT_PROJECT_DIR) -> Dict[str, Model]:
+    """Reads every model under `models/`, keyed by name; the layer is its top-level folder."""
+    models_dir = os.path.join(project_dir, "models")
+    models = {}
+    for dirpath, _, filenames in os.walk(models_dir):
+        layer = os.path.relpath(dirpath, models_dir).split(os.sep)[0]
+        for filename in sorted(filenames):
+            if not filename.endswith(".sql"):
+                continue
+            with open(os.path.join(dirpath, filename)) as f:
+                raw_sql = f.read()
+            name = filename[:-len(".sql")]
+            models[name] = Model(
+                name=name,
+                layer=layer,
+                raw_sql=raw_sql,
+                refs=sorted(set(REF_PATTERN.findall(raw_sql))),
+                sources=sorted(set(SOURCE_PATTERN.findall(raw_sql))),
+            )
+    return models
+
+
+def execution_order(models: Dict[str, Model]) -> List[str]:
+    """
+    Topological order of the models, layer by layer (staging first), then by name.
+
+    Raises:
+        ValueError: On a reference to an unknown model or a cycle.
+    """
+    def rank(name: str) -> Tuple[int, str]:
+        layer = models[name].layer
+        return (LAYERS.index(layer) if layer in LAYERS else len(LAYERS), name)
+
+    for model in models.values():
+        unknown = [ref for ref in model.refs if ref not in models]
+        if unknown:
+            raise ValueError(f"Model '{model.name}' references unknown models: {unknown}")
+
+    pending = {name: set(model.refs) for name, model in models.items()}
+    order: List[str] = []
+    while pending:
+        ready = sorted((name for name, refs in pending.items() if not refs), key=rank)
+        if not ready:
+            raise ValueError(f"Cycle between models: {sorted(pending)}")
+        name = ready[0]
+        order.append(name)
+        del pending[name]
+        for refs in pending.values():
+            refs.discard(name)
+    return order
+
+
+def project_vars(project_dir: str, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Returns the `vars` of `dbt_project.yml`, updated with `overrides`."""
+    with open(os.path.join(project_dir, "dbt_project.yml")) as f:
+        project = yaml.safe_load(f)
+    return {**(project.get("vars") or {}), **(overrides or {})}
+
+
+class _MacroReturn(Exception):
+    """Raised by `return()` in a macro; carries the macro's return value."""
+
+    def __init__(self, value: Any):
+        super().__init__()
+        self.value = value
+
+
+def _macro_return(value: Any) -> None:
+    raise _MacroReturn(value)
+
+
+class _ReturningContext(Context):
+    """Jinja context where a macro call evaluates to the value of its `return()`, as in dbt."""
+
+    def call(__self, __obj, *args, **kwargs):
+        try:
+            return super().call(__obj, *args, **kwargs)
+        except _MacroReturn as e:
+            if not isinstance(__obj, Macro):
+                raise
+            return e.value
+
+
+class _CurrentRelation:
+    """`{{ this }}`: the table of the model being rendered, named after the model."""
+
+    def __init__(self, current_model: Dict[str, Any]):
+        self.current_model = current_model
+
+    def __str__(self) -> str:
+        return self.current_model["name"]
+
+
+def build_renderer(project_dir: str, dbt_vars: Dict[str, Any], incremental: bool = False) -> Callable[[Model], str]:
+    """
+    Returns `render(model)`, compiling a model to SQL and keeping its config in `model.config`.
+
+    The SQL is for a full build or, with `incremental`, for an incremental run
+    over the model's existing table (`{{ this }}` is the model name).
+    Project macros are loaded from `macros/`; files using dbt-only Jinja
+    (e.g. materializations) are skipped, the models do not call them.
+    """
+    env = Environment(extensions=["jinja2.ext.do"])
+    env.context_class = _ReturningContext
+    current_model: Dict[str, Any] = {"name": None, "config": {}}
+    context: Dict[str, Any] = {
+        "config": lambda *args, **kwargs: current_model["config"].update(kwargs) or "",
+        "ref": lambda name: name,
+        "source": lambda source_name, table: SourceRelation("benchmark", source_name, table),
+        "var": lambda name, default=None: dbt_vars.get(name, default),
+        "is_incremental": lambda: incremental,
+        # dbt's own macros, called by project overrides of them
+        "dbt": SimpleNamespace(is_incremental=lambda: incremental),
+        "log": lambda *args, **kwargs: "",
+        "return": _macro_return,
+        "target": {"name": "benchmark", "type": "duckdb"},
+        # The model being rendered, as seen by the macros (`model.name`, `this`)
+        "model": current_model,
+        "this": _CurrentRelation(current_model),
+    }
+
+    macros_dir = os.path.join(project_dir, "macros")
+    sources = []
+    for filename in sorted(os.listdir(macros_dir)) if os.path.isdir(macros_dir) else []:
+        if not filename.endswith(".sql"):
+            continue
+        with open(os.path.join(macros_dir, filename)) as f:
+            source = f.read()
+        try:
+            env.parse(source)
+        except Exception as e:
+            logger.debug(f"Skipping macros/{filename}: {e}")
+            continue
+        sources.append(source)
+    # One module, so macros can call macros defined in other files
+    module = env.from_string("\n".join(sources), globals=context).module
+    context.update({name: getattr(module, name) for name in dir(module) if not name.startswith("_")})
+
+    def render(model: Model) -> str:
+        current_model["name"] = model.name
+        current_model["config"] = model.config
+        sql = env.from_string(model.raw_sql, globals=context).render()
+        for pattern, replacement in SNOWFLAKE_SHIMS:
+            sql = re.sub(pattern, replacement, sql, flags=re.IGNORECASE)
+        return sql
+
+    return render
+
+
+class PeakMemorySampler:
+    """Samples the process RSS in a background thread; `peak` is the maximum seen."""
+
+    def __init__(self, interval_seconds: float = 0.01):
+        self.interval_seconds = interval_seconds
+        self.process = psutil.Process()
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            self._stop.wait(self.interval_seconds)
+
+    def __enter__(self) -> "PeakMemorySampler":
+        self.peak = self.process.memory_info().rss
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def _source_tables(data_dir: str, models: Dict[str, Model]) -> List[Tuple[str, str]]:
+    tables = sorted({source for model in models.values() for source in model.sources})
+    missing = [table for _, table in tables if not os.path.isdir(os.path.join(data_dir, table))]
+    if missing:
+        raise FileNotFoundError(f"No synthetic data for sources {missing} in '{data_dir}'.")
+    return tables
+
+
+def run_benchmark(
+    data_dir: str,
+    scale: str,
+    project_dir: str = DEFAULT_PROJECT_DIR,
+    database: str = ":memory:",
+    dbt_vars: Optional[Dict[str, Any]] = None,
+    max_fanout: float = 1.0,
+    memory_limit: Optional[str] = None,
+    threads: Optional[int] = None,
+) -> BenchmarkReport:
+    """
+    Builds every model on DuckDB over the synthetic sources in `data_dir`.
+
+    Args:
+        data_dir (str): Dataset written by `include.synthetic_data.generate_dataset`.
+        scale (str): Label of the dataset in the report.
+        project_dir (str): Root of the dbt project.
+        database (str): DuckDB database path (a file lets DuckDB spill to disk).
+        dbt_vars (dict): Overrides of the `dbt_project.yml` vars.
+        max_fanout (float): Allowed ratio of a model's rows to the rows of all its inputs.
+        memory_limit (str): DuckDB `memory_limit`, e.g. '8GB'.
+        threads (int): DuckDB worker threads (default: all cores).
+
+    Returns:
+        BenchmarkReport: Measurements in execution order and the failed row checks.
+    """
+    import duckdb
+
+    models = load_models(project_dir)
+    render = build_renderer(project_dir, project_vars(project_dir, dbt_vars))
+    connection = duckdb.connect(database)
+    try:
+        connection.execute("SET TimeZone = 'UTC'")
+        connection.execute("SET enable_progress_bar = false")
+        if memory_limit:
+            connection.execute(f"SET memory_limit = '{memory_limit}'")
+        if threads:
+            connection.execute(f"SET threads = {int(threads)}")
+        for macro in SHIM_MACROS:
+            connection.execute(macro)
+
+        report = BenchmarkReport(scale=scale, source_rows={})
+        row_counts: Dict[str, int] = {}
+        for source_name, table in _source_tables(data_dir, models):
+            connection.execute(f"CREATE SCHEMA IF NOT EXISTS {source_name}")
+            path = os.path.join(data_dir, table, "*.parquet")
+            connection.execute(
+                f"CREATE OR REPLACE VIEW {source_name}.{table} AS "
+                f"SELECT * FROM read_parquet('{path}', filename = true, file_row_number = true)"
+            )
+            rows = connection.execute(f"SELECT COUNT(*) FROM {source_name}.{table}").fetchone()[0]
+            report.source_rows[table] = row_counts[f"{source_name}.{table}"] = rows
+
+        for name in execution_order(models):
+            model = models[name]
+            sql = render(model)
+            with PeakMemorySampler() as memory:
+                start = time.perf_counter()
+                try:
+                    connection.execute(f"CREATE OR REPLACE TABLE {name} AS {sql}")
+                except duckdb.Error as e:
+                    raise RuntimeError(f"Model '{name}' failed on DuckDB: {e}") from e
+                seconds = time.perf_counter() - start
+            rows = row_counts[name] = connection.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+            inputs = [*model.refs, *(f"{source}.{table}" for source, table in model.sources)]
+            input_rows = sum(row_counts[i] for i in inputs)
+            result = ModelResult(name, model.layer, seconds, memory.peak, rows, input_rows)
+            report.models.append(result)
+            logger.info(f"[{scale}] {name}: {rows:,} rows in {seconds:.2f}s, peak RSS {memory.peak / 2**20:,.0f} MiB")
+
+            if input_rows and rows > max_fanout * input_rows:
+                report.violations.append(
+                    f"{name}: {rows:,} rows is more than {max_fanout:g}x its inputs ({input_rows:,} rows)"
+                )
+            if name in ROW_BOUNDS:
+                bound = connection.execute(f"SELECT {ROW_BOUNDS[name]}").fetchone()[0]
+                if rows > bound:
+                    report.violations.append(f"{name}: {rows:,} rows exceeds its bound {ROW_BOUNDS[name]} = {bound:,}")
+        return report
+    finally:
+        connection.close()
+
+
+def compare_scales(reports: List[BenchmarkReport], tolerance: float = 1.5) -> List[str]:
+    """
+    Flags models whose row count grows faster than the sources between scales.
+
+    Args:
+        reports (list): Reports of increasing scales.
+        tolerance (float): Allowed ratio of a model's row growth to the source row growth.
+
+    Returns:
+        list: One message per superlinear model and pair of consecutive scales.
+    """
+    findings = []
+    for smaller, larger in zip(reports, reports[1:]):
+        source_growth = sum(larger.source_rows.values()) / max(1, sum(smaller.source_rows.values()))
+        before = {result.name: result for result in smaller.models}
+        for result in larger.models:
+            previous = before.get(result.name)
+            if not previous or not previous.rows:
+                continue
+            growth = result.rows / previous.rows
+            if growth > tolerance * source_growth:
+                findings.append(
+                    f"{result.name}: rows grew {growth:.1f}x from {smaller.scale} to {larger.scale} "
+                    f"while the sources grew {source_growth:.1f}x"
+                )
+    return findings
+
+
+def format_report(report: BenchmarkReport) -> str:
+    """Renders a report as a fixed-width table."""
+    lines = [
+        f"Scale {report.scale} ({sum(report.source_rows.values()):,} source rows)",
+        f"{'model':<35} {'layer':<13} {'seconds':>9} {'peak MiB':>9} {'rows':>14}",
+    ]
+    for result in report.models:
+        lines.append(
+            f"{result.name:<35} {result.layer:<13} {result.seconds:>9.2f} "
+            f"{result.peak_memory_bytes / 2**20:>9,.0f} {result.rows:>14,}"
+        )
+    lines.append(f"{'total':<35} {'':<13} {sum(r.seconds for r in report.models):>9.2f}")
+    lines.extend(f"VIOLATION {violation}" for violation in report.violations)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the dbt models on DuckDB at several data scales.")
+    parser.add_argument("--scales", nargs="+", choices=sorted(SCALES, key=SCALES.get), default=["1m"])
+    parser.add_argument("--data-root", default=os.path.join("/tmp", "nu_benchmark"))
+    parser.add_argument("--project-dir", default=DEFAULT_PROJECT_DIR)
+    parser.add_argument("--memory-limit")
+    parser.add_argument("--threads", type=int)
+    parser.add_argument("--vars", type=json.loads, default={}, help="dbt vars as a JSON object")
+    parser.add_argument("--output", help="Write the reports as JSON to this path")
+    args = parser.parse_args(argv)
+
+    reports = []
+    for scale in sorted(args.scales, key=SCALES.get):
+        data_dir = os.path.join(args.data_root, scale)
+        if not os.path.isdir(data_dir):
+            logger.info(f"Generating the {scale} dataset in {data_dir}.")
+            generate_dataset(data_dir, config_for_scale(scale))
+        report = run_benchmark(
+            data_dir,
+            scale,
+            project_dir=args.project_dir,
+            # A database file lets DuckDB spill to disk at the larger scales
+            database=os.path.join(args.data_root, f"benchmark_{scale}.duckdb"),
+            dbt_vars=args.vars,
+            memory_limit=args.memory_limit,
+            threads=args.threads,
+        )
+        os.remove(os.path.join(args.data_root, f"benchmark_{scale}.duckdb"))
+        reports.append(report)
+        print(format_report(report), end="\n\n")
+
+    growth_findings = compare_scales(reports)
+    for finding in growth_findings:
+        print(f"VIOLATION {finding}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([asdict(report) for report in reports], f, indent=2)
+    return 1 if growth_findings or any(report.violations for report in reports) else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
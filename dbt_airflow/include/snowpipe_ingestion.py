@@ -0,0 +1,335 @@
+"""
+Purpose: Load progress of the Snowpipe-fed raw tables (`NU_INGESTION_MODE=snowpipe`).
+
+In the Snowpipe ingestion mode, the raw tables are native tables loaded by the
+`AUTO_INGEST` pipes of `macros/create_pipe.sql` (`<table>_pipe`) as soon as
+GCS notifies a new file, instead of external tables refreshed by the DAG. The
+DAG then only has to wait until each high-frequency pipe has loaded the files
+seen in GCS this run before starting dbt.
+
+`evaluate_pipe_progress` decides this from `SYSTEM$PIPE_STATUS` and the
+table's `COPY_HISTORY`, matching the new objects of the run (above the GCS
+manifest's high-water mark) with the files loaded after the object was written.
+
+A pipe never reloads a path it already loaded, so objects overwritten in
+place (`overwritten_objects`: their path was loaded before they were written)
+are reloaded by the DAG instead (`reload_overwritten_files`): the rows
+of the previous version are deleted by `_source_file` and the file is copied
+again with the pipe's own COPY statement and `FORCE = TRUE`, in one
+transaction. `SnowpipeMonitor` runs these lookups and statements through the
+Airflow Snowflake connection.
+
+The native tables of `create_pipe.sql` have the names of the external tables
+they replace: drop the external tables before switching `NU_INGESTION_MODE`
+to `snowpipe` (and the native tables before switching back).
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+logger = logging.getLogger(__name__)
+
+PIPE_SUFFIX = "_pipe"
+# `executionState` of a pipe that is ingesting notifications
+RUNNING_STATE = "RUNNING"
+# COPY_HISTORY statuses, compared lowercased
+LOADED_STATUSES = ("loaded",)
+FAILED_STATUSES = ("load failed", "partially loaded")
+# COPY_HISTORY only covers the last 14 days
+MAX_COPY_HISTORY_LOOKBACK = timedelta(days=14)
+# Column of the native tables holding each row's landed file (stage path)
+SOURCE_FILE_COLUMN = "_source_file"
+
+
+def pipe_name(table: str) -> str:
+    """Returns the pipe loading a raw table, e.g. `pix_movements_pipe`."""
+    return f"{table}{PIPE_SUFFIX}"
+
+
+def stage_path(object_name: str, data_prefix: str) -> str:
+    """
+    Returns a GCS object's path relative to the stage (rooted at the data prefix).
+
+    `Tables/pix_movements/batch.csv` -> `pix_movements/batch.csv`, the file
+    name COPY_HISTORY reports for loads from `@nu_dataset_stage`.
+    """
+    prefix = data_prefix.rstrip("/") + "/"
+    return object_name[len(prefix):] if object_name.startswith(prefix) else object_name
+
+
+def generation_time(generation: int) -> datetime:
+    """GCS object generations are the object's write time in microseconds since the epoch."""
+    return datetime.fromtimestamp(int(generation) / 1_000_000, tz=timezone.utc)
+
+
+@dataclass
+class PipeProgress:
+    """How far a pipe got through the objects expected this run."""
+
+    table: str
+    execution_state: str
+    pending_file_count: int
+    loaded: List[str] = field(default_factory=list)
+    pending: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def is_running(self) -> bool:
+        return self.execution_state == RUNNING_STATE
+
+    @property
+    def caught_up(self) -> bool:
+        return not self.pending and not self.failed
+
+    def summary(self) -> str:
+        return (
+            f"'{pipe_name(self.table)}' ({self.execution_state}, {self.pending_file_count} pending in pipe): "
+            f"{len(self.loaded)} loaded, {len(self.pending)} waiting, {len(self.failed)} failed"
+        )
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def evaluate_pipe_progress(
+    table: str,
+    pipe_status: Dict[str, Any],
+    copy_history: List[Dict[str, Any]],
+    expected_objects: Dict[str, int],
+    data_prefix: str,
+) -> PipeProgress:
+    """
+    Matches the objects expected this run with the pipe's copy history.
+
+    An object counts as loaded only by a load that finished after the object
+    was written (its generation), so a file overwritten in place is not
+    satisfied by the load of its previous version.
+
+    Args:
+        table (str): Raw table fed by the pipe.
+        pipe_status (dict): Parsed `SYSTEM$PIPE_STATUS` of the pipe.
+        copy_history (list): COPY_HISTORY rows with `file_name`, `status`,
+            `last_load_time` and `first_error_message`.
+        expected_objects (dict): {GCS object name: generation} landed this run.
+        data_prefix (str): Root landing prefix (the stage location).
+
+    Returns:
+        PipeProgress: Expected objects split into loaded, pending and failed.
+    """
+    progress = PipeProgress(
+        table=table,
+        execution_state=pipe_status.get("executionState", "UNKNOWN"),
+        pending_file_count=int(pipe_status.get("pendingFileCount") or 0),
+    )
+
+    loads_by_path: Dict[str, List[Dict[str, Any]]] = {}
+    for row in copy_history:
+        loads_by_path.setdefault(row["file_name"].lstrip("/"), []).append(row)
+
+    for object_name, generation in sorted(expected_objects.items()):
+        path = stage_path(object_name, data_prefix)
+        written_at = generation_time(generation)
+        loads = [
+            row for row in loads_by_path.get(path, [])
+            if row.get("last_load_time") and _as_utc(row["last_load_time"]) >= written_at
+        ]
+        if not loads:
+            progress.pending.append(path)
+            continue
+        latest = max(loads, key=lambda row: _as_utc(row["last_load_time"]))
+        status = (latest.get("status") or "").lower()
+        if status in LOADED_STATUSES:
+            progress.loaded.append(path)
+        elif status in FAILED_STATUSES:
+            progress.failed[path] = latest.get("first_error_message") or status
+        else:
+            progress.pending.append(path)
+    return progress
+
+
+def copy_history_start(expected_objects: Dict[str, int], now: Optional[datetime] = None) -> datetime:
+    """Start of the COPY_HISTORY window covering every expected object (at most 14 days back)."""
+    now = now or datetime.now(timezone.utc)
+    earliest = min((generation_time(g) for g in expected_objects.values()), default=now)
+    return max(earliest - timedelta(minutes=5), now - MAX_COPY_HISTORY_LOOKBACK)
+
+
+def overwritten_objects(
+    copy_history: List[Dict[str, Any]],
+    written_objects: Dict[str, int],
+    data_prefix: str,
+) -> List[str]:
+    """
+    Tells which objects written this run overwrote a path that was already loaded.
+
+    The pipe skips these paths: its load metadata covers the same 14 days as
+    COPY_HISTORY, so `copy_history` should start `MAX_COPY_HISTORY_LOOKBACK` ago.
+
+    Args:
+        copy_history (list): COPY_HISTORY rows with `file_name` and `last_load_time`.
+        written_objects (dict): {GCS object name: generation} written this run.
+        data_prefix (str): Root landing prefix (the stage location).
+
+    Returns:
+        list: Sorted names of the objects with a load of their path before they were written.
+    """
+    load_times: Dict[str, List[datetime]] = {}
+    for row in copy_history:
+        if row.get("last_load_time"):
+            load_times.setdefault(row["file_name"].lstrip("/"), []).append(_as_utc(row["last_load_time"]))
+    return sorted(
+        name for name, generation in written_objects.items()
+        if any(loaded_at < generation_time(generation) for loaded_at in load_times.get(stage_path(name, data_prefix), []))
+    )
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def forced_copy(pipe_definition: str, files: Sequence[str]) -> str:
+    """
+    Turns a pipe's COPY statement into a forced load of some of its files.
+
+    Args:
+        pipe_definition (str): The `definition` of `DESCRIBE PIPE` (`COPY INTO ... FROM @stage/<table>/ ...`).
+        files (list): File names relative to the COPY's stage location.
+
+    Returns:
+        str: The COPY restricted to `files` (`FILES = (...)`) with `FORCE = TRUE`.
+    """
+    copy = pipe_definition.strip().rstrip(";")
+    files_option = f"FILES = ({', '.join(_quote(name) for name in files)})"
+    copy, replaced = re.subn(r"\bFILE_FORMAT\s*=", f"{files_option}\n FILE_FORMAT =", copy, count=1, flags=re.IGNORECASE)
+    if not replaced:
+        copy = f"{copy}\n{files_option}"
+    return f"{copy}\nFORCE = TRUE"
+
+
+class PipeReloadClient(Protocol):
+    """Snowflake access needed to reload the overwritten files of a pipe-fed table."""
+
+    def pipe_definition(self, table: str) -> str:
+        ...
+
+    def columns(self, table: str) -> List[str]:
+        ...
+
+    def run_in_transaction(self, statements: List[str]) -> None:
+        ...
+
+
+def reload_overwritten_files(
+    client: PipeReloadClient,
+    table: str,
+    object_names: Sequence[str],
+    data_prefix: str,
+) -> List[str]:
+    """
+    Replaces the rows of files overwritten in place with their current version.
+
+    Snowpipe skips paths it already loaded, so waiting for the pipe would time
+    out and a plain reload would duplicate rows. The rows of each file are
+    deleted by `_source_file` and the files are copied again, forced, with the
+    pipe's COPY statement (which reads `@stage/<table>/`), in one transaction.
+    Tables without `_source_file` cannot tell the rows of a file apart and are
+    not reloaded (logged as a warning).
+
+    Args:
+        client (PipeReloadClient): Snowflake access.
+        table (str): Raw table fed by `<table>_pipe`.
+        object_names (list): Overwritten GCS object names.
+        data_prefix (str): Root landing prefix (the stage location).
+
+    Returns:
+        list: Stage paths of the reloaded files.
+    """
+    paths = sorted(stage_path(name, data_prefix) for name in object_names)
+    if not paths:
+        return []
+    if SOURCE_FILE_COLUMN not in [column.lower() for column in client.columns(table)]:
+        logger.warning(
+            f"'{table}' has no {SOURCE_FILE_COLUMN} column; the overwritten files {paths} are not reloaded."
+        )
+        return []
+
+    table_prefix = f"{table}/"
+    files = [path[len(table_prefix):] if path.startswith(table_prefix) else path for path in paths]
+    client.run_in_transaction([
+        f"DELETE FROM {table} WHERE {SOURCE_FILE_COLUMN} IN ({', '.join(_quote(path) for path in paths)})",
+        forced_copy(client.pipe_definition(table), files),
+    ])
+    logger.info(f"Reloaded {len(paths)} overwritten file(s) into '{table}': {paths}")
+    return paths
+
+
+class SnowpipeMonitor:
+    """Reads pipe status and copy history of the raw tables, and reloads their files, through the Airflow Snowflake connection."""
+
+    def __init__(self, snowflake_conn_id: str, database: str, schema: str):
+        self.snowflake_conn_id = snowflake_conn_id
+        self.database = database
+        self.schema = schema
+
+    def _hook(self):
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+
+        return SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id)
+
+    def pipe_status(self, table: str) -> Dict[str, Any]:
+        """Returns the parsed `SYSTEM$PIPE_STATUS` of the table's pipe."""
+        row = self._hook().get_first(
+            "SELECT SYSTEM$PIPE_STATUS(%s)",
+            parameters=[f"{self.database}.{self.schema}.{pipe_name(table)}"],
+        )
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def copy_history(self, table: str, start_time: datetime) -> List[Dict[str, Any]]:
+        """Returns the table's COPY_HISTORY rows since `start_time`."""
+        rows = self._hook().get_records(
+            f"""
+            SELECT file_name, status, last_load_time, first_error_message
+            FROM TABLE({self.database}.information_schema.copy_history(
+                TABLE_NAME => %s,
+                START_TIME => %s::TIMESTAMP_LTZ
+            ))
+            """,
+            parameters=[f"{self.database}.{self.schema}.{table}", start_time.isoformat()],
+        )
+        return [
+            {"file_name": file_name, "status": status, "last_load_time": last_load_time, "first_error_message": error}
+            for file_name, status, last_load_time, error in rows
+        ]
+
+    def pipe_definition(self, table: str) -> str:
+        """Returns the COPY statement of the table's pipe."""
+        hook = self._hook()
+        with hook.get_conn() as conn, conn.cursor() as cursor:
+            cursor.execute(f"DESCRIBE PIPE {self.database}.{self.schema}.{pipe_name(table)}")
+            names = [column[0].lower() for column in cursor.description]
+            row = cursor.fetchone()
+        return row[names.index("definition")]
+
+    def columns(self, table: str) -> List[str]:
+        """Returns the column names of a raw table."""
+        rows = self._hook().get_records(
+            f"""
+            SELECT column_name
+            FROM {self.database}.information_schema.columns
+            WHERE table_schema = %s AND table_name = %s
+            """,
+            parameters=[self.schema.upper(), table.upper()],
+        )
+        return [name for (name,) in rows]
+
+    def run_in_transaction(self, statements: List[str]) -> None:
+        """Runs the statements in the raw schema as one transaction."""
+        self._hook().run(
+            [f"USE SCHEMA {self.database}.{self.schema}", *statements],
+            autocommit=False,
+        )
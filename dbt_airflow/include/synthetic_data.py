@@ -0,0 +1,357 @@
+"""
+Purpose: Synthetic Nu data for every source in `sources.yml`, at benchmark scale.
+
+Generates the 13 raw tables as Parquet files with the column names and types
+the CSV external tables expose to dbt (e.g. `transfer_*` completion timestamps
+as epoch-seconds text), so the models run unchanged on top of them:
+
+    <output_dir>/<table>/part-00000.parquet
+
+The high-frequency sources (`pix_movements`, `transfer_ins`, `transfer_outs`)
+scale with the total number of transactions (`SCALES`: 1M / 10M / 100M). They
+are written in chunks, so memory stays bounded by `chunk_rows` at any scale.
+Transactions are spread over accounts with a Zipf-like skew (a few accounts
+hold most of the volume, many hold a handful, some never transact), and
+`d_time` is a gap-free daily calendar covering the whole transaction period.
+
+    python -m include.synthetic_data <output_dir> --scale 10m
+"""
+
+import argparse
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Total high-frequency rows (PIX + transfers) per named scale
+SCALES = {
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+    "100m": 100_000_000,
+}
+
+# Share of the transactions landing in each high-frequency source
+TRANSACTION_SHARES = {
+    "pix_movements": 0.6,
+    "transfer_ins": 0.2,
+    "transfer_outs": 0.2,
+}
+
+SOURCE_TABLES = (
+    "accounts", "pix_movements", "city", "country", "customers",
+    "d_month", "d_time", "d_week", "d_weekday", "d_year",
+    "state", "transfer_ins", "transfer_outs",
+)
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Small fixed geography: {country: [(state, [cities])]}
+GEOGRAPHY = {
+    "Brazil": [
+        ("Sao Paulo", ["Sao Paulo", "Campinas", "Santos"]),
+        ("Rio de Janeiro", ["Rio de Janeiro", "Niteroi"]),
+        ("Minas Gerais", ["Belo Horizonte", "Uberlandia"]),
+    ],
+    "Argentina": [("Buenos Aires", ["Buenos Aires", "La Plata"])],
+    "Mexico": [("Jalisco", ["Guadalajara"]), ("Nuevo Leon", ["Monterrey"])],
+    "Colombia": [("Antioquia", ["Medellin"]), ("Cundinamarca", ["Bogota"])],
+}
+
+FIRST_NAMES = ("Ana", "Bruno", "Camila", "Diego", "Fernanda", "Gabriel", "Juliana", "Lucas", "Mariana", "Rafael")
+LAST_NAMES = ("Silva", "Santos", "Oliveira", "Souza", "Pereira", "Costa", "Rodrigues", "Almeida", "Nascimento")
+
+# Types the CSV external tables expose (see macros/reconcile_external_tables.sql)
+SCHEMAS = {
+    "accounts": pa.schema([
+        ("account_id", pa.int64()), ("account_name", pa.string()),
+        ("created_at", pa.timestamp("us")), ("status", pa.string()),
+    ]),
+    "pix_movements": pa.schema([
+        ("id", pa.int64()), ("account_id", pa.int64()), ("pix_amount", pa.decimal128(18, 2)),
+        ("pix_requested_at", pa.timestamp("us")), ("pix_completed_at", pa.timestamp("us")),
+        ("status", pa.string()), ("in_or_out", pa.string()),
+    ]),
+    "transfer_ins": pa.schema([
+        ("id", pa.int64()), ("account_id", pa.int64()), ("amount", pa.decimal128(18, 2)),
+        ("transaction_requested_at", pa.string()), ("transaction_completed_at", pa.string()),
+        ("status", pa.string()),
+    ]),
+    "city": pa.schema([("city_name", pa.string()), ("state_id", pa.int64()), ("city_id", pa.int64())]),
+    "state": pa.schema([("state", pa.string()), ("country_id", pa.int32()), ("state_id", pa.int32())]),
+    "country": pa.schema([("country", pa.string()), ("country_id", pa.int64())]),
+    "customers": pa.schema([
+        ("customer_id", pa.int64()), ("first_name", pa.string()), ("last_name", pa.string()),
+        ("customer_city", pa.int64()), ("cpf", pa.int64()), ("country_name", pa.string()),
+    ]),
+    "d_time": pa.schema([
+        ("time_id", pa.int64()), ("action_timestamp", pa.string()), ("week_id", pa.int32()),
+        ("month_id", pa.int32()), ("year_id", pa.int32()), ("weekday_id", pa.int32()),
+    ]),
+    "d_week": pa.schema([("week_id", pa.int32()), ("action_week", pa.int32())]),
+    "d_month": pa.schema([("month_id", pa.int32()), ("action_month", pa.int64())]),
+    "d_year": pa.schema([("year_id", pa.int32()), ("action_year", pa.int32())]),
+    "d_weekday": pa.schema([("weekday_id", pa.int32()), ("action_weekday", pa.string())]),
+}
+SCHEMAS["transfer_outs"] = SCHEMAS["transfer_ins"]
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    """
+    Shape of a generated dataset.
+
+    Attributes:
+        transactions: Total rows across the high-frequency sources.
+        start_date: First day of the calendar and of the transactions.
+        end_date: Last day of the calendar and of the transactions.
+        transactions_per_account: Average transactions per account; sets the
+            number of accounts.
+        account_skew: Zipf exponent of the transactions per account (0 is uniform).
+        completed_share: Share of transactions with status 'completed' (the
+            staging models drop the rest).
+        seed: Random seed; the same config always yields the same data.
+    """
+
+    transactions: int
+    start_date: date = date(2020, 1, 1)
+    end_date: date = date(2020, 12, 31)
+    transactions_per_account: int = 50
+    account_skew: float = 1.1
+    completed_share: float = 0.97
+    seed: int = 42
+
+    @property
+    def accounts(self) -> int:
+        return max(10, self.transactions // self.transactions_per_account)
+
+    @property
+    def days(self) -> int:
+        return (self.end_date - self.start_date).days + 1
+
+
+def config_for_scale(scale: str, **overrides) -> SyntheticConfig:
+    """Returns the config of a named scale (`1m`, `10m`, `100m`)."""
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale '{scale}'; expected one of {sorted(SCALES)}.")
+    return SyntheticConfig(transactions=SCALES[scale], **overrides)
+
+
+def account_sampler(config: SyntheticConfig, rng: np.random.Generator):
+    """
+    Returns `sample(n)`, drawing account ids with a Zipf-like skew.
+
+    Account ranks get weight 1 / rank^skew and are shuffled onto the account
+    ids, so the heaviest accounts are not simply the lowest ids.
+    """
+    ranks = np.arange(1, config.accounts + 1, dtype=np.float64)
+    cumulative = np.cumsum(ranks ** -config.account_skew)
+    cumulative /= cumulative[-1]
+    account_ids = rng.permutation(config.accounts).astype(np.int64) + 1
+
+    def sample(n: int) -> np.ndarray:
+        rank_index = np.searchsorted(cumulative, rng.random(n), side="right")
+        return account_ids[np.minimum(rank_index, config.accounts - 1)]
+
+    return sample
+
+
+def _epoch_seconds(day: date) -> int:
+    return (day - date(1970, 1, 1)).days * 86400
+
+
+def _timestamps(epoch_seconds: np.ndarray) -> pa.Array:
+    return pa.array(epoch_seconds * 1_000_000, pa.int64()).cast(pa.timestamp("us"))
+
+
+def _amounts(rng: np.random.Generator, n: int) -> pa.Array:
+    # Log-normal: mostly small payments with a long tail of large transfers
+    return pa.array(np.round(rng.lognormal(mean=4.5, sigma=1.4, size=n), 2)).cast(pa.decimal128(18, 2))
+
+
+def _choice(rng: np.random.Generator, values, n: int, p=None) -> pa.Array:
+    return pa.array(np.asarray(values, dtype=object)[rng.choice(len(values), size=n, p=p)], pa.string())
+
+
+def geography_tables() -> Dict[str, pa.Table]:
+    """Returns the `country`, `state` and `city` tables of `GEOGRAPHY`."""
+    countries, states, cities = [], [], []
+    for country_id, (country, country_states) in enumerate(GEOGRAPHY.items(), start=1):
+        countries.append({"country": country, "country_id": country_id})
+        for state, state_cities in country_states:
+            state_id = len(states) + 1
+            states.append({"state": state, "country_id": country_id, "state_id": state_id})
+            for city in state_cities:
+                cities.append({"city_name": city, "state_id": state_id, "city_id": len(cities) + 1})
+    return {
+        "country": pa.Table.from_pylist(countries, SCHEMAS["country"]),
+        "state": pa.Table.from_pylist(states, SCHEMAS["state"]),
+        "city": pa.Table.from_pylist(cities, SCHEMAS["city"]),
+    }
+
+
+def calendar_tables(start_date: date, end_date: date) -> Dict[str, pa.Table]:
+    """
+    Returns `d_time` (one row per day, no gaps) and its lookup tables.
+
+    `time_id` is YYYYMMDD; `week_id`, `month_id` and `weekday_id` are the ISO
+    week, month and ISO weekday numbers; `year_id` counts years from `start_date`.
+    """
+    days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    d_time = pa.Table.from_pylist([
+        {
+            "time_id": int(day.strftime("%Y%m%d")),
+            "action_timestamp": day.strftime("%Y-%m-%d 00:00:00"),
+            "week_id": day.isocalendar()[1],
+            "month_id": day.month,
+            "year_id": day.year - start_date.year + 1,
+            "weekday_id": day.isoweekday(),
+        }
+        for day in days
+    ], SCHEMAS["d_time"])
+    years = range(start_date.year, end_date.year + 1)
+    return {
+        "d_time": d_time,
+        "d_week": pa.Table.from_pylist(
+            [{"week_id": week, "action_week": week} for week in range(1, 54)], SCHEMAS["d_week"]
+        ),
+        "d_month": pa.Table.from_pylist(
+            [{"month_id": month, "action_month": month} for month in range(1, 13)], SCHEMAS["d_month"]
+        ),
+        "d_year": pa.Table.from_pylist(
+            [{"year_id": year - start_date.year + 1, "action_year": year} for year in years], SCHEMAS["d_year"]
+        ),
+        "d_weekday": pa.Table.from_pylist(
+            [{"weekday_id": i, "action_weekday": name} for i, name in enumerate(WEEKDAYS, start=1)],
+            SCHEMAS["d_weekday"],
+        ),
+    }
+
+
+def account_tables(config: SyntheticConfig, rng: np.random.Generator, city_ids: List[int],
+                   city_countries: List[str]) -> Dict[str, pa.Table]:
+    """Returns `accounts` and `customers` (one customer per account)."""
+    n = config.accounts
+    ids = np.arange(1, n + 1, dtype=np.int64)
+    start = _epoch_seconds(config.start_date)
+    # Most accounts predate the period; some open during it
+    created = start + rng.integers(-3 * 365 * 86400, config.days * 86400, size=n)
+    accounts = pa.table({
+        "account_id": ids,
+        "account_name": pc.binary_join_element_wise("Account ", pa.array(ids).cast(pa.string()), ""),
+        "created_at": _timestamps(created),
+        "status": _choice(rng, ["active", "inactive", "blocked"], n, p=[0.9, 0.08, 0.02]),
+    }, schema=SCHEMAS["accounts"])
+
+    city_index = rng.integers(0, len(city_ids), size=n)
+    cpf = rng.integers(10_000_000_000, 99_999_999_999, size=n)
+    # A few malformed (10-digit) or missing CPFs for the data quality flags
+    cpf = np.where(rng.random(n) < 0.02, cpf // 10, cpf)
+    customers = pa.table({
+        "customer_id": ids,
+        "first_name": _choice(rng, FIRST_NAMES, n),
+        "last_name": _choice(rng, LAST_NAMES, n),
+        "customer_city": pa.array(np.asarray(city_ids, dtype=np.int64)[city_index]),
+        "cpf": pa.array(cpf, mask=rng.random(n) < 0.01),
+        "country_name": pa.array(np.asarray(city_countries, dtype=object)[city_index], pa.string()),
+    }, schema=SCHEMAS["customers"])
+    return {"accounts": accounts, "customers": customers}
+
+
+def transaction_chunks(table: str, rows: int, config: SyntheticConfig, rng: np.random.Generator,
+                       sample_accounts, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pa.Table]:
+    """
+    Yields `rows` rows of a high-frequency source in chunks of at most `chunk_rows`.
+
+    Requests are uniform over the calendar period and complete seconds to
+    minutes later. PIX timestamps are typed; transfer timestamps are text
+    (requested as ISO-8601, completed as epoch seconds), as landed.
+    """
+    start = _epoch_seconds(config.start_date)
+    statuses = ["completed", "failed", "pending"]
+    status_p = [config.completed_share, (1 - config.completed_share) / 2, (1 - config.completed_share) / 2]
+    for offset in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - offset)
+        requested = start + rng.integers(0, config.days * 86400, size=n)
+        completed = requested + rng.exponential(30.0, size=n).astype(np.int64) + 1
+        columns = {
+            "id": np.arange(offset + 1, offset + n + 1, dtype=np.int64),
+            "account_id": sample_accounts(n),
+        }
+        if table == "pix_movements":
+            columns.update({
+                "pix_amount": _amounts(rng, n),
+                "pix_requested_at": _timestamps(requested),
+                "pix_completed_at": _timestamps(completed),
+                "status": _choice(rng, statuses, n, p=status_p),
+                "in_or_out": _choice(rng, ["pix_in", "pix_out"], n),
+            })
+        else:
+            columns.update({
+                "amount": _amounts(rng, n),
+                "transaction_requested_at": pc.strftime(_timestamps(requested), "%Y-%m-%d %H:%M:%S"),
+                "transaction_completed_at": pa.array(completed).cast(pa.string()),
+                "status": _choice(rng, statuses, n, p=status_p),
+            })
+        yield pa.table(columns, schema=SCHEMAS[table])
+
+
+def _write_parts(output_dir: str, table: str, parts: Iterator[pa.Table]) -> int:
+    table_dir = os.path.join(output_dir, table)
+    os.makedirs(table_dir, exist_ok=True)
+    rows = 0
+    for index, part in enumerate(parts):
+        pq.write_table(part, os.path.join(table_dir, f"part-{index:05d}.parquet"))
+        rows += part.num_rows
+    return rows
+
+
+def generate_dataset(output_dir: str, config: SyntheticConfig, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict[str, int]:
+    """
+    Writes every source table of `config` under `output_dir`.
+
+    Args:
+        output_dir (str): Dataset root; one sub-directory of Parquet parts per table.
+        config (SyntheticConfig): Dataset shape.
+        chunk_rows (int): Rows per Parquet part of the high-frequency sources.
+
+    Returns:
+        dict: {table: row count} for the 13 source tables.
+    """
+    rng = np.random.default_rng(config.seed)
+    tables = {**geography_tables(), **calendar_tables(config.start_date, config.end_date)}
+    country_by_state = dict(zip(tables["state"]["state_id"].to_pylist(), tables["state"]["country_id"].to_pylist()))
+    country_names = dict(zip(tables["country"]["country_id"].to_pylist(), tables["country"]["country"].to_pylist()))
+    city_countries = [country_names[country_by_state[state_id]] for state_id in tables["city"]["state_id"].to_pylist()]
+    tables.update(account_tables(config, rng, tables["city"]["city_id"].to_pylist(), city_countries))
+
+    row_counts = {name: _write_parts(output_dir, name, iter([table])) for name, table in tables.items()}
+
+    sample_accounts = account_sampler(config, rng)
+    for table, share in TRANSACTION_SHARES.items():
+        rows = int(config.transactions * share)
+        logger.info(f"Generating {rows:,} rows of {table}.")
+        row_counts[table] = _write_parts(
+            output_dir, table, transaction_chunks(table, rows, config, rng, sample_accounts, chunk_rows)
+        )
+    return {table: row_counts[table] for table in SOURCE_TABLES}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Generate synthetic Nu source data.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1m")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    counts = generate_dataset(args.output_dir, config_for_scale(args.scale, seed=args.seed))
+    for name, count in counts.items():
+        print(f"{name:<15} {count:>12,}")
@@ -0,0 +1,180 @@
+"""
+Purpose: Map the update-frequency tiers of the raw tables to dbt selections.
+
+A model belongs to the least frequent tier among its sources, so it is
+rebuilt after any of its inputs changed: `fct_transactions` (pix movements and
+transfers) is high frequency, while `dim_account` (accounts, and transactions
+through `int_account_daily_activity`) is medium frequency. The models of a
+`standalone` tier are built apart (e.g. the low-frequency calendar and
+locations, in their own DAG); its sources only claim the models reading no
+other tier's source, so `fct_transactions` stays high frequency although it
+reads `base_time_dimension`, and reads its last build.
+
+The DAG runs each tier's selection once its sources are loaded and validated,
+or once the groups of the tiers it reads (`tier_upstreams`) were rebuilt.
+`tier_selection` builds each tier's `select`/`exclude` in dbt node selection
+syntax, and `changed_tiers` tells which tiers have new data this run.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _reached_tiers(manifest: Dict[str, Any], tiers: Dict[str, List[str]], source_name: str) -> Dict[str, List[str]]:
+    """Returns {model node id: tiers whose sources it is downstream of, in `tiers` order}."""
+    child_map = manifest.get("child_map", {})
+    sources_by_table = {
+        node_id.split(".")[-1]: node_id
+        for node_id in child_map
+        if node_id.startswith("source.") and node_id.split(".")[-2] == source_name
+    }
+
+    reached_by: Dict[str, List[str]] = {}
+    for tier, tables in tiers.items():
+        reached = set()
+        queue = deque(sources_by_table[table] for table in tables if table in sources_by_table)
+        while queue:
+            for child in child_map.get(queue.popleft(), []):
+                if child.startswith("model.") and child not in reached:
+                    reached.add(child)
+                    queue.append(child)
+        for node_id in reached:
+            reached_by.setdefault(node_id, []).append(tier)
+    return reached_by
+
+
+def _model_tiers(
+    manifest: Dict[str, Any],
+    tiers: Dict[str, List[str]],
+    source_name: str,
+    standalone: Iterable[str] = (),
+) -> Dict[str, str]:
+    """Returns {model node id: tier}, the least frequent tier among its sources (see the module docstring)."""
+    standalone = set(standalone)
+    model_tiers = {}
+    for node_id, reached_by in _reached_tiers(manifest, tiers, source_name).items():
+        joint = [tier for tier in reached_by if tier not in standalone]
+        model_tiers[node_id] = (joint or reached_by)[-1]
+    return model_tiers
+
+
+def tier_models(
+    manifest: Dict[str, Any],
+    tiers: Dict[str, List[str]],
+    source_name: str,
+    standalone: Iterable[str] = (),
+) -> Dict[str, List[str]]:
+    """
+    Assigns every model downstream of the raw tables to the least frequent tier among its sources.
+
+    Args:
+        manifest (dict): Parsed dbt `manifest.json` (its `child_map` is walked).
+        tiers (dict): {tier: [source tables]}, ordered by decreasing update frequency.
+        source_name (str): dbt source the raw tables are declared in.
+        standalone (list): Tiers whose models are built apart; they only own the
+            models reading no source of another tier.
+
+    Returns:
+        dict: {tier: sorted model names}.
+    """
+    models: Dict[str, List[str]] = {tier: [] for tier in tiers}
+    for node_id, tier in _model_tiers(manifest, tiers, source_name, standalone).items():
+        models[tier].append(node_id.split(".")[-1])
+    return {tier: sorted(names) for tier, names in models.items()}
+
+
+def tier_upstreams(
+    tiers: Dict[str, List[str]],
+    source_name: str,
+    manifest: Optional[Dict[str, Any]] = None,
+    standalone: Iterable[str] = (),
+) -> Dict[str, List[str]]:
+    """
+    Tells, for every tier, the other tiers owning a direct parent of one of its models.
+
+    A tier's dbt group must run after the groups of these tiers, and again when
+    they rebuilt their models, even if its own sources did not change. Parents
+    in `standalone` tiers are left out: their models are built apart. Without a
+    manifest, every tier is assumed to read all more frequent ones.
+
+    Args:
+        tiers (dict): {tier: [source tables]}, ordered by decreasing update frequency.
+        source_name (str): dbt source the raw tables are declared in.
+        manifest (dict): Parsed dbt `manifest.json`, if available.
+        standalone (list): Tiers whose models are built apart (see `tier_models`).
+
+    Returns:
+        dict: {tier: upstream tiers, in `tiers` order}.
+    """
+    standalone = set(standalone)
+    if manifest is None:
+        names = [tier for tier in tiers if tier not in standalone]
+        return {tier: names[:names.index(tier)] if tier in names else [] for tier in tiers}
+
+    model_tiers = _model_tiers(manifest, tiers, source_name, standalone)
+    upstreams: Dict[str, set] = {tier: set() for tier in tiers}
+    for parent, children in manifest.get("child_map", {}).items():
+        parent_tier = model_tiers.get(parent)
+        if parent_tier is None or parent_tier in standalone:
+            continue
+        for child in children:
+            child_tier = model_tiers.get(child)
+            if child_tier is not None and child_tier != parent_tier:
+                upstreams[child_tier].add(parent_tier)
+    return {tier: [upstream for upstream in tiers if upstream in upstreams[tier]] for tier in tiers}
+
+
+def tier_selection(
+    tiers: Dict[str, List[str]],
+    source_name: str,
+    manifest: Optional[Dict[str, Any]] = None,
+    standalone: Iterable[str] = (),
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Builds the dbt selection of each tier, from the most to the least frequent.
+
+    Without a manifest, a tier selects the children of its sources and
+    excludes those of every tier taking precedence over it (less frequent
+    tiers, and all other tiers for a `standalone` one), which dbt resolves
+    itself. Cosmos applies `exclude` only within the selected nodes (where the
+    other tiers' sources are missing), so with a manifest the tier's models are
+    resolved up front (`tier_models`) and selected by name, with their tests.
+
+    Args:
+        tiers (dict): {tier: [source tables]}, ordered by decreasing update frequency.
+        source_name (str): dbt source the raw tables are declared in.
+        manifest (dict): Parsed dbt `manifest.json`, if available.
+        standalone (list): Tiers whose models are built apart (see `tier_models`).
+
+    Returns:
+        dict: {tier: {"select": [...], "exclude": [...]}}. An empty `select`
+        means the tier owns no model.
+    """
+    standalone = set(standalone)
+    if manifest is not None:
+        return {
+            tier: {"select": models, "exclude": []}
+            for tier, models in tier_models(manifest, tiers, source_name, standalone).items()
+        }
+
+    names = list(tiers)
+    selection = {}
+    for index, tier in enumerate(names):
+        less_frequent = names[index + 1:]
+        if tier in standalone:
+            precedence = [other for other in names if other not in standalone] + [
+                other for other in less_frequent if other in standalone
+            ]
+        else:
+            precedence = [other for other in less_frequent if other not in standalone]
+        selection[tier] = {
+            "select": [f"source:{source_name}.{table}+" for table in tiers[tier]],
+            "exclude": [f"source:{source_name}.{table}+" for other in precedence for table in tiers[other]],
+        }
+    return selection
+
+
+def changed_tiers(changed_tables: Iterable[str], tiers: Dict[str, List[str]]) -> List[str]:
+    """Returns the tiers with at least one changed table, in `tiers` order."""
+    changed = set(changed_tables or [])
+    return [tier for tier, tables in tiers.items() if changed.intersection(tables)]
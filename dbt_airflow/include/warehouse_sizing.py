@@ -0,0 +1,77 @@
+"""
+Purpose: Adaptive warehouse sizing of the dbt models from their previous run.
+
+Models are routed to warehouses statically in `dbt_project.yml`
+(`warehouse_routing`, by model name or tag). With adaptive sizing enabled, the
+DAG reads each model's last successful run from `PIPELINE_METRICS` (execution
+time, bytes scanned, remote spill and the warehouse it ran on) and moves it
+one step along a ladder of warehouses ordered from smallest to largest:
+
+- up, when the model spilled to remote storage, or was slow while scanning a
+  lot of data (a larger warehouse only speeds up scan/compute-bound queries);
+- down, when it finished quickly on a warehouse above the smallest one.
+
+The result is passed to dbt as `var('warehouse_overrides')`, which takes
+precedence over the static routing. Models without history, or last run on a
+warehouse outside the ladder, keep their static route.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SizingPolicy:
+    """Thresholds for moving a model along the warehouse ladder."""
+
+    scale_up_seconds: float = 300.0
+    scale_up_bytes: int = 10 * 1024 ** 3
+    scale_down_seconds: float = 30.0
+
+
+def choose_warehouses(
+    last_runs: Mapping[str, Mapping[str, Any]],
+    ladder: Sequence[str],
+    policy: SizingPolicy = SizingPolicy(),
+) -> Dict[str, str]:
+    """
+    Picks a warehouse per model from the metrics of its previous run.
+
+    Args:
+        last_runs (dict): {model name: {"execution_time", "bytes_scanned",
+            "bytes_spilled_to_remote_storage", "warehouse_name"}}.
+        ladder (list): Warehouse names from smallest to largest.
+        policy (SizingPolicy): Scale-up and scale-down thresholds.
+
+    Returns:
+        dict: {model name: warehouse} for every model whose previous run was
+        on a warehouse of the ladder (the others keep their static route).
+    """
+    ladder_index = {warehouse.upper(): i for i, warehouse in enumerate(ladder)}
+    choices = {}
+    for name, run in sorted(last_runs.items()):
+        current = ladder_index.get((run.get("warehouse_name") or "").upper())
+        if current is None:
+            continue
+        seconds = run.get("execution_time") or 0.0
+        scanned = run.get("bytes_scanned") or 0
+
+        step = 0
+        if (run.get("bytes_spilled_to_remote_storage") or 0) > 0 or (
+            seconds >= policy.scale_up_seconds and scanned >= policy.scale_up_bytes
+        ):
+            step = 1
+        elif seconds < policy.scale_down_seconds:
+            step = -1
+
+        chosen = min(max(current + step, 0), len(ladder) - 1)
+        if chosen != current:
+            logger.info(
+                f"{name}: {ladder[current]} -> {ladder[chosen]} "
+                f"({seconds:.1f}s, {scanned / 1024 ** 3:.2f} GB scanned last run)."
+            )
+        choices[name] = ladder[chosen]
+    return choices
@@ -0,0 +1,8 @@
+"""Shared pytest configuration for the Astro project tests."""
+
+import os
+import sys
+
+# Make the project root importable so tests can use `include.*` modules the
+# same way the DAGs do inside the Astro Runtime image.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
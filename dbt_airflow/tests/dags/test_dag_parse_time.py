@@ -0,0 +1,56 @@
+"""Parse-time benchmark: fails if importing `nu_data_pipeline` goes over budget."""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+DAG_FILE = Path(__file__).resolve().parents[2] / "dags" / "dbt_dag.py"
+
+# Budget per parse (seconds); override for slow CI machines
+PARSE_BUDGET_SECONDS = float(os.environ.get("NU_DAG_PARSE_BUDGET_SECONDS", "5"))
+MEASURED_PARSES = 3
+
+# Like the DAG processor, each parse runs in a fresh process with Airflow
+# already imported, so in-process caches of earlier parses do not help.
+_PARSE_SCRIPT = """
+import json, sys, time
+from airflow.models import DagBag
+
+start = time.perf_counter()
+dag_bag = DagBag(dag_folder=sys.argv[1], include_examples=False)
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "dag_ids": sorted(dag_bag.dags),
+    "import_errors": {path: str(error) for path, error in dag_bag.import_errors.items()},
+}))
+"""
+
+
+def parse_dag_file():
+    result = subprocess.run(
+        [sys.executable, "-c", _PARSE_SCRIPT, str(DAG_FILE)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.skipif(not DAG_FILE.exists(), reason="dbt_dag.py not found")
+def test_nu_data_pipeline_parses_within_budget():
+    # Warm-up: builds the dbt manifest if it is missing or stale
+    warm_up = parse_dag_file()
+    assert not warm_up["import_errors"], warm_up["import_errors"]
+    assert "nu_data_pipeline" in warm_up["dag_ids"]
+
+    durations = [parse_dag_file()["seconds"] for _ in range(MEASURED_PARSES)]
+    median = statistics.median(durations)
+    assert median <= PARSE_BUDGET_SECONDS, (
+        f"nu_data_pipeline took {median:.2f}s to parse (budget {PARSE_BUDGET_SECONDS}s); "
+        f"runs: {[round(d, 2) for d in durations]}"
+    )
@@ -0,0 +1,139 @@
+"""Tests for the backfill month chunks, checkpoint-based resume planning and windowed promotion."""
+
+import pytest
+
+from include.backfill import BackfillTable, month_chunks, plan_backfill, promote_backfill
+
+PHASES = ["transactions", "account_months"]
+
+
+class FakeCheckpointStore:
+    """In-memory stand-in for VariableCheckpointStore."""
+
+    def __init__(self):
+        self.range = None
+        self.done = set()
+
+    def load_range(self):
+        return self.range
+
+    def start(self, backfill_range, phases):
+        self.range = backfill_range
+        self.done = set()
+
+    def is_done(self, phase, chunk):
+        return (phase, chunk) in self.done
+
+    def mark_done(self, phase, chunk):
+        self.done.add((phase, chunk))
+
+
+def test_month_chunks_cover_the_inclusive_range_across_years():
+    chunks = month_chunks("2023-11", "2024-01")
+
+    assert chunks == [
+        {"chunk": "2023-11", "start": "2023-11-01", "end": "2023-12-01"},
+        {"chunk": "2023-12", "start": "2023-12-01", "end": "2024-01-01"},
+        {"chunk": "2024-01", "start": "2024-01-01", "end": "2024-02-01"},
+    ]
+    with pytest.raises(ValueError):
+        month_chunks("2024-02", "2024-01")
+
+
+def test_resumed_backfill_only_plans_missing_chunks():
+    store = FakeCheckpointStore()
+    first = plan_backfill("2024-01", "2024-03", PHASES, store)
+    assert first["fresh"] is True
+    assert [c["chunk"] for c in first["transactions"]] == ["2024-01", "2024-02", "2024-03"]
+
+    store.mark_done("transactions", "2024-01")
+    store.mark_done("transactions", "2024-03")
+    resumed = plan_backfill("2024-01", "2024-03", PHASES, store)
+
+    assert resumed["fresh"] is False
+    assert [c["chunk"] for c in resumed["transactions"]] == ["2024-02"]
+    assert len(resumed["account_months"]) == 3
+
+
+def test_new_range_or_restart_discards_checkpoints():
+    store = FakeCheckpointStore()
+    plan_backfill("2024-01", "2024-03", PHASES, store)
+    store.mark_done("transactions", "2024-01")
+
+    assert plan_backfill("2024-01", "2024-06", PHASES, store)["fresh"] is True
+    store.mark_done("transactions", "2024-01")
+
+    restarted = plan_backfill("2024-01", "2024-06", PHASES, store, restart=True)
+    assert restarted["fresh"] is True
+    assert len(restarted["transactions"]) == 6
+
+
+class DuckDBWarehouse:
+    """`BackfillWarehouse` over an in-memory DuckDB database."""
+
+    def __init__(self, duckdb):
+        self.duckdb = duckdb
+        self.connection = duckdb.connect()
+        self.connection.execute("CREATE SCHEMA prod")
+        self.connection.execute("CREATE SCHEMA prod_backfill")
+
+    def columns(self, table):
+        try:
+            return {row[0]: row[1] for row in self.connection.execute(f"DESCRIBE {table}").fetchall()}
+        except self.duckdb.CatalogException:
+            return None
+
+    def run(self, statements, transaction=False):
+        if transaction:
+            self.connection.execute("BEGIN")
+        for statement in statements:
+            self.connection.execute(statement)
+        if transaction:
+            self.connection.execute("COMMIT")
+
+    def rows(self, sql):
+        return self.connection.execute(sql).fetchall()
+
+
+def test_partial_backfill_only_replaces_its_months_in_production():
+    warehouse = DuckDBWarehouse(pytest.importorskip("duckdb"))
+    warehouse.run([
+        "CREATE TABLE prod.fct (transaction_id INTEGER, completed_at TIMESTAMP, amount DOUBLE)",
+        "INSERT INTO prod.fct VALUES (1, '2023-02-10', 10), (2, '2023-03-05', 20), (3, '2023-03-31 23:00', 30),"
+        " (4, '2023-04-01', 40), (5, '2025-01-15', 50)",
+        # The backfill of 2023-03 corrects an amount, drops a row and adds a column
+        "CREATE TABLE prod_backfill.fct (transaction_id INTEGER, completed_at TIMESTAMP, amount DOUBLE, currency VARCHAR)",
+        "INSERT INTO prod_backfill.fct VALUES (2, '2023-03-05', 25, 'BRL')",
+    ])
+
+    outcome = promote_backfill(
+        warehouse,
+        [BackfillTable("prod.fct", "prod_backfill.fct", "completed_at")],
+        start="2023-03-01",
+        end="2023-04-01",
+    )
+
+    assert outcome == {"prod.fct": "replaced"}
+    assert warehouse.rows("SELECT transaction_id, amount, currency FROM prod.fct ORDER BY transaction_id") == [
+        (1, 10.0, None),
+        (2, 25.0, "BRL"),
+        (4, 40.0, None),
+        (5, 50.0, None),
+    ]
+
+
+def test_promotion_checks_every_backfill_table_before_changing_production():
+    warehouse = DuckDBWarehouse(pytest.importorskip("duckdb"))
+    warehouse.run([
+        "CREATE TABLE prod.fct (id INTEGER, month_date DATE)",
+        "INSERT INTO prod.fct VALUES (1, '2023-03-01')",
+        "CREATE TABLE prod_backfill.fct (id INTEGER, month_date DATE)",
+    ])
+    tables = [
+        BackfillTable("prod.fct", "prod_backfill.fct", "month_date"),
+        BackfillTable("prod.missing", "prod_backfill.missing", "month_date"),
+    ]
+
+    with pytest.raises(ValueError, match="prod_backfill.missing"):
+        promote_backfill(warehouse, tables, start="2023-03-01", end="2023-04-01")
+    assert warehouse.rows("SELECT id FROM prod.fct") == [(1,)]
@@ -0,0 +1,130 @@
+"""Tests for the async bulk refresh scheduling, with a fake query client and clock."""
+
+from include.bulk_refresh import QueryPoll, SnowflakeAsyncQueryClient, run_bulk_refresh
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeQueryClient:
+    """
+    Each submission of a table's statement plays the next scripted attempt:
+    ("success" | "error" | "hang", polls before it finishes).
+    """
+
+    def __init__(self, scripts):
+        self.scripts = {sql: list(attempts) for sql, attempts in scripts.items()}
+        self.queries = {}
+        self.in_flight = set()
+        self.max_in_flight = 0
+        self.cancelled = []
+
+    def submit(self, sql):
+        query_id = f"q{len(self.queries)}"
+        outcome, polls = self.scripts[sql].pop(0)
+        self.queries[query_id] = {"outcome": outcome, "polls_left": polls}
+        self.in_flight.add(query_id)
+        self.max_in_flight = max(self.max_in_flight, len(self.in_flight))
+        return query_id
+
+    def poll(self, query_id):
+        query = self.queries[query_id]
+        if query["outcome"] == "hang" or query["polls_left"] > 0:
+            query["polls_left"] -= 1
+            return QueryPoll(done=False)
+        self.in_flight.discard(query_id)
+        return QueryPoll(done=True, error="Access denied" if query["outcome"] == "error" else None)
+
+    def cancel(self, query_id):
+        self.cancelled.append(query_id)
+        self.in_flight.discard(query_id)
+
+
+def run(client, statements, **kwargs):
+    clock = FakeClock()
+    return run_bulk_refresh(client, statements, clock=clock, sleep=clock.sleep, poll_interval_seconds=1, **kwargs)
+
+
+def test_refreshes_run_with_bounded_concurrency_and_report_per_table_timings():
+    statements = {table: f"REFRESH {table}" for table in ["a", "b", "c", "d", "e"]}
+    client = FakeQueryClient({sql: [("success", 2)] for sql in statements.values()})
+
+    results = run(client, statements, max_concurrency=2)
+
+    assert client.max_in_flight == 2
+    assert list(results) == ["a", "b", "c", "d", "e"]
+    assert {result.status for result in results.values()} == {"success"}
+    assert results["a"].attempts == 1
+    assert results["a"].elapsed_seconds == 2
+    assert results["a"].query_id == "q0"
+
+
+def test_failed_refresh_is_retried_until_max_attempts():
+    client = FakeQueryClient({
+        "REFRESH a": [("error", 0), ("success", 0)],
+        "REFRESH b": [("error", 0), ("error", 0)],
+    })
+
+    results = run(client, {"a": "REFRESH a", "b": "REFRESH b"}, max_attempts=2, retry_delay_seconds=5)
+
+    assert (results["a"].status, results["a"].attempts) == ("success", 2)
+    assert results["a"].elapsed_seconds >= 5
+    assert (results["b"].status, results["b"].attempts, results["b"].error) == ("failed", 2, "Access denied")
+
+
+def test_hanging_refresh_is_cancelled_after_its_timeout():
+    client = FakeQueryClient({"REFRESH a": [("hang", 0), ("hang", 0)], "REFRESH b": [("success", 1)]})
+
+    results = run(client, {"a": "REFRESH a", "b": "REFRESH b"}, max_attempts=2, retry_delay_seconds=0, query_timeout_seconds=10)
+
+    assert results["a"].status == "timeout"
+    assert results["a"].attempts == 2
+    assert client.cancelled == ["q0", "q2"]
+    assert results["b"].status == "success"
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.sfqid = f"q{len(connection.cursors)}"
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+    def execute_async(self, sql):
+        pass
+
+    def execute(self, sql, params=None):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cursors = []
+
+    def cursor(self):
+        self.cursors.append(FakeCursor(self))
+        return self.cursors[-1]
+
+
+def test_snowflake_client_closes_the_cursors_it_opens():
+    connection = FakeConnection()
+    client = SnowflakeAsyncQueryClient(connection)
+
+    assert client.submit("REFRESH a") == "q0"
+    client.cancel("q0")
+
+    assert len(connection.cursors) == 2
+    assert all(cursor.closed for cursor in connection.cursors)
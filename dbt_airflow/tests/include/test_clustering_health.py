@@ -0,0 +1,92 @@
+"""Tests for the clustering health parsing and degradation flags, with a fake clustering info provider."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("yaml")
+
+from include.clustering_health import (  # noqa: E402
+    clustered_tables,
+    collect_clustering_stats,
+    flag_degraded_clustering,
+)
+
+
+class FakeClusteringInfoProvider:
+    def __init__(self, infos):
+        self.infos = infos
+
+    def fetch(self, table):
+        if table not in self.infos:
+            raise RuntimeError(f"Table '{table}' does not exist or not authorized.")
+        return json.dumps(self.infos[table])
+
+
+def clustering_info(depth, overlaps=1.0):
+    return {
+        "cluster_by_keys": "LINEAR(account_id, completed_date)",
+        "total_partition_count": 120,
+        "total_constant_partition_count": 80,
+        "average_overlaps": overlaps,
+        "average_depth": depth,
+        "partition_depth_histogram": {"00001": 80, "00002": 40},
+    }
+
+
+def collect(infos, tables):
+    return collect_clustering_stats(
+        tables,
+        FakeClusteringInfoProvider(infos),
+        dag_id="nu_data_pipeline",
+        run_id="run_1",
+        collected_at=datetime(2025, 7, 5),
+    )
+
+
+def test_clustering_information_is_parsed_and_unreadable_tables_are_skipped():
+    rows = collect({"DB.S.FCT_TRANSACTIONS": clustering_info(1.5, 0.8)}, ["DB.S.FCT_TRANSACTIONS", "DB.S.MISSING"])
+
+    assert len(rows) == 1
+    assert rows[0]["table_name"] == "DB.S.FCT_TRANSACTIONS"
+    assert rows[0]["cluster_by_keys"] == "LINEAR(account_id, completed_date)"
+    assert (rows[0]["total_partition_count"], rows[0]["total_constant_partition_count"]) == (120, 80)
+    assert (rows[0]["average_depth"], rows[0]["average_overlaps"]) == (1.5, 0.8)
+    assert rows[0]["is_degraded"] is False
+
+
+def test_depth_growing_beyond_the_trailing_median_is_flagged():
+    rows = collect(
+        {"A": clustering_info(12.0), "B": clustering_info(2.5), "C": clustering_info(3.5), "D": clustering_info(20.0)},
+        ["A", "B", "C", "D"],
+    )
+    trailing = {
+        "A": [2.0, 3.0, 4.0],   # 12 > 2 × 3: degraded
+        "B": [1.0, 1.0, 1.0],   # 2.5× deeper, but still shallow
+        "C": [1.0, 1.0, 1.0],   # 3.5× deeper, still under min_depth
+        "D": [2.0],             # not enough history yet
+    }
+
+    degraded = flag_degraded_clustering(rows, trailing, factor=2.0, min_depth=4.0, min_history=3)
+
+    assert [row["table_name"] for row in degraded] == ["A"]
+    assert rows[0]["trailing_median_depth"] == 3.0
+    assert rows[3]["trailing_median_depth"] is None
+
+
+def test_clustered_tables_are_read_from_the_physical_design_var(tmp_path):
+    (tmp_path / "dbt_project.yml").write_text(
+        "name: project\n"
+        "vars:\n"
+        "  physical_design:\n"
+        "    fct_transactions:\n"
+        "      cluster_by: [account_id, completed_date]\n"
+        "      search_optimization:\n"
+        "        equality: [transaction_id]\n"
+        "    dim_branch:\n"
+        "      search_optimization:\n"
+        "        equality: [branch_id]\n"
+    )
+
+    assert clustered_tables(str(tmp_path)) == {"fct_transactions": ["account_id", "completed_date"]}
@@ -0,0 +1,82 @@
+"""Tests for the content-hash cache of the dbt manifest, using a fake `dbt parse`."""
+
+import os
+
+import pytest
+
+from include.dbt_manifest import ensure_manifest, prebuilt_manifest, project_fingerprint
+
+
+class FakeParse:
+    """Stands in for `dbt parse`: writes a manifest and counts invocations."""
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def __call__(self, project_dir, target_dir):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("dbt parse failed")
+        with open(os.path.join(target_dir, "manifest.json"), "w") as f:
+            f.write(f'{{"build": {self.calls}}}')
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = str(tmp_path / "dbt_pipeline")
+    write(os.path.join(root, "dbt_project.yml"), "name: test\nprofile: test\n")
+    write(os.path.join(root, "models", "a.sql"), "SELECT 1 AS id")
+    return root
+
+
+def test_manifest_is_reused_until_the_project_changes(project):
+    parse = FakeParse()
+    path = ensure_manifest(project, "dbt", build=parse)
+    assert ensure_manifest(project, "dbt", build=parse) == path
+    assert parse.calls == 1
+
+    write(os.path.join(project, "models", "a.sql"), "SELECT 2 AS id")
+    ensure_manifest(project, "dbt", build=parse)
+    assert parse.calls == 2
+    with open(path) as f:
+        assert f.read() == '{"build": 2}'
+
+
+def test_generated_folders_do_not_change_the_fingerprint(project):
+    before = project_fingerprint(project)
+    write(os.path.join(project, "target", "run_results.json"), "{}")
+    write(os.path.join(project, "dbt_packages", "dbt_utils", "x.sql"), "")
+    assert project_fingerprint(project) == before
+
+    os.rename(os.path.join(project, "models", "a.sql"), os.path.join(project, "models", "b.sql"))
+    assert project_fingerprint(project) != before
+
+
+def test_failed_regeneration_falls_back_to_the_stale_manifest(project):
+    path = ensure_manifest(project, "dbt", build=FakeParse())
+    write(os.path.join(project, "models", "c.sql"), "SELECT 3 AS id")
+
+    assert ensure_manifest(project, "dbt", build=FakeParse(fail=True)) == path
+    assert ensure_manifest(str(project) + "_missing_manifest", "dbt", build=FakeParse(fail=True)) is None
+
+
+def test_prebuilt_manifest_is_only_read_while_current(project):
+    assert prebuilt_manifest(project) is None
+
+    path = ensure_manifest(project, "dbt", build=FakeParse())
+    built_at = os.path.getmtime(path)
+    assert prebuilt_manifest(project) == path
+
+    # Generated folders are ignored; an edited model makes the manifest stale
+    write(os.path.join(project, "target", "run_results.json"), "{}")
+    os.utime(os.path.join(project, "target", "run_results.json"), (built_at + 60, built_at + 60))
+    assert prebuilt_manifest(project) == path
+    os.utime(os.path.join(project, "models", "a.sql"), (built_at + 60, built_at + 60))
+    assert prebuilt_manifest(project) is None
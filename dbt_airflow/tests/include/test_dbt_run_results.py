@@ -0,0 +1,76 @@
+"""Tests for the per-node summaries read from dbt's run_results.json."""
+
+import json
+import os
+
+from include.dbt_run_results import NODE_RESULTS_XCOM_KEY, node_outcome, push_node_results
+
+RUN_RESULTS = {
+    "metadata": {"invocation_id": "inv-1"},
+    "results": [
+        {
+            "unique_id": "model.nu_analytics_project.stg_accounts",
+            "status": "success",
+            "execution_time": 1.5,
+            "message": "SUCCESS 1",
+            "failures": None,
+            "adapter_response": {"rows_affected": 42, "query_id": "01a-1"},
+        },
+        {
+            "unique_id": "test.nu_analytics_project.not_null_stg_accounts_account_id.abc123",
+            "status": "fail",
+            "execution_time": 0.3,
+            "message": "Got 2 results, configured to fail if != 0",
+            "failures": 2,
+            "adapter_response": {},
+        },
+        {
+            "unique_id": "model.nu_analytics_project.dim_account",
+            "status": "skipped",
+            "execution_time": 0,
+            "message": None,
+            "failures": None,
+        },
+    ],
+}
+
+
+class FakeTI:
+    def __init__(self):
+        self.xcom = {}
+
+    def xcom_push(self, key, value):
+        self.xcom[key] = value
+
+
+def write_run_results(project_dir, run_results):
+    os.makedirs(os.path.join(project_dir, "target"))
+    with open(os.path.join(project_dir, "target", "run_results.json"), "w") as f:
+        json.dump(run_results, f)
+
+
+def test_callback_pushes_one_summary_per_node(tmp_path):
+    write_run_results(str(tmp_path), RUN_RESULTS)
+    ti = FakeTI()
+
+    nodes = push_node_results(str(tmp_path), context={"ti": ti})
+
+    assert ti.xcom[NODE_RESULTS_XCOM_KEY] == nodes
+    assert [n["name"] for n in nodes] == ["stg_accounts", "not_null_stg_accounts_account_id", "dim_account"]
+    assert nodes[0]["rows_affected"] == 42 and nodes[0]["query_id"] == "01a-1"
+    assert nodes[1]["resource_type"] == "test" and nodes[1]["failures"] == 2
+    assert {n["invocation_id"] for n in nodes} == {"inv-1"}
+
+
+def test_missing_run_results_pushes_an_empty_list(tmp_path):
+    ti = FakeTI()
+    assert push_node_results(str(tmp_path), context={"ti": ti}) == []
+    assert ti.xcom[NODE_RESULTS_XCOM_KEY] == []
+
+
+def test_node_outcomes():
+    outcomes = [node_outcome({"status": r["status"]}) for r in RUN_RESULTS["results"]]
+    assert outcomes == ["success", "failed", "skipped"]
+    assert node_outcome({"status": "runtime error"}) == "failed"
+    assert node_outcome({"status": "warn"}) == "success"
+    assert node_outcome({"status": "success", "message": "UNCHANGED"}) == "unchanged"
@@ -0,0 +1,71 @@
+"""Tests for the metadata-only external table validation."""
+
+from datetime import datetime, timedelta, timezone
+
+from include.external_table_validation import (
+    build_validation_report,
+    build_validation_sql,
+    summarize_by_tier,
+)
+
+TIERS = {
+    "high_frequency": ["pix_movements"],
+    "medium_frequency": ["accounts"],
+    "low_frequency": ["d_time"],
+}
+THRESHOLDS = {"high_frequency": timedelta(hours=4), "medium_frequency": timedelta(days=1)}
+NOW = datetime(2025, 7, 5, 12, 0, tzinfo=timezone.utc)
+
+
+def row(table, file_count=3, last_altered=NOW, row_count=None):
+    return (table, file_count, 1024 * file_count, last_altered, last_altered, row_count, NOW)
+
+
+def test_sql_reads_registration_metadata_without_scanning_tables():
+    sql = build_validation_sql("NU_DB", "NU_RAW_SCHEMA", ["pix_movements", "d_time"])
+
+    assert sql.count("external_table_files(") == 2
+    assert "TABLE_NAME => 'NU_DB.NU_RAW_SCHEMA.d_time'" in sql
+    assert "FROM NU_DB.NU_RAW_SCHEMA.d_time" not in sql
+    assert sql.count("%s") == 1
+
+
+def test_deep_check_adds_row_counts():
+    sql = build_validation_sql("NU_DB", "NU_RAW_SCHEMA", ["d_time"], deep=True)
+    assert "COUNT(*) AS row_count FROM NU_DB.NU_RAW_SCHEMA.d_time" in sql
+
+
+def test_stale_high_frequency_table_is_critical():
+    rows = [row("pix_movements", last_altered=NOW - timedelta(hours=5)), row("accounts"), row("d_time")]
+    report, errors = build_validation_report(rows, TIERS, THRESHOLDS, refreshed_tables=["pix_movements"])
+
+    assert report["pix_movements"]["status"] == "stale"
+    assert report["pix_movements"]["age_seconds"] == 5 * 3600
+    assert len(errors) == 1 and "pix_movements" in errors[0]
+
+
+def test_stale_medium_frequency_table_is_not_critical():
+    rows = [row("accounts", last_altered=NOW - timedelta(days=2))]
+    report, errors = build_validation_report(rows, TIERS, THRESHOLDS, refreshed_tables=["accounts"])
+
+    assert report["accounts"]["status"] == "stale"
+    assert errors == []
+
+
+def test_tables_not_refreshed_this_run_are_not_checked_for_freshness():
+    rows = [row("pix_movements", last_altered=NOW - timedelta(days=3))]
+    report, errors = build_validation_report(rows, TIERS, THRESHOLDS, refreshed_tables=[])
+
+    assert report["pix_movements"]["status"] == "unchanged"
+    assert errors == []
+
+
+def test_empty_tables_and_tier_summary():
+    rows = [row("pix_movements"), row("accounts"), row("d_time", file_count=0)]
+    report, _ = build_validation_report(rows, TIERS, THRESHOLDS, refreshed_tables=["pix_movements"])
+    summary = summarize_by_tier(report, TIERS)
+
+    assert report["d_time"]["status"] == "empty"
+    assert summary["high_frequency"]["fresh_count"] == 1
+    assert summary["medium_frequency"]["unchanged_count"] == 1
+    assert summary["low_frequency"]["empty_tables"] == ["d_time"]
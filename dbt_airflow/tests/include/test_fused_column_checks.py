@@ -0,0 +1,56 @@
+"""Tests for the fused column checks generic test, rendered with Jinja and run on DuckDB like dbt does."""
+
+import os
+
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+jinja2 = pytest.importorskip("jinja2")
+
+MACRO_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "dags", "dbt_pipeline", "macros", "fused_column_checks.sql"
+)
+
+
+def run_fused_checks(connection, model, **checks):
+    """Returns the `failures` dbt computes for the test: its `fail_calc` over the rows the test returns."""
+    with open(MACRO_PATH) as f:
+        source = f.read().replace("{% test ", "{% macro ").replace("{% endtest %}", "{% endmacro %}")
+    config = {}
+    env = jinja2.Environment(extensions=["jinja2.ext.do"])
+    module = env.from_string(source, globals={"config": lambda **kwargs: config.update(kwargs) or ""}).module
+    test_sql = module.fused_column_checks(model, **checks)
+    # dbt's test materialization (default__get_test_sql)
+    return connection.execute(
+        f"SELECT {config['fail_calc']} AS failures FROM ({test_sql}) dbt_internal_test"
+    ).fetchone()[0]
+
+
+@pytest.fixture
+def connection():
+    connection = duckdb.connect()
+    connection.execute(
+        "CREATE TABLE transactions AS SELECT * FROM (VALUES "
+        "(1, 'in', 10.0), (2, 'out', 20.0), (3, 'in', 30.0)"
+        ") t(transaction_id, transaction_direction, transaction_amount)"
+    )
+    return connection
+
+
+CHECKS = {
+    "not_null": ["transaction_id", "transaction_amount"],
+    "unique": ["transaction_id"],
+    "accepted_values": {"transaction_direction": ["in", "out"]},
+    "expressions": {"positive_amount": "transaction_amount > 0"},
+}
+
+
+def test_clean_model_passes_with_zero_failures(connection):
+    assert run_fused_checks(connection, "transactions", **CHECKS) == 0
+
+
+def test_failing_rows_of_every_check_are_summed(connection):
+    connection.execute("INSERT INTO transactions VALUES (3, 'sideways', NULL)")
+
+    # not_null (1) + unique (1) + accepted_values (1); the NULL amount is not a failed expression
+    assert run_fused_checks(connection, "transactions", **CHECKS) == 3
@@ -0,0 +1,91 @@
+"""Tests for the deferrable GCS arrival trigger, run against a fake async GCS client."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("airflow")
+
+from include.gcs_arrival import GCSNewObjectsTrigger, generation_watermarks  # noqa: E402
+from include.gcs_manifest import ObjectInfo, table_state  # noqa: E402
+
+PREFIXES = {"pix_movements": "Tables/pix_movements/", "accounts": "Tables/accounts/"}
+
+
+class FakeAsyncGCSClient:
+    """Serves successive listings per prefix; the last listing repeats once exhausted."""
+
+    def __init__(self, listings):
+        self.listings = listings
+        self.calls = []
+
+    async def list_objects(self, bucket, prefix):
+        self.calls.append(prefix)
+        pages = self.listings[prefix]
+        return pages.pop(0) if len(pages) > 1 else pages[0]
+
+
+def obj(name, generation, size=100):
+    return {"name": name, "generation": generation, "size": size}
+
+
+async def first_event(trigger):
+    async for event in trigger.run():
+        return event.payload
+
+
+def make_trigger(client, watermarks):
+    return GCSNewObjectsTrigger(
+        bucket="nu_dataset",
+        table_prefixes=PREFIXES,
+        watermarks=watermarks,
+        gcp_conn_id="gcp_default",
+        poke_interval=0,
+        client=client,
+    )
+
+
+def test_watermarks_are_highest_generation_per_table():
+    manifest = {
+        "accounts": table_state([ObjectInfo("a.csv", 5, 10), ObjectInfo("b.csv", 9, 10)]),
+        "d_time": table_state([]),
+    }
+    assert generation_watermarks(manifest) == {"accounts": 9, "d_time": 0}
+
+
+def test_emits_only_objects_newer_than_the_watermark():
+    client = FakeAsyncGCSClient({
+        "Tables/pix_movements/": [[obj("Tables/pix_movements/old.csv", 10), obj("Tables/pix_movements/new.csv", 20)]],
+        "Tables/accounts/": [[obj("Tables/accounts/a.csv", 5)]],
+    })
+    payload = asyncio.run(first_event(make_trigger(client, {"pix_movements": 10, "accounts": 5})))
+
+    assert payload["status"] == "success"
+    assert payload["new_objects"] == {"pix_movements": [obj("Tables/pix_movements/new.csv", 20)]}
+
+
+def test_keeps_polling_until_an_object_arrives():
+    client = FakeAsyncGCSClient({
+        "Tables/pix_movements/": [[], [], [obj("Tables/pix_movements/late.csv", 30)]],
+        "Tables/accounts/": [[]],
+    })
+    payload = asyncio.run(first_event(make_trigger(client, {})))
+
+    assert payload["new_objects"] == {"pix_movements": [obj("Tables/pix_movements/late.csv", 30)]}
+    assert client.calls.count("Tables/pix_movements/") == 3
+
+
+def test_client_errors_are_reported_as_error_events():
+    class BrokenClient:
+        async def list_objects(self, bucket, prefix):
+            raise RuntimeError("permission denied")
+
+    payload = asyncio.run(first_event(make_trigger(BrokenClient(), {})))
+    assert payload == {"status": "error", "message": "permission denied"}
+
+
+def test_serialization_omits_the_injected_client():
+    classpath, kwargs = make_trigger(FakeAsyncGCSClient({}), {"accounts": 1}).serialize()
+    assert classpath == "include.gcs_arrival.GCSNewObjectsTrigger"
+    assert "client" not in kwargs
+    assert kwargs["watermarks"] == {"accounts": 1}
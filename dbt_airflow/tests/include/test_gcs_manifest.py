@@ -0,0 +1,122 @@
+"""Tests for the GCS manifest change detection, using the local-filesystem stand-ins."""
+
+import json
+import os
+
+import pytest
+
+from include.gcs_manifest import (
+    LocalFileManifestStore,
+    LocalObjectLister,
+    ObjectInfo,
+    changed_tables,
+    detect_changes,
+    new_objects,
+    table_state,
+)
+
+TABLES = ["pix_movements", "accounts", "d_time"]
+
+
+def write_file(root, relpath, content="id,value\n1,a\n"):
+    path = os.path.join(root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    root = tmp_path / "bucket"
+    for table in TABLES:
+        write_file(str(root), f"Tables/{table}/part-0001.csv")
+    return str(root)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalFileManifestStore(str(tmp_path / "manifest.json"))
+
+
+def test_first_run_reports_every_table(bucket, store):
+    result = detect_changes(LocalObjectLister(bucket), store, TABLES, "Tables/")
+    assert result["changed_tables"] == sorted(TABLES)
+
+
+def test_no_changes_after_commit(bucket, store):
+    lister = LocalObjectLister(bucket)
+    store.save(detect_changes(lister, store, TABLES, "Tables/")["manifest"])
+
+    result = detect_changes(lister, store, TABLES, "Tables/")
+    assert result["changed_tables"] == []
+
+
+def test_only_tables_with_new_objects_are_reported(bucket, store):
+    lister = LocalObjectLister(bucket)
+    store.save(detect_changes(lister, store, TABLES, "Tables/")["manifest"])
+    watermark = store.load()["pix_movements"]["generation"]
+
+    write_file(bucket, "Tables/pix_movements/part-0002.csv")
+    result = detect_changes(lister, store, TABLES, "Tables/")
+
+    assert result["changed_tables"] == ["pix_movements"]
+    assert [obj.name for obj in new_objects(lister, "pix_movements", "Tables/", watermark)] == [
+        "Tables/pix_movements/part-0002.csv"
+    ]
+
+
+def test_prefix_does_not_leak_into_similarly_named_tables(bucket, store):
+    lister = LocalObjectLister(bucket)
+    store.save(detect_changes(lister, store, TABLES, "Tables/")["manifest"])
+
+    write_file(bucket, "Tables/accounts_backup/part-0001.csv")
+    assert detect_changes(lister, store, TABLES, "Tables/")["changed_tables"] == []
+
+
+def test_overwritten_and_removed_objects_count_as_changes():
+    a, b, t = ObjectInfo("a.csv", 1, 10), ObjectInfo("b.csv", 1, 10), ObjectInfo("t.csv", 1, 5)
+    previous = {"accounts": table_state([a, b]), "d_time": table_state([t])}
+
+    overwritten = {"accounts": table_state([ObjectInfo("a.csv", 2, 12), b]), "d_time": table_state([t])}
+    removed = {"accounts": table_state([a]), "d_time": table_state([t])}
+    listed_in_another_order = {"accounts": table_state([b, a]), "d_time": table_state([t])}
+
+    assert changed_tables(previous, overwritten) == ["accounts"]
+    assert changed_tables(previous, removed) == ["accounts"]
+    assert changed_tables(previous, listed_in_another_order) == []
+
+
+def test_the_manifest_size_does_not_grow_with_the_landed_objects(bucket, store):
+    lister = LocalObjectLister(bucket)
+    for index in range(2, 50):
+        write_file(bucket, f"Tables/pix_movements/part-{index:04d}.csv")
+    state = detect_changes(lister, store, TABLES, "Tables/")["manifest"]["pix_movements"]
+
+    assert set(state) == {"generation", "objects", "digest"}
+    assert state["objects"] == 49
+
+
+def test_new_objects_stop_at_the_snapshot_high_water_mark():
+    class Lister:
+        def list_objects(self, prefix):
+            return [ObjectInfo(f"{prefix}{generation}.csv", generation, 1) for generation in (5, 9, 7, 12)]
+
+    assert [obj.generation for obj in new_objects(Lister(), "accounts", "Tables/", 5, 9)] == [7, 9]
+    assert [obj.generation for obj in new_objects(Lister(), "accounts", "Tables/")] == [5, 7, 9, 12]
+
+
+def test_a_per_object_manifest_is_upgraded_to_table_states(store):
+    with open(store.path, "w") as f:
+        json.dump({"accounts": {"a.csv": [1, 10], "b.csv": [3, 10]}}, f)
+
+    assert store.load()["accounts"] == table_state([ObjectInfo("a.csv", 1, 10), ObjectInfo("b.csv", 3, 10)])
+    assert store.load()["accounts"]["generation"] == 3
+
+
+def test_force_reports_every_table(bucket, store):
+    lister = LocalObjectLister(bucket)
+    store.save(detect_changes(lister, store, TABLES, "Tables/")["manifest"])
+
+    result = detect_changes(lister, store, TABLES, "Tables/", force=True)
+    assert result["changed_tables"] == sorted(TABLES)
@@ -0,0 +1,176 @@
+"""Tests that incremental runs of the models match a --full-refresh, on DuckDB over a tiny synthetic dataset."""
+
+import os
+
+import pytest
+
+# Benchmark-only dependencies (requirements-dev.txt)
+duckdb = pytest.importorskip("duckdb")
+for module in ("numpy", "psutil", "jinja2", "yaml"):
+    pytest.importorskip(module)
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from include.scale_benchmark import (  # noqa: E402
+    DEFAULT_PROJECT_DIR,
+    SHIM_MACROS,
+    Model,
+    build_renderer,
+    execution_order,
+    load_models,
+    project_vars,
+    run_benchmark,
+)
+from include.synthetic_data import SCHEMAS, SyntheticConfig, generate_dataset  # noqa: E402
+
+ACCOUNT_MODELS = (
+    "int_account_daily_activity",
+    "int_account_monthly_spine",
+    "int_monthly_transaction_summary",
+    "fct_account_monthly_balances",
+)
+# Set at build time, so they differ between an incremental run and a rebuild
+BUILD_COLUMNS = ("_loaded_at", "_processed_at", "_previous_account_id", "_previous_completed_at")
+
+
+def run_incremental(database):
+    """
+    Runs every model over the tables of `database` the way dbt does: incremental
+    models run their pre-hooks, then replace the rows of their new batch's
+    `unique_key` values; the other models are rebuilt.
+    """
+    dbt_vars = project_vars(DEFAULT_PROJECT_DIR)
+    render_full = build_renderer(DEFAULT_PROJECT_DIR, dbt_vars)
+    render_incremental = build_renderer(DEFAULT_PROJECT_DIR, dbt_vars, incremental=True)
+    models = load_models()
+    connection = duckdb.connect(database)
+    try:
+        connection.execute("SET TimeZone = 'UTC'")
+        for macro in SHIM_MACROS:
+            connection.execute(macro)
+        for name in execution_order(models):
+            model = models[name]
+            sql = render_full(model)
+            if model.config.get("materialized") != "incremental":
+                connection.execute(f"CREATE OR REPLACE TABLE {name} AS {sql}")
+                continue
+            sql = render_incremental(model)
+            hooks = model.config.get("pre_hook") or []
+            for hook in [hooks] if isinstance(hooks, str) else hooks:
+                statement = render_incremental(Model(name, model.layer, hook, [], [])).strip()
+                if statement:
+                    connection.execute(statement)
+            connection.execute(f"CREATE OR REPLACE TEMP TABLE batch AS {sql}")
+            keys = model.config["unique_key"]
+            keys = ", ".join([keys] if isinstance(keys, str) else keys)
+            connection.execute(f"DELETE FROM {name} WHERE ({keys}) IN (SELECT {keys} FROM batch)")
+            connection.execute(f"INSERT INTO {name} BY NAME SELECT * FROM batch")
+    finally:
+        connection.close()
+
+
+def differences(database, full_refresh_database, name):
+    """Rows of model `name` in only one of the two databases, build columns aside."""
+    connection = duckdb.connect(database)
+    try:
+        connection.execute(f"ATTACH '{full_refresh_database}' AS full_refresh (READ_ONLY)")
+        columns = [
+            column for (column,) in connection.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_catalog = current_database() AND table_name = ? ORDER BY ordinal_position",
+                [name],
+            ).fetchall()
+            if column not in BUILD_COLUMNS
+        ]
+        selected = ", ".join(columns)
+        return connection.execute(
+            f"(SELECT {selected} FROM {name} EXCEPT ALL SELECT {selected} FROM full_refresh.{name}) "
+            f"UNION ALL "
+            f"(SELECT {selected} FROM full_refresh.{name} EXCEPT ALL SELECT {selected} FROM {name})"
+        ).fetchall()
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = tmp_path / "synthetic"
+    generate_dataset(str(path), SyntheticConfig(transactions=3000, transactions_per_account=10))
+    return str(path)
+
+
+def query(database, sql):
+    connection = duckdb.connect(database)
+    try:
+        return connection.execute(sql).fetchall()
+    finally:
+        connection.close()
+
+
+def assert_incremental_run_matches_full_refresh(data_dir, tmp_path, change):
+    """Builds the models, applies `change(database)` to the sources, then runs them incrementally."""
+    database = str(tmp_path / "incremental.duckdb")
+    run_benchmark(data_dir, "tiny", database=database)
+    change(database)
+    run_incremental(database)
+
+    full_refresh_database = str(tmp_path / "full_refresh.duckdb")
+    run_benchmark(data_dir, "tiny", database=full_refresh_database)
+    for name in ACCOUNT_MODELS:
+        assert differences(database, full_refresh_database, name) == [], name
+    return database
+
+
+def test_first_transaction_of_an_account_trims_its_spine(data_dir, tmp_path):
+    def add_first_transaction(database):
+        (account_id, completed_at), = query(database, """
+            SELECT MIN(a.account_id), (SELECT MAX(transaction_completed_at) FROM int_transactions_enriched)
+            FROM stg_accounts a
+            WHERE a.account_status = 'active'
+              AND a.account_id NOT IN (SELECT account_id FROM int_transactions_enriched)
+        """)
+        assert query(database, f"SELECT COUNT(*) FROM int_account_monthly_spine WHERE account_id = {account_id}")[0][0] > 1
+        first_transaction.update(account_id=account_id)
+        pq.write_table(pa.Table.from_pylist([{
+            "id": 10**9, "account_id": account_id, "pix_amount": 100, "pix_requested_at": completed_at,
+            "pix_completed_at": completed_at, "status": "completed", "in_or_out": "pix_in",
+        }], SCHEMAS["pix_movements"]), os.path.join(data_dir, "pix_movements", "part-99999.parquet"))
+
+    first_transaction = {}
+    database = assert_incremental_run_matches_full_refresh(data_dir, tmp_path, add_first_transaction)
+
+    account_id = first_transaction["account_id"]
+    assert query(database, f"SELECT COUNT(*) FROM fct_account_monthly_balances WHERE account_id = {account_id}") == [(1,)]
+
+
+@pytest.mark.parametrize("to_another_account", [False, True])
+def test_transaction_moved_to_another_month_leaves_no_stale_month(data_dir, tmp_path, to_another_account):
+    def move_earliest_transaction(database):
+        (transaction_id, account_id), = query(database, """
+            SELECT transaction_id, account_id
+            FROM int_transactions_enriched
+            WHERE source_table = 'pix_movements'
+            ORDER BY transaction_completed_at, transaction_id
+            LIMIT 1
+        """)
+        (other_account_id, completed_at), = query(database, f"""
+            SELECT account_id, transaction_completed_at
+            FROM int_transactions_enriched
+            WHERE account_id <> {account_id}
+            ORDER BY transaction_completed_at DESC
+            LIMIT 1
+        """)
+        for filename in sorted(os.listdir(os.path.join(data_dir, "pix_movements"))):
+            path = os.path.join(data_dir, "pix_movements", filename)
+            rows = pq.read_table(path).to_pylist()
+            for row in rows:
+                if row["id"] == transaction_id:
+                    row["pix_completed_at"] = completed_at
+                    if to_another_account:
+                        row["account_id"] = other_account_id
+            pq.write_table(pa.Table.from_pylist(rows, SCHEMAS["pix_movements"]), path)
+
+    database = assert_incremental_run_matches_full_refresh(data_dir, tmp_path, move_earliest_transaction)
+
+    # Only the moved transaction records where it came from
+    assert query(database, "SELECT COUNT(*) FROM int_transactions_enriched WHERE _previous_completed_at IS NOT NULL") == [(1,)]
@@ -0,0 +1,99 @@
+"""Tests for the CSV -> partitioned Parquet landing converter, run against a local directory tree."""
+
+import datetime as dt
+from decimal import Decimal
+
+import pyarrow.dataset as ds
+import pyarrow.fs as pa_fs
+import pytest
+
+from include.parquet_landing import (
+    NULL_PARTITION,
+    convert_csv_to_parquet,
+    convert_landed_objects,
+    parquet_prefix,
+)
+
+PIX_HEADER = "id,account_id,pix_amount,pix_requested_at,pix_completed_at,status,in_or_out\n"
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    root = tmp_path / "bucket"
+    root.mkdir()
+    return pa_fs.SubTreeFileSystem(str(root), pa_fs.LocalFileSystem())
+
+
+def write_csv(filesystem, path, header, rows):
+    filesystem.create_dir(path.rsplit("/", 1)[0], recursive=True)
+    with filesystem.open_output_stream(path) as f:
+        f.write((header + "".join(row + "\n" for row in rows)).encode())
+
+
+def read_table(filesystem, table):
+    dataset = ds.dataset(
+        parquet_prefix("Tables/", table), filesystem=filesystem, format="parquet", partitioning="hive"
+    )
+    return dataset.to_table().sort_by("id")
+
+
+def test_rows_are_partitioned_by_completion_date_with_explicit_types(bucket):
+    write_csv(bucket, "Tables/pix_movements/batch-1.csv", PIX_HEADER, [
+        "1,10,12.50,1577836800,1577836860,completed,pix_in",           # 2020-01-01 (epoch)
+        "2,11,3.10,2020-01-02 08:00:00,2020-01-02 08:01:00,completed,pix_out",
+        "3,10,7.00,1577836800,None,failed,pix_in",
+    ])
+
+    written = convert_csv_to_parquet(bucket, "Tables/pix_movements/batch-1.csv", "pix_movements", "Tables/")
+    assert written == {"2020-01-01": 1, "2020-01-02": 1, NULL_PARTITION: 1}
+
+    table = read_table(bucket, "pix_movements")
+    assert str(table.schema.field("pix_amount").type) == "decimal128(18, 2)"
+    assert table.column("pix_amount").to_pylist() == [Decimal("12.50"), Decimal("3.10"), Decimal("7.00")]
+    assert table.column("pix_completed_at").to_pylist() == [
+        dt.datetime(2020, 1, 1, 0, 1), dt.datetime(2020, 1, 2, 8, 1), None
+    ]
+
+
+def test_small_blocks_stream_into_the_same_partition_file(bucket):
+    rows = [f"{i},1,1.00,1577836800,{1577836800 + i},completed" for i in range(2000)]
+    write_csv(bucket, "Tables/transfer_ins/big.csv", "id,account_id,amount,a,b,status\n", rows)
+
+    written = convert_csv_to_parquet(bucket, "Tables/transfer_ins/big.csv", "transfer_ins", "Tables/", block_size=4096)
+
+    assert written == {"2020-01-01": 2000}
+    files = bucket.get_file_info(pa_fs.FileSelector("Tables/parquet/transfer_ins", recursive=True))
+    assert [f.path for f in files if f.is_file] == [
+        "Tables/parquet/transfer_ins/completed_date=2020-01-01/big.parquet"
+    ]
+    assert read_table(bucket, "transfer_ins").num_rows == 2000
+
+
+def test_reconverting_an_overwritten_csv_drops_its_stale_partitions(bucket):
+    path = "Tables/pix_movements/batch-1.csv"
+    write_csv(bucket, path, PIX_HEADER, ["1,10,1.00,1577836800,1577836800,completed,pix_in"])
+    convert_landed_objects(bucket, {"pix_movements": [path]}, "Tables/")
+
+    write_csv(bucket, path, PIX_HEADER, ["1,10,1.00,1577923200,1577923200,completed,pix_in"])
+    convert_landed_objects(bucket, {"pix_movements": [path]}, "Tables/")
+
+    table = read_table(bucket, "pix_movements")
+    assert table.num_rows == 1
+    assert [str(d) for d in table.column("completed_date").to_pylist()] == ["2020-01-02"]
+
+
+def test_only_csvs_of_landing_tables_are_converted(bucket):
+    write_csv(bucket, "Tables/transfer_outs/a.csv", "id,account_id,amount,a,b,status\n", [
+        "1,1,1.00,1577836800,1577836800,completed",
+    ])
+    write_csv(bucket, "Tables/accounts/a.csv", "account_id,account_name,created_at,status\n", [
+        "1,x,2020-01-01,active",
+    ])
+
+    summary = convert_landed_objects(bucket, {
+        "transfer_outs": ["Tables/transfer_outs/a.csv", "Tables/transfer_outs/_SUCCESS"],
+        "accounts": ["Tables/accounts/a.csv"],
+        "transfer_ins": [],
+    }, "Tables/")
+
+    assert summary == {"transfer_outs": {"files": 1, "rows": 1, "partitions": ["2020-01-01"]}}
@@ -0,0 +1,102 @@
+"""Tests for the dbt performance telemetry, using an in-memory query history provider."""
+
+from datetime import datetime
+
+from include.pipeline_metrics import METRIC_COLUMNS, build_metrics, flag_regressions
+
+COLLECTED_AT = datetime(2025, 7, 5, 12, 0)
+
+
+class FakeQueryHistory:
+    """Serves query history from a dict and records the requested query ids."""
+
+    def __init__(self, history):
+        self.history = history
+        self.requests = []
+
+    def fetch(self, query_ids):
+        self.requests.append(list(query_ids))
+        return {qid: self.history[qid] for qid in query_ids if qid in self.history}
+
+
+def node(name, execution_time, query_id=None, status="success", resource_type="model"):
+    return {
+        "unique_id": f"{resource_type}.nu_analytics_project.{name}",
+        "name": name,
+        "resource_type": resource_type,
+        "status": status,
+        "execution_time": execution_time,
+        "rows_affected": 10,
+        "query_id": query_id,
+    }
+
+
+HISTORY = {
+    "q-1": {
+        "warehouse_name": "NU_WH",
+        "bytes_scanned": 2048,
+        "partitions_scanned": 3,
+        "partitions_total": 120,
+        "bytes_spilled_to_local_storage": 0,
+        "bytes_spilled_to_remote_storage": 0,
+        "total_elapsed_time_ms": 1500,
+    },
+}
+
+
+def test_metrics_join_query_history_by_query_id():
+    provider = FakeQueryHistory(HISTORY)
+    rows = build_metrics(
+        [node("fct_transactions", 1.5, "q-1"), node("dim_calendar", 0.2)],
+        provider, dag_id="nu_data_pipeline", run_id="run-1", collected_at=COLLECTED_AT,
+    )
+
+    assert provider.requests == [["q-1"]]
+    assert all(set(row) == set(METRIC_COLUMNS) for row in rows)
+    fct, dim = rows
+    assert fct["partitions_scanned"] == 3 and fct["partitions_total"] == 120
+    assert fct["warehouse_name"] == "NU_WH"
+    assert dim["bytes_scanned"] is None
+
+
+def test_no_query_ids_means_no_history_lookup():
+    provider = FakeQueryHistory({})
+    rows = build_metrics([node("dim_calendar", 0.2)], provider, "dag", "run", COLLECTED_AT)
+    assert provider.requests == []
+    assert len(rows) == 1
+
+
+def test_last_result_wins_for_retried_nodes():
+    rows = build_metrics(
+        [node("dim_account", 9.0, status="error"), node("dim_account", 2.0)],
+        FakeQueryHistory({}), "dag", "run", COLLECTED_AT,
+    )
+    assert [(r["status"], r["execution_time"]) for r in rows] == [("success", 2.0)]
+
+
+def test_fingerprint_skips_are_recorded_as_unchanged():
+    rows = build_metrics(
+        [{**node("dim_calendar", 0.1), "message": "UNCHANGED"}, node("fct_transactions", 4.0)],
+        FakeQueryHistory({}), "dag", "run", COLLECTED_AT,
+    )
+    assert [r["status"] for r in rows] == ["unchanged", "success"]
+
+
+def test_regressions_against_trailing_median():
+    rows = build_metrics(
+        [node("slow", 30.0), node("steady", 11.0), node("tiny", 3.0), node("new", 60.0)],
+        FakeQueryHistory({}), "dag", "run", COLLECTED_AT,
+    )
+    trailing = {
+        "model.nu_analytics_project.slow": [10.0, 12.0, 9.0],
+        "model.nu_analytics_project.steady": [10.0, 10.0, 10.0],
+        "model.nu_analytics_project.tiny": [0.5, 0.5, 0.5],   # 6x slower but under min_seconds
+        "model.nu_analytics_project.new": [1.0],               # not enough history
+    }
+
+    regressions = flag_regressions(rows, trailing, factor=2.0, min_seconds=5.0)
+
+    assert [r["name"] for r in regressions] == ["slow"]
+    slow = rows[0]
+    assert slow["is_regression"] and slow["trailing_median_time"] == 10.0
+    assert rows[3]["trailing_median_time"] is None
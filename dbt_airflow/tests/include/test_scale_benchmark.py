@@ -0,0 +1,76 @@
+"""Tests for the DuckDB scale benchmark, run on a tiny synthetic dataset."""
+
+import pytest
+
+# Benchmark-only dependencies (requirements-dev.txt)
+duckdb = pytest.importorskip("duckdb")
+for module in ("numpy", "psutil", "jinja2", "yaml"):
+    pytest.importorskip(module)
+
+from include.scale_benchmark import (  # noqa: E402
+    BenchmarkReport,
+    ModelResult,
+    compare_scales,
+    execution_order,
+    load_models,
+    run_benchmark,
+)
+from include.synthetic_data import SyntheticConfig, generate_dataset  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp("synthetic")
+    generate_dataset(str(path), SyntheticConfig(transactions=3000, transactions_per_account=10))
+    return str(path)
+
+
+def test_models_run_layer_by_layer_after_their_refs():
+    models = load_models()
+    order = execution_order(models)
+
+    assert set(order) == set(models)
+    for name in order:
+        assert all(order.index(ref) < order.index(name) for ref in models[name].refs), name
+    layers = [models[name].layer for name in order]
+    assert layers.index("marts") > max(i for i, layer in enumerate(layers) if layer == "staging")
+
+
+@pytest.mark.parametrize("dbt_vars", [{}, {"incremental_staging": True}])
+def test_every_model_builds_on_duckdb_within_its_row_bounds(data_dir, dbt_vars):
+    report = run_benchmark(data_dir, "tiny", dbt_vars=dbt_vars)
+
+    results = {result.name: result for result in report.models}
+    assert set(results) == set(load_models())
+    assert report.violations == []
+    assert results["int_transactions_enriched"].rows == results["int_unified_transactions"].rows > 0
+    assert results["dim_account"].rows == report.source_rows["accounts"]
+    assert all(result.peak_memory_bytes > 0 for result in report.models)
+
+
+def test_a_cross_join_blow_up_is_reported(data_dir, tmp_path):
+    project = tmp_path / "project"
+    (project / "models" / "intermediate").mkdir(parents=True)
+    (project / "dbt_project.yml").write_text("name: blow_up\nvars: {}\n")
+    (project / "models" / "intermediate" / "accounts_by_day.sql").write_text(
+        "SELECT a.account_id, t.time_id\n"
+        "FROM {{ source('nu_sources', 'accounts') }} a\n"
+        "CROSS JOIN {{ source('nu_sources', 'd_time') }} t\n"
+    )
+
+    report = run_benchmark(data_dir, "tiny", project_dir=str(project))
+    assert len(report.violations) == 1
+    assert report.violations[0].startswith("accounts_by_day:")
+
+
+def test_superlinear_row_growth_between_scales_is_flagged():
+    def report(scale, source_rows, spine_rows):
+        return BenchmarkReport(
+            scale=scale,
+            source_rows={"pix_movements": source_rows},
+            models=[ModelResult("int_account_monthly_spine", "intermediate", 1.0, 1, spine_rows, source_rows)],
+        )
+
+    assert compare_scales([report("1m", 1000, 100), report("10m", 10000, 1000)]) == []
+    findings = compare_scales([report("1m", 1000, 100), report("10m", 10000, 10000)])
+    assert len(findings) == 1 and "grew 100.0x" in findings[0]
@@ -0,0 +1,129 @@
+"""Tests for the Snowpipe load-progress evaluation, on in-memory pipe status and copy history."""
+
+from datetime import datetime, timedelta, timezone
+
+from include.snowpipe_ingestion import (
+    copy_history_start,
+    evaluate_pipe_progress,
+    forced_copy,
+    overwritten_objects,
+    reload_overwritten_files,
+    stage_path,
+)
+
+WRITTEN_AT = datetime(2025, 7, 5, 12, 0, tzinfo=timezone.utc)
+GENERATION = int(WRITTEN_AT.timestamp() * 1_000_000)
+RUNNING = {"executionState": "RUNNING", "pendingFileCount": 1}
+
+
+def load(file_name, status="Loaded", minutes_after=1, error=None):
+    return {
+        "file_name": file_name,
+        "status": status,
+        "last_load_time": WRITTEN_AT + timedelta(minutes=minutes_after),
+        "first_error_message": error,
+    }
+
+
+def test_pipe_catches_up_once_every_object_of_the_run_is_loaded():
+    expected = {
+        "Tables/pix_movements/a.csv": GENERATION,
+        "Tables/pix_movements/b.csv": GENERATION,
+    }
+
+    progress = evaluate_pipe_progress(
+        "pix_movements", RUNNING, [load("pix_movements/a.csv")], expected, "Tables/"
+    )
+    assert progress.is_running
+    assert progress.loaded == ["pix_movements/a.csv"]
+    assert progress.pending == ["pix_movements/b.csv"]
+    assert not progress.caught_up
+
+    history = [load("pix_movements/a.csv"), load("pix_movements/b.csv", minutes_after=3)]
+    assert evaluate_pipe_progress("pix_movements", RUNNING, history, expected, "Tables/").caught_up
+
+
+def test_loads_of_a_previous_version_of_an_overwritten_file_do_not_count():
+    expected = {"Tables/transfer_ins/a.csv": GENERATION}
+    history = [load("transfer_ins/a.csv", minutes_after=-60)]
+
+    progress = evaluate_pipe_progress("transfer_ins", RUNNING, history, expected, "Tables/")
+    assert progress.pending == ["transfer_ins/a.csv"]
+
+
+def test_objects_whose_path_was_loaded_before_they_were_written_are_overwritten():
+    written = {
+        "Tables/transfer_ins/a.csv": GENERATION,
+        "Tables/transfer_ins/b.csv": GENERATION,
+        "Tables/transfer_ins/c.csv": GENERATION,
+    }
+    history = [
+        load("transfer_ins/a.csv", minutes_after=-60),
+        # The pipe's load of a new object
+        load("transfer_ins/b.csv", minutes_after=2),
+    ]
+
+    assert overwritten_objects(history, written, "Tables/") == ["Tables/transfer_ins/a.csv"]
+
+
+def test_failed_loads_and_stopped_pipes_are_reported():
+    expected = {"Tables/transfer_outs/a.csv": GENERATION}
+    history = [load("transfer_outs/a.csv", status="Load failed", error="Numeric value 'x' is not recognized")]
+
+    progress = evaluate_pipe_progress(
+        "transfer_outs", {"executionState": "STOPPED_STAGE_DROPPED"}, history, expected, "Tables/"
+    )
+    assert not progress.is_running
+    assert progress.failed == {"transfer_outs/a.csv": "Numeric value 'x' is not recognized"}
+    assert not progress.caught_up
+
+
+def test_stage_paths_and_copy_history_window():
+    assert stage_path("Tables/pix_movements/a.csv", "Tables/") == "pix_movements/a.csv"
+    now = WRITTEN_AT + timedelta(hours=1)
+    assert copy_history_start({"a": GENERATION}, now=now) == WRITTEN_AT - timedelta(minutes=5)
+    assert copy_history_start({"a": 0}, now=now) == now - timedelta(days=14)
+
+
+PIPE_DEFINITION = """COPY INTO pix_movements
+  FROM (SELECT $1::BIGINT, METADATA$FILENAME FROM @nu_dataset_stage/pix_movements/)
+  FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER = 1)"""
+
+
+class FakeReloadClient:
+    def __init__(self, columns):
+        self._columns = columns
+        self.transactions = []
+
+    def pipe_definition(self, table):
+        return PIPE_DEFINITION
+
+    def columns(self, table):
+        return self._columns
+
+    def run_in_transaction(self, statements):
+        self.transactions.append(statements)
+
+
+def test_forced_copy_restricts_the_pipe_copy_to_the_files():
+    copy = forced_copy(PIPE_DEFINITION, ["a.csv", "o'b.csv"])
+
+    assert copy.startswith("COPY INTO pix_movements")
+    assert "FILES = ('a.csv', 'o\\'b.csv')\n FILE_FORMAT = (TYPE = 'CSV'" in copy
+    assert copy.endswith("FORCE = TRUE")
+
+
+def test_overwritten_files_are_deleted_and_force_copied_in_one_transaction():
+    client = FakeReloadClient(["ID", "_SOURCE_FILE", "_SOURCE_ROW_NUMBER"])
+
+    reloaded = reload_overwritten_files(client, "pix_movements", ["Tables/pix_movements/a.csv"], "Tables/")
+
+    assert reloaded == ["pix_movements/a.csv"]
+    [(delete, copy)] = client.transactions
+    assert delete == "DELETE FROM pix_movements WHERE _source_file IN ('pix_movements/a.csv')"
+    assert "FILES = ('a.csv')" in copy and copy.endswith("FORCE = TRUE")
+
+    # Tables without file tracking cannot drop the old rows: nothing is reloaded
+    untracked = FakeReloadClient(["ACCOUNT_ID", "STATUS"])
+    assert reload_overwritten_files(untracked, "accounts", ["Tables/accounts/a.csv"], "Tables/") == []
+    assert untracked.transactions == []
@@ -0,0 +1,57 @@
+"""Tests for the synthetic source generator of the scale benchmark."""
+
+from collections import Counter
+from datetime import date
+
+import pytest
+
+# Benchmark-only dependency (requirements-dev.txt)
+pytest.importorskip("numpy")
+
+import pyarrow.dataset as ds  # noqa: E402
+
+from include.synthetic_data import SCHEMAS, SOURCE_TABLES, SyntheticConfig, generate_dataset  # noqa: E402
+
+
+def read(data_dir, table):
+    return ds.dataset(str(data_dir / table), format="parquet").to_table()
+
+
+def test_every_source_is_written_with_the_external_table_types(tmp_path):
+    config = SyntheticConfig(transactions=5000, transactions_per_account=10)
+    counts = generate_dataset(str(tmp_path), config, chunk_rows=1000)
+
+    assert set(counts) == set(SOURCE_TABLES)
+    assert counts["pix_movements"] + counts["transfer_ins"] + counts["transfer_outs"] == 5000
+    assert counts["accounts"] == counts["customers"] == 500
+    for table in SOURCE_TABLES:
+        assert read(tmp_path, table).schema == SCHEMAS[table], table
+    # Written in chunks of at most `chunk_rows`
+    assert len(list((tmp_path / "pix_movements").glob("*.parquet"))) == 3
+
+    transfers = read(tmp_path, "transfer_ins")
+    assert all(value.isdigit() for value in transfers.column("transaction_completed_at").to_pylist())
+
+
+def test_calendar_is_daily_without_gaps_and_covers_every_transaction(tmp_path):
+    config = SyntheticConfig(transactions=2000, start_date=date(2021, 12, 30), end_date=date(2022, 1, 2))
+    generate_dataset(str(tmp_path), config)
+
+    d_time = read(tmp_path, "d_time")
+    assert d_time.column("time_id").to_pylist() == [20211230, 20211231, 20220101, 20220102]
+    assert d_time.column("year_id").to_pylist() == [1, 1, 2, 2]
+    assert read(tmp_path, "d_year").column("action_year").to_pylist() == [2021, 2022]
+
+    requested = read(tmp_path, "pix_movements").column("pix_requested_at").to_pylist()
+    assert {ts.date() for ts in requested} <= {date(2021, 12, 30), date(2021, 12, 31), date(2022, 1, 1), date(2022, 1, 2)}
+
+
+def test_transactions_are_skewed_towards_few_accounts(tmp_path):
+    config = SyntheticConfig(transactions=20000, transactions_per_account=20)
+    generate_dataset(str(tmp_path), config)
+
+    per_account = Counter(read(tmp_path, "pix_movements").column("account_id").to_pylist())
+    top_10_percent = sum(count for _, count in per_account.most_common(config.accounts // 10))
+    assert top_10_percent > 0.5 * sum(per_account.values())
+    # Some accounts never transact
+    assert len(per_account) < config.accounts
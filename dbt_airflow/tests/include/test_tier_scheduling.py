@@ -0,0 +1,97 @@
+"""Tests for the tier-to-dbt-selection mapping, on a trimmed copy of the project's lineage."""
+
+from include.tier_scheduling import changed_tiers, tier_models, tier_selection, tier_upstreams
+
+TIERS = {
+    "high_frequency": ["pix_movements", "transfer_ins"],
+    "medium_frequency": ["accounts"],
+    "low_frequency": ["d_time", "city"],
+}
+# Built by its own DAG
+STANDALONE = ["low_frequency"]
+
+
+def source(table):
+    return f"source.nu.nu_sources.{table}"
+
+
+def model(name):
+    return f"model.nu.{name}"
+
+
+MANIFEST = {
+    "child_map": {
+        source("pix_movements"): [model("stg_pix_movements")],
+        source("transfer_ins"): [model("stg_transfer_ins"), "test.nu.source_unique_transfer_ins_id.1"],
+        source("accounts"): [model("stg_accounts")],
+        source("d_time"): [model("base_time_dimension")],
+        source("city"): [model("base_location_hierarchy")],
+        model("stg_pix_movements"): [model("int_transactions_enriched")],
+        model("stg_transfer_ins"): [model("int_transactions_enriched")],
+        model("stg_accounts"): [model("dim_account")],
+        model("base_time_dimension"): [model("int_transactions_enriched"), model("dim_calendar")],
+        model("int_transactions_enriched"): [model("fct_transactions"), model("dim_account")],
+        model("fct_transactions"): ["test.nu.not_null_fct_transactions_id.2"],
+        model("dim_account"): [],
+        model("dim_calendar"): [],
+        model("base_location_hierarchy"): [],
+    }
+}
+
+
+def test_models_belong_to_the_least_frequent_tier_among_their_sources():
+    assert tier_models(MANIFEST, TIERS, "nu_sources", STANDALONE) == {
+        "high_frequency": [
+            "fct_transactions",
+            "int_transactions_enriched",
+            "stg_pix_movements",
+            "stg_transfer_ins",
+        ],
+        # dim_account reads accounts and, through int_transactions_enriched, transactions
+        "medium_frequency": ["dim_account", "stg_accounts"],
+        "low_frequency": ["base_location_hierarchy", "base_time_dimension", "dim_calendar"],
+    }
+
+
+def test_standalone_tiers_only_own_models_reading_no_other_tier():
+    models = tier_models(MANIFEST, TIERS, "nu_sources")
+
+    # Without a standalone tier, reading the calendar pulls the transactions into the low tier
+    assert models["high_frequency"] == ["stg_pix_movements", "stg_transfer_ins"]
+    assert "fct_transactions" in models["low_frequency"]
+
+
+def test_a_tier_with_mixed_tier_parents_runs_after_the_tiers_it_reads():
+    assert tier_upstreams(TIERS, "nu_sources", MANIFEST, STANDALONE) == {
+        "high_frequency": [],
+        "medium_frequency": ["high_frequency"],
+        "low_frequency": [],
+    }
+    # Without a manifest, every tier waits for the more frequent ones
+    assert tier_upstreams(TIERS, "nu_sources", standalone=STANDALONE)["medium_frequency"] == ["high_frequency"]
+
+
+def test_selection_without_manifest_excludes_the_tiers_taking_precedence():
+    selection = tier_selection(TIERS, "nu_sources", standalone=STANDALONE)
+
+    assert selection["high_frequency"] == {
+        "select": ["source:nu_sources.pix_movements+", "source:nu_sources.transfer_ins+"],
+        "exclude": ["source:nu_sources.accounts+"],
+    }
+    assert selection["medium_frequency"] == {"select": ["source:nu_sources.accounts+"], "exclude": []}
+    assert selection["low_frequency"]["select"] == ["source:nu_sources.d_time+", "source:nu_sources.city+"]
+    assert selection["low_frequency"]["exclude"] == [
+        "source:nu_sources.pix_movements+",
+        "source:nu_sources.transfer_ins+",
+        "source:nu_sources.accounts+",
+    ]
+    assert tier_selection(TIERS, "nu_sources", MANIFEST, STANDALONE)["medium_frequency"] == {
+        "select": ["dim_account", "stg_accounts"],
+        "exclude": [],
+    }
+
+
+def test_changed_tiers_keep_the_tier_order():
+    assert changed_tiers(["city", "transfer_ins"], TIERS) == ["high_frequency", "low_frequency"]
+    assert changed_tiers([], TIERS) == []
+    assert changed_tiers(None, TIERS) == []
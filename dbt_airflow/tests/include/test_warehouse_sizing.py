@@ -0,0 +1,55 @@
+"""Tests for the adaptive warehouse sizing policy."""
+
+from include.warehouse_sizing import SizingPolicy, choose_warehouses
+
+LADDER = ["NU_WH", "NU_WH_MEDIUM", "NU_WH_LARGE"]
+GB = 1024 ** 3
+
+
+def run(seconds, scanned_gb=0, warehouse="NU_WH", remote_spill=0):
+    return {
+        "execution_time": seconds,
+        "bytes_scanned": scanned_gb * GB,
+        "bytes_spilled_to_remote_storage": remote_spill,
+        "warehouse_name": warehouse,
+    }
+
+
+def test_slow_scan_heavy_or_spilling_models_scale_up_one_step():
+    choices = choose_warehouses(
+        {
+            "fct_transactions": run(600, scanned_gb=50, warehouse="NU_WH_MEDIUM"),
+            "int_transactions_enriched": run(120, scanned_gb=1, remote_spill=1024),
+            "fct_account_monthly_balances": run(900, scanned_gb=20, warehouse="nu_wh_large"),
+        },
+        LADDER,
+    )
+
+    assert choices == {
+        "fct_transactions": "NU_WH_LARGE",
+        "int_transactions_enriched": "NU_WH_MEDIUM",
+        "fct_account_monthly_balances": "NU_WH_LARGE",
+    }
+
+
+def test_slow_models_scanning_little_keep_their_size_and_fast_ones_scale_down():
+    choices = choose_warehouses(
+        {
+            "dim_account": run(400, scanned_gb=1, warehouse="NU_WH_MEDIUM"),
+            "dim_customer": run(5, warehouse="NU_WH_MEDIUM"),
+            "stg_accounts": run(1),
+        },
+        LADDER,
+        SizingPolicy(scale_up_seconds=300, scale_up_bytes=10 * GB, scale_down_seconds=30),
+    )
+
+    assert choices == {"dim_account": "NU_WH_MEDIUM", "dim_customer": "NU_WH", "stg_accounts": "NU_WH"}
+
+
+def test_models_outside_the_ladder_keep_their_static_route():
+    choices = choose_warehouses(
+        {"report_montly_business_kpi": run(5, warehouse="NU_WH_REPORTING"), "dim_calendar": run(5, warehouse=None)},
+        LADDER,
+    )
+
+    assert choices == {}